@@ -0,0 +1,4 @@
+"""Benchmarks for the performance sensitive parts of generating the leaderboards.
+
+Each benchmark is a module which can be run directly, e.g. `python -m benchmarks.bench_bot_user_decoder`.
+"""
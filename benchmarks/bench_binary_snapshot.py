@@ -0,0 +1,69 @@
+"""Benchmark loading the leaderboard data of 100k synthetic bots from json and from a binary snapshot."""
+
+import collections
+import contextlib
+import functools
+import tempfile
+from pathlib import Path
+
+from benchmarks import bench_ranking_calls, bench_utils, synthetic_data
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import DataFormat
+from src.leaderboard.data.leaderboard_objects import LeaderboardRow
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+BOT_COUNT = 100_000
+# Loading every row takes seconds, so it is timed fewer times than opening the snapshot
+LOAD_REPEAT = 2
+BENCHMARKED_DATA_FORMATS = [DataFormat.JSON, DataFormat.BINARY]
+
+
+def open_snapshot(file_system: RealFileSystem) -> None:
+  """Open the binary snapshot without decoding any rows, as is done for a lookup of a few bots."""
+  data_generator.load_binary_snapshot(file_system)
+
+
+def load_all(file_system: RealFileSystem, data_format: DataFormat) -> None:
+  """Load the leaderboard data and decode every row, as is done when the leaderboards are generated."""
+  _, rows_by_perf_type = data_generator.load_leaderboard_data(file_system, data_format)
+  for rows in rows_by_perf_type.values():
+    collections.deque(rows, maxlen=0)
+
+
+def main() -> None:
+  """Save the leaderboard data in each format and report the time to load it and the size of the files."""
+  log_writer = bench_utils.create_log_writer()
+  updates_by_perf_type, bot_profiles_by_name = bench_ranking_calls.create_all_leaderboard_inputs(BOT_COUNT)
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {
+    perf_type: data_generator.create_ranked_rows(updates, bot_profiles_by_name, current_time)
+    for perf_type, updates in updates_by_perf_type.items()
+  }
+  row_count = sum(len(rows) for rows in rows_by_perf_type.values())
+  file_system = RealFileSystem()
+  with tempfile.TemporaryDirectory() as temp_dir, contextlib.chdir(temp_dir):
+    # The file paths are relative to the working directory
+    for data_format in BENCHMARKED_DATA_FORMATS:
+      data_generator.save_leaderboard_data(
+        file_system, data_format, list(bot_profiles_by_name.values()), rows_by_perf_type, current_time
+      )
+    json_paths = [file_paths.bot_profiles_path(), *(file_paths.data_path(perf_type) for perf_type in rows_by_perf_type)]
+    file_sizes = {
+      DataFormat.JSON: sum(Path(json_path).stat().st_size for json_path in json_paths),
+      DataFormat.BINARY: Path(file_paths.binary_snapshot_path()).stat().st_size,
+    }
+    for data_format in BENCHMARKED_DATA_FORMATS:
+      load = functools.partial(load_all, file_system, data_format)
+      seconds = bench_utils.best_time(load, repeat=LOAD_REPEAT)
+      log_writer.info(
+        "%7d rows %-6s load all %8.3fs %6.1f MB", row_count, data_format.name.lower(), seconds, file_sizes[data_format] / 1e6
+      )
+    seconds = bench_utils.best_time(functools.partial(open_snapshot, file_system))
+    log_writer.info("%7d rows binary open     %8.6fs", row_count, seconds)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,34 @@
+"""Benchmark each available BotUserDecoder on a synthetic 50k line payload."""
+
+import importlib.util
+
+from benchmarks import bench_utils, synthetic_data
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder
+from src.leaderboard.li.json_bot_user_decoder import JsonBotUserDecoder
+
+
+LINE_COUNT = 50_000
+
+
+def available_decoders() -> list[BotUserDecoder]:
+  """Return an instance of every decoder which can be used in this environment."""
+  decoders: list[BotUserDecoder] = [JsonBotUserDecoder()]
+  if importlib.util.find_spec("msgspec"):
+    from src.leaderboard.li.msgspec_bot_user_decoder import MsgspecBotUserDecoder
+
+    decoders.append(MsgspecBotUserDecoder())
+  return decoders
+
+
+def main() -> None:
+  """Decode every line with every decoder and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  lines = synthetic_data.create_online_bot_lines(LINE_COUNT)
+  log_writer.info("Decoding %d lines (%.1f MB)", len(lines), sum(len(line) for line in lines) / 1e6)
+  for decoder in available_decoders():
+    seconds = bench_utils.best_time(lambda decoder=decoder: [decoder.decode(line) for line in lines])
+    log_writer.info("%-22s %7.3fs %6.2fus/line", type(decoder).__name__, seconds, seconds / len(lines) * 1e6)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,47 @@
+"""Benchmark writing a synthetic 100k row leaderboard as json with json.dumps and with the specialized serializers."""
+
+import functools
+import json
+
+from benchmarks import bench_utils
+from src.leaderboard.data import json_serializer
+from src.leaderboard.data.json_serializer import COMPACT_LAYOUT
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+
+
+ROW_COUNT = 100_000
+
+
+def create_rows(row_count: int) -> list[LeaderboardRow]:
+  """Create rows where some of the fields have their default values."""
+  return [
+    LeaderboardRow(
+      f"Bot-{index}",
+      LeaderboardPerf(1500 + index % 1000, 50, index % 7 - 3, index, index % 10 == 0),
+      RankInfo(index, index % 5 - 2, index % 9 - 4, index % 3, index, 2000, 1743500000),
+    )
+    for index in range(row_count)
+  ]
+
+
+def dump_rows(rows: list[LeaderboardRow]) -> str:
+  """Return the rows as json, written the way the leaderboard data was written before the specialized serializers."""
+  return json.dumps([row.as_dict() for row in rows], indent=2)
+
+
+def main() -> None:
+  """Write the rows in each way and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  rows = create_rows(ROW_COUNT)
+  serializers = {
+    "json.dumps": functools.partial(dump_rows, rows),
+    "pretty": functools.partial(json_serializer.encode_leaderboard_rows, rows),
+    "compact": functools.partial(json_serializer.encode_leaderboard_rows, rows, COMPACT_LAYOUT),
+  }
+  for serializer_name, serialize in serializers.items():
+    seconds = bench_utils.best_time(serialize)
+    log_writer.info("%6d rows %-10s %7.3fs %6.1f MB", ROW_COUNT, serializer_name, seconds, len(serialize()) / 1e6)
+
+
+if __name__ == "__main__":
+  main()
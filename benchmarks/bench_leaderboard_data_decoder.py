@@ -0,0 +1,45 @@
+"""Benchmark each available LeaderboardDataDecoder on a synthetic 100k row leaderboard file."""
+
+import functools
+import importlib.util
+
+from benchmarks import bench_json_serializer, bench_utils
+from src.leaderboard.data import json_serializer
+from src.leaderboard.data.json_leaderboard_data_decoder import JsonLeaderboardDataDecoder
+from src.leaderboard.data.json_serializer import COMPACT_LAYOUT
+from src.leaderboard.data.leaderboard_data_decoder import LeaderboardDataDecoder
+
+
+ROW_COUNT = 100_000
+
+
+def available_decoders() -> list[LeaderboardDataDecoder]:
+  """Return an instance of every decoder which can be used in this environment."""
+  decoders: list[LeaderboardDataDecoder] = [JsonLeaderboardDataDecoder()]
+  if importlib.util.find_spec("msgspec"):
+    from src.leaderboard.data.msgspec_leaderboard_data_decoder import MsgspecLeaderboardDataDecoder
+
+    decoders.append(MsgspecLeaderboardDataDecoder())
+  return decoders
+
+
+def main() -> None:
+  """Decode the file, as written with each layout, with every decoder and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  rows = bench_json_serializer.create_rows(ROW_COUNT)
+  json_strs = {
+    "pretty": json_serializer.encode_leaderboard_rows(rows),
+    "compact": json_serializer.encode_leaderboard_rows(rows, COMPACT_LAYOUT),
+  }
+  for decoder in available_decoders():
+    for layout_name, json_str in json_strs.items():
+      decode = functools.partial(decoder.decode_leaderboard_rows, json_str)
+      if decode() != rows:
+        msg = f"{type(decoder).__name__} did not decode the rows which were written"
+        raise ValueError(msg)
+      seconds = bench_utils.best_time(decode)
+      log_writer.info("%-29s %-7s %7.3fs %6.2fus/row", type(decoder).__name__, layout_name, seconds, seconds / ROW_COUNT * 1e6)
+
+
+if __name__ == "__main__":
+  main()
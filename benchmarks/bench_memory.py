@@ -0,0 +1,62 @@
+"""Benchmark the memory used by the leaderboard rows with 10k and 100k bots.
+
+The rows are measured with the slotted data model and with unslotted copies of the same dataclasses, which is how the data
+model was defined previously.
+"""
+
+import dataclasses
+import tracemalloc
+from typing import Any
+
+from benchmarks import bench_utils
+from src.leaderboard.data.leaderboard_objects import LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+
+
+BOT_COUNTS = [10_000, 100_000]
+PERF_TYPE_COUNT = len(list(PerfType.all_except_unknown()))
+
+
+def create_unslotted_copy(cls: type) -> Any:  # noqa: ANN401 (the class is created dynamically)
+  """Return a frozen dataclass with the same fields as cls but with a __dict__ for each instance."""
+  return dataclasses.make_dataclass(
+    f"Unslotted{cls.__name__}", [(field.name, field.type) for field in dataclasses.fields(cls)], frozen=True
+  )
+
+
+def measure_bytes_per_row(row_type: Any, perf_type: Any, rank_info_type: Any, row_count: int) -> float:  # noqa: ANN401
+  """Create row_count rows from the given types and return the number of bytes allocated per row."""
+  tracemalloc.start()
+  start_size, _ = tracemalloc.get_traced_memory()
+  rows = [
+    row_type(f"Bot-{index}", perf_type(1500 + index % 1000, 50, 0, index, False), rank_info_type(index, 0, 0, 0, index, 0, 0))
+    for index in range(row_count)
+  ]
+  end_size, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  # Exclude the list itself
+  return (end_size - start_size) / len(rows) - 8
+
+
+def main() -> None:
+  """Measure the rows for every perf type of each bot with both data models and report the bytes per row."""
+  log_writer = bench_utils.create_log_writer()
+  unslotted_row_type = create_unslotted_copy(LeaderboardRow)
+  unslotted_perf_type = create_unslotted_copy(LeaderboardPerf)
+  unslotted_rank_info_type = create_unslotted_copy(RankInfo)
+  for bot_count in BOT_COUNTS:
+    row_count = bot_count * PERF_TYPE_COUNT
+    unslotted_bytes = measure_bytes_per_row(unslotted_row_type, unslotted_perf_type, unslotted_rank_info_type, row_count)
+    slotted_bytes = measure_bytes_per_row(LeaderboardRow, LeaderboardPerf, RankInfo, row_count)
+    log_writer.info(
+      "%6d bots (%7d rows) unslotted %5.0f bytes/row, slotted %5.0f bytes/row (%.0f MB saved)",
+      bot_count,
+      row_count,
+      unslotted_bytes,
+      slotted_bytes,
+      (unslotted_bytes - slotted_bytes) * row_count / 1e6,
+    )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,67 @@
+"""Benchmark generating the leaderboard html of 5k synthetic bots again with and without the saved page fingerprints.
+
+The html is generated again a second, a minute, and an hour later with the same rows. The pages whose fingerprints have not
+changed are not rendered, but a page is rendered when the last seen time of any bot on it is formatted differently.
+"""
+
+import contextlib
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import bench_parallel_renderer, bench_utils, synthetic_data
+from src.leaderboard.chrono.durations import ONE_HOUR, ONE_MINUTE
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.page import page_fingerprint
+from src.leaderboard.page.html_generator import HtmlGenerator
+
+
+BOT_COUNT = 5_000
+LATER_TIMES = [1, ONE_MINUTE, ONE_HOUR]
+
+
+def generate(file_system: RealFileSystem, leaderboard_data: LeaderboardDataResult, current_time: int) -> float:
+  """Generate and write the html at the current time, and return the seconds taken."""
+  start_time = time.perf_counter()
+  html_generator = HtmlGenerator(FixedTimeProvider(current_time), file_system, skip_unchanged_pages=True)
+  html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+  file_system.write_files({file_paths.html_path(name): html for name, html in html_by_name.items()})
+  return time.perf_counter() - start_time
+
+
+def main() -> None:
+  """Generate the html, then report the time to generate it again later with and without the saved fingerprints."""
+  log_writer = bench_utils.create_log_writer()
+  leaderboard_data = bench_parallel_renderer.create_leaderboard_data(BOT_COUNT)
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  with tempfile.TemporaryDirectory() as temp_dir:
+    # The file paths are relative to the working directory, and so are the templates, which are checked for changes
+    Path(temp_dir, "templates").symlink_to(Path("templates").resolve())
+    with contextlib.chdir(temp_dir):
+      file_system = RealFileSystem()
+      for later_time in LATER_TIMES:
+        generate(file_system, leaderboard_data, current_time)
+        saved_fingerprints = page_fingerprint.load_saved_fingerprints(file_system)
+        reused_seconds = generate(file_system, leaderboard_data, current_time + later_time)
+        later_fingerprints = page_fingerprint.load_saved_fingerprints(file_system)
+        unchanged_count = sum(
+          fingerprint == saved_fingerprints.fingerprints_by_name.get(name)
+          for name, fingerprint in later_fingerprints.fingerprints_by_name.items()
+        )
+        Path(file_paths.html_fingerprints_path()).unlink()
+        rendered_seconds = generate(file_system, leaderboard_data, current_time + later_time)
+        log_writer.info(
+          "%5ds later %2d of %2d pages unchanged, with fingerprints %6.3fs without %6.3fs",
+          later_time,
+          unchanged_count,
+          len(later_fingerprints.fingerprints_by_name),
+          reused_seconds,
+          rendered_seconds,
+        )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,29 @@
+"""Benchmark parsing a synthetic 100k bot roster serially and with pools of worker processes."""
+
+import os
+
+from benchmarks import bench_utils, synthetic_data
+from src.leaderboard.data import data_generator
+from src.leaderboard.li.bot_user_decoder import create_bot_user_decoder
+
+
+LINE_COUNT = 100_000
+
+
+def main() -> None:
+  """Parse the roster with an increasing number of workers and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  lichess_client = synthetic_data.SyntheticLichessClient(synthetic_data.create_online_bot_lines(LINE_COUNT))
+  bot_user_decoder = create_bot_user_decoder()
+  log_writer.info("Parsing %d lines with %s", LINE_COUNT, type(bot_user_decoder).__name__)
+  worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+  for parse_workers in worker_counts:
+    seconds = bench_utils.best_time(
+      lambda parse_workers=parse_workers: data_generator.get_online_bot_info(lichess_client, bot_user_decoder, parse_workers),
+      repeat=3,
+    )
+    log_writer.info("%2d worker(s) %7.3fs", parse_workers, seconds)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,46 @@
+"""Benchmark rendering the leaderboard html of 5k synthetic bots serially and with pools of worker processes."""
+
+import os
+
+from benchmarks import bench_ranking_calls, bench_utils, synthetic_data
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.page.html_generator import HtmlGenerator
+
+
+BOT_COUNT = 5_000
+
+
+def create_leaderboard_data(bot_count: int) -> LeaderboardDataResult:
+  """Rank a synthetic leaderboard of every perf type."""
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  updates_by_perf_type, bot_profiles_by_name = bench_ranking_calls.create_all_leaderboard_inputs(bot_count)
+  rows_by_perf_type = {
+    perf_type: data_generator.create_ranked_rows(updates, bot_profiles_by_name, current_time)
+    for perf_type, updates in updates_by_perf_type.items()
+  }
+  return LeaderboardDataResult.create_result(bot_profiles_by_name, rows_by_perf_type)
+
+
+def main() -> None:
+  """Render the pages with an increasing number of workers, check that the html is the same, and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  leaderboard_data = create_leaderboard_data(BOT_COUNT)
+  time_provider = FixedTimeProvider(synthetic_data.SYNTHETIC_CURRENT_TIME)
+  serial_html_by_name = HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data)
+  log_writer.info("Rendering %d pages (%.1f MB)", len(serial_html_by_name), sum(map(len, serial_html_by_name.values())) / 1e6)
+  worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+  for render_workers in worker_counts:
+    html_generator = HtmlGenerator(time_provider, render_workers=render_workers)
+    if html_generator.generate_leaderboard_html(leaderboard_data) != serial_html_by_name:
+      msg = f"The html rendered by {render_workers} workers is not the same as the serial html"
+      raise ValueError(msg)
+    seconds = bench_utils.best_time(
+      lambda html_generator=html_generator: html_generator.generate_leaderboard_html(leaderboard_data), repeat=3
+    )
+    log_writer.info("%2d worker(s) %7.3fs", render_workers, seconds)
+
+
+if __name__ == "__main__":
+  main()
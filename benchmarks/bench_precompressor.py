@@ -0,0 +1,49 @@
+"""Benchmark compressing the leaderboard html of 5k synthetic bots in each available encoding."""
+
+import contextlib
+import functools
+import tempfile
+import time
+
+from benchmarks import bench_parallel_renderer, bench_utils, synthetic_data
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.page import precompressor
+from src.leaderboard.page.html_generator import HtmlGenerator
+
+
+BOT_COUNT = 5_000
+
+
+def main() -> None:
+  """Render the pages, then report the time to compress them in each encoding and the time to find that none changed."""
+  log_writer = bench_utils.create_log_writer()
+  leaderboard_data = bench_parallel_renderer.create_leaderboard_data(BOT_COUNT)
+  time_provider = FixedTimeProvider(synthetic_data.SYNTHETIC_CURRENT_TIME)
+  html_by_name = HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data)
+  file_contents_by_name = {file_paths.html_path(name): html.encode("utf-8") for name, html in html_by_name.items()}
+  file_system = RealFileSystem()
+  for encoding in precompressor.get_available_encodings():
+    with tempfile.TemporaryDirectory() as temp_dir, contextlib.chdir(temp_dir):
+      # The file paths are relative to the working directory
+      start_time = time.perf_counter()
+      counts = precompressor.precompress_files(file_system, file_contents_by_name, [encoding])
+      compress_seconds = time.perf_counter() - start_time
+      unchanged_seconds = bench_utils.best_time(
+        functools.partial(precompressor.precompress_files, file_system, file_contents_by_name, [encoding])
+      )
+      log_writer.info(
+        "%2d pages %-6s %6.1f MB -> %5.2f MB (%4.1f%%) compress %6.3fs unchanged %6.3fs",
+        len(file_contents_by_name),
+        encoding.name,
+        counts.original_bytes / 1e6,
+        counts.compressed_bytes_by_encoding[encoding.name] / 1e6,
+        counts.get_ratio(encoding.name) * 100,
+        compress_seconds,
+        unchanged_seconds,
+      )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,57 @@
+"""Benchmark each ranking engine on a synthetic bullet leaderboard with 10k and 100k bots."""
+
+import functools
+
+from benchmarks import bench_utils, synthetic_data
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import RankingEngine
+from src.leaderboard.data.leaderboard_objects import BotProfile
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.li.bot_user_decoder import create_bot_user_decoder
+from src.leaderboard.li.pert_type import PerfType
+
+
+BOT_COUNTS = [10_000, 100_000]
+
+
+def create_leaderboard_inputs(count: int) -> tuple[list[LeaderboardUpdate], dict[str, BotProfile]]:
+  """Create the updates for a bullet leaderboard where most bots were also on the previous leaderboard."""
+  bot_user_decoder = create_bot_user_decoder()
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  previous_lines = synthetic_data.create_online_bot_lines(count, seed=0)
+  previous_info = data_generator.get_online_bot_info(synthetic_data.SyntheticLichessClient(previous_lines), bot_user_decoder)
+  previous_updates = data_generator.create_updates([], previous_info.bot_perfs_by_perf_type[PerfType.BULLET])
+  previous_rows = data_generator.create_ranked_rows(previous_updates, previous_info.bot_profiles_by_name, current_time)
+  current_lines = synthetic_data.create_online_bot_lines(count, seed=1)
+  current_info = data_generator.get_online_bot_info(synthetic_data.SyntheticLichessClient(current_lines), bot_user_decoder)
+  updates = data_generator.create_updates(previous_rows, current_info.bot_perfs_by_perf_type[PerfType.BULLET])
+  return updates, previous_info.bot_profiles_by_name | current_info.bot_profiles_by_name
+
+
+def available_ranking_engines() -> list[RankingEngine]:
+  """Return every ranking engine which can be used in this environment."""
+  ranking_engines: list[RankingEngine] = []
+  for ranking_engine in RankingEngine:
+    try:
+      data_generator.get_create_ranked_rows(ranking_engine)
+    except ImportError:
+      continue
+    ranking_engines.append(ranking_engine)
+  return ranking_engines
+
+
+def main() -> None:
+  """Rank the leaderboard with every ranking engine and report the timings."""
+  log_writer = bench_utils.create_log_writer()
+  for count in BOT_COUNTS:
+    updates, bot_profiles_by_name = create_leaderboard_inputs(count)
+    for ranking_engine in available_ranking_engines():
+      create_ranked_rows = data_generator.get_create_ranked_rows(ranking_engine)
+      seconds = bench_utils.best_time(
+        functools.partial(create_ranked_rows, updates, bot_profiles_by_name, synthetic_data.SYNTHETIC_CURRENT_TIME, None)
+      )
+      log_writer.info("%6d rows %-6s %7.3fs", len(updates), ranking_engine.name.lower(), seconds)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,70 @@
+"""Benchmark the Python-level function calls per row made when ranking every perf type of a synthetic leaderboard."""
+
+import cProfile
+import functools
+from collections.abc import Callable
+
+from benchmarks import bench_ranking, bench_utils, synthetic_data
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import ProfileIndex, RankingEngine
+from src.leaderboard.data.leaderboard_objects import BotProfile
+from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.li.bot_user_decoder import create_bot_user_decoder
+from src.leaderboard.li.pert_type import PerfType
+
+
+BOT_COUNT = 20_000
+
+
+def create_all_leaderboard_inputs(count: int) -> tuple[dict[PerfType, list[LeaderboardUpdate]], dict[str, BotProfile]]:
+  """Create the updates for every perf type where most bots were also on the previous leaderboards."""
+  bot_user_decoder = create_bot_user_decoder()
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  previous_lines = synthetic_data.create_online_bot_lines(count, seed=0)
+  previous_info = data_generator.get_online_bot_info(synthetic_data.SyntheticLichessClient(previous_lines), bot_user_decoder)
+  current_lines = synthetic_data.create_online_bot_lines(count, seed=1)
+  current_info = data_generator.get_online_bot_info(synthetic_data.SyntheticLichessClient(current_lines), bot_user_decoder)
+  bot_profiles_by_name = previous_info.bot_profiles_by_name | current_info.bot_profiles_by_name
+  updates_by_perf_type: dict[PerfType, list[LeaderboardUpdate]] = {}
+  for perf_type in PerfType.all_except_unknown():
+    previous_updates = data_generator.create_updates([], previous_info.bot_perfs_by_perf_type.get(perf_type, []))
+    previous_rows = data_generator.create_ranked_rows(previous_updates, bot_profiles_by_name, current_time)
+    current_bot_perfs = current_info.bot_perfs_by_perf_type.get(perf_type, [])
+    updates_by_perf_type[perf_type] = data_generator.create_updates(previous_rows, current_bot_perfs)
+  return updates_by_perf_type, bot_profiles_by_name
+
+
+def rank_all_perf_types(
+  ranking_engine: RankingEngine,
+  updates_by_perf_type: dict[PerfType, list[LeaderboardUpdate]],
+  bot_profiles_by_name: dict[str, BotProfile],
+) -> None:
+  """Rank every perf type with one profile index, like DataGenerator does."""
+  create_ranked_rows = data_generator.get_create_ranked_rows(ranking_engine)
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  profile_index = ProfileIndex.create(bot_profiles_by_name, current_time)
+  for updates in updates_by_perf_type.values():
+    create_ranked_rows(updates, bot_profiles_by_name, current_time, profile_index)
+
+
+def count_calls(function: Callable[[], None]) -> int:
+  """Return the number of function calls made by calling the function, as counted by cProfile."""
+  profiler = cProfile.Profile()
+  profiler.runcall(function)
+  return sum(entry.callcount for entry in profiler.getstats())
+
+
+def main() -> None:
+  """Rank every perf type with each available ranking engine and report the calls per row and the timings."""
+  log_writer = bench_utils.create_log_writer()
+  updates_by_perf_type, bot_profiles_by_name = create_all_leaderboard_inputs(BOT_COUNT)
+  row_count = sum(len(updates) for updates in updates_by_perf_type.values())
+  for ranking_engine in bench_ranking.available_ranking_engines():
+    rank = functools.partial(rank_all_perf_types, ranking_engine, updates_by_perf_type, bot_profiles_by_name)
+    calls_per_row = count_calls(rank) / row_count
+    seconds = bench_utils.best_time(rank)
+    log_writer.info("%6d rows %-11s %5.1f calls/row %7.3fs", row_count, ranking_engine.name.lower(), calls_per_row, seconds)
+
+
+if __name__ == "__main__":
+  main()
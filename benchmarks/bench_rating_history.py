@@ -0,0 +1,81 @@
+"""Benchmark a week of appends to the rating history of a synthetic 10k bot bullet leaderboard, and scans of the result."""
+
+import contextlib
+import functools
+import random
+import tempfile
+import time
+
+from benchmarks import bench_ranking, bench_utils, synthetic_data
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.leaderboard_objects import BotPerf, LeaderboardPerf, LeaderboardRow
+from src.leaderboard.data.leaderboard_update import FullUpdate, LeaderboardUpdate, PreviousRowOnlyUpdate
+from src.leaderboard.data.rating_history import CHUNK_GENERATIONS, RECORD_STRUCT, RatingHistory
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+BOT_COUNT = 10_000
+# The fraction of bots which play between generations
+MOVED_FRACTION = 0.05
+# Most bots are offline between generations
+OFFLINE_PROBABILITY = 0.7
+
+
+def create_next_updates(previous_rows: list[LeaderboardRow], moved_fraction: float, seed: int = 0) -> list[LeaderboardUpdate]:
+  """Create the updates for the next run where about moved_fraction of the bots have a different rating."""
+  rng = random.Random(seed)  # noqa: S311 (not used for cryptography)
+  updates: list[LeaderboardUpdate] = []
+  for row in previous_rows:
+    perf = row.perf
+    if rng.random() < moved_fraction:
+      moved_perf = LeaderboardPerf(perf.rating + rng.randrange(-30, 30), perf.rd, perf.prog, perf.games + 1, perf.prov)
+      updates.append(FullUpdate(row, BotPerf(row.name, moved_perf)))
+    elif rng.random() < OFFLINE_PROBABILITY:
+      updates.append(PreviousRowOnlyUpdate(row))
+    else:
+      updates.append(FullUpdate(row, BotPerf(row.name, perf)))
+  return updates
+
+
+def main() -> None:
+  """Append a chunk of generations plus one, so that the first chunk is sealed, and report the sizes and timings."""
+  log_writer = bench_utils.create_log_writer()
+  current_time = synthetic_data.SYNTHETIC_CURRENT_TIME
+  updates, bot_profiles_by_name = bench_ranking.create_leaderboard_inputs(BOT_COUNT)
+  rows = data_generator.create_ranked_rows(updates, bot_profiles_by_name, current_time)
+  file_system = RealFileSystem()
+  with tempfile.TemporaryDirectory() as temp_dir, contextlib.chdir(temp_dir):
+    # The file paths are relative to the working directory
+    rating_history = RatingHistory(file_system)
+    record_count = 0
+    append_seconds = 0.0
+    for generation in range(CHUNK_GENERATIONS + 1):
+      start_time = time.perf_counter()
+      record_count += rating_history.append(generation, current_time, {PerfType.BULLET: rows}, bot_profiles_by_name)
+      append_seconds += time.perf_counter() - start_time
+      next_updates = create_next_updates(rows, MOVED_FRACTION, seed=generation)
+      rows = data_generator.create_ranked_rows(next_updates, bot_profiles_by_name, current_time)
+    sealed_chunk_size = len(file_system.read_binary_file(file_paths.sealed_history_chunk_path(PerfType.BULLET, 0)) or b"")
+    log_writer.info(
+      "%6d rows %d generations %8d records %7.3fs per append",
+      len(rows),
+      CHUNK_GENERATIONS,
+      record_count,
+      append_seconds / (CHUNK_GENERATIONS + 1),
+    )
+    sealed_record_count = record_count - len(rating_history.load_open_chunk(PerfType.BULLET)) // RECORD_STRUCT.size
+    log_writer.info(
+      "sealed chunk %6.0f KB (%6.0f KB uncompressed), %5.2f bytes/record",
+      sealed_chunk_size / 1e3,
+      sealed_record_count * RECORD_STRUCT.size / 1e3,
+      sealed_chunk_size / sealed_record_count,
+    )
+    scan_perf_type_seconds = bench_utils.best_time(functools.partial(rating_history.scan_perf_type, PerfType.BULLET))
+    scan_bot_seconds = bench_utils.best_time(functools.partial(rating_history.scan_bot, 0))
+    log_writer.info("scan perf type %7.3fs, scan bot %7.3fs", scan_perf_type_seconds, scan_bot_seconds)
+
+
+if __name__ == "__main__":
+  main()
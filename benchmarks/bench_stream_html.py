@@ -0,0 +1,92 @@
+"""Benchmark writing the leaderboard html of synthetic bots after rendering every page and as each page is rendered.
+
+Peak memory is measured with tracemalloc above what the leaderboard data already uses, and the time to the first file is when
+the first page has been saved.
+"""
+
+import contextlib
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks import bench_parallel_renderer, bench_utils, synthetic_data
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.page.html_generator import HtmlGenerator
+
+
+BOT_COUNTS = [1_000, 5_000]
+
+
+class TimedFileSystem(RealFileSystem):
+  """A RealFileSystem which records when the first file was saved."""
+
+  def __init__(self) -> None:
+    """Initialize the file system with no file saved yet."""
+    super().__init__()
+    self.first_save_time: float | None = None
+
+  def count_write(self, was_written: bool, byte_count: int) -> None:
+    """Record the time of the first file saved, then count the write."""
+    if self.first_save_time is None:
+      self.first_save_time = time.perf_counter()
+    super().count_write(was_written, byte_count)
+
+
+def render_then_write(
+  html_generator: HtmlGenerator, leaderboard_data: LeaderboardDataResult, file_system: RealFileSystem
+) -> None:
+  """Render every page, then write them all."""
+  html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+  file_system.write_files({file_paths.html_path(name): html for name, html in html_by_name.items()})
+
+
+def stream(html_generator: HtmlGenerator, leaderboard_data: LeaderboardDataResult, file_system: RealFileSystem) -> None:
+  """Write each page as it is rendered."""
+  html_generator.write_leaderboard_html(leaderboard_data, file_system)
+
+
+def measure(
+  write_html: Callable[[HtmlGenerator, LeaderboardDataResult, RealFileSystem], None], leaderboard_data: LeaderboardDataResult
+) -> tuple[float, float, int]:
+  """Write the html into an empty directory and return the seconds taken, the seconds to the first file, and the peak bytes."""
+  html_generator = HtmlGenerator(FixedTimeProvider(synthetic_data.SYNTHETIC_CURRENT_TIME))
+  html_generator.load_templates()
+  with tempfile.TemporaryDirectory() as temp_dir:
+    # The file paths are relative to the working directory, and so are the templates, which are checked for changes
+    Path(temp_dir, "templates").symlink_to(Path("templates").resolve())
+    with contextlib.chdir(temp_dir):
+      file_system = TimedFileSystem()
+      tracemalloc.start()
+      start_time = time.perf_counter()
+      write_html(html_generator, leaderboard_data, file_system)
+      end_time = time.perf_counter()
+      _, peak_bytes = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+  first_save_time = file_system.first_save_time or end_time
+  return end_time - start_time, first_save_time - start_time, peak_bytes
+
+
+def main() -> None:
+  """Write the html of each leaderboard size both ways and report the time, the time to the first file, and the peak memory."""
+  log_writer = bench_utils.create_log_writer()
+  for bot_count in BOT_COUNTS:
+    leaderboard_data = bench_parallel_renderer.create_leaderboard_data(bot_count)
+    for name, write_html in [("render then write", render_then_write), ("stream", stream)]:
+      seconds, first_file_seconds, peak_bytes = measure(write_html, leaderboard_data)
+      log_writer.info(
+        "%6d bots %-17s %6.3fs first file %6.3fs peak %6.1f MB",
+        bot_count,
+        name,
+        seconds,
+        first_file_seconds,
+        peak_bytes / 1e6,
+      )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,27 @@
+"""Functions shared by the benchmarks."""
+
+import gc
+import time
+from collections.abc import Callable
+
+from src.leaderboard.log.log_writer import LogWriter
+from src.leaderboard.log.real_log_writer import RealLogWriter
+
+
+def create_log_writer() -> LogWriter:
+  """Return a log writer for reporting benchmark results."""
+  return RealLogWriter("benchmarks")
+
+
+def best_time(function: Callable[[], object], repeat: int = 5) -> float:
+  """Call a function several times and return the fastest time in seconds.
+
+  Garbage is collected before each call so that one call does not pay for the garbage left by another.
+  """
+  best = float("inf")
+  for _ in range(repeat):
+    gc.collect()
+    start_time = time.perf_counter()
+    function()
+    best = min(best, time.perf_counter() - start_time)
+  return best
@@ -0,0 +1,80 @@
+"""Functions for creating realistic synthetic leaderboard inputs for the benchmarks."""
+
+import json
+import random
+from collections.abc import Iterator
+from typing import Any
+
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.li.pert_type import PerfType
+
+
+# Roughly when the leaderboards are being generated
+SYNTHETIC_CURRENT_TIME = 1743500000
+# Lichess also returns perfs which are not time controls or variants
+NON_LEADERBOARD_PERFS = {
+  "puzzle": {"games": 100, "rating": 1800, "rd": 80, "prog": 10},
+  "storm": {"runs": 10, "score": 30},
+  "racer": {"runs": 3, "score": 25},
+  "streak": {"runs": 1, "score": 12},
+}
+# Most bots play most perf types and a few ratings are provisional
+PLAYS_PERF_TYPE_PROBABILITY = 0.6
+PROVISIONAL_PROBABILITY = 0.1
+PATRON_PROBABILITY = 0.05
+FLAGS = ["", "_earth", "FR", "US", "DE", "NO", "GB-SCT", "ES-CT", "_united-nations"]
+
+
+def create_bot_user_dict(index: int, rng: random.Random) -> dict[str, Any]:
+  """Create a dict which resembles what lichess returns for a single bot."""
+  perfs: dict[str, Any] = {}
+  for perf_type in PerfType.all_except_unknown():
+    if rng.random() < PLAYS_PERF_TYPE_PROBABILITY:
+      perfs[perf_type.to_string()] = {
+        "games": rng.randrange(0, 50000),
+        "rating": rng.randrange(800, 3300),
+        "rd": rng.randrange(45, 350),
+        "prog": rng.randrange(-100, 100),
+      } | ({"prov": True} if rng.random() < PROVISIONAL_PROBABILITY else {})
+  perfs.update(NON_LEADERBOARD_PERFS)
+  created_at = SYNTHETIC_CURRENT_TIME - rng.randrange(0, 6 * 365 * 24 * 3600)
+  return {
+    "id": f"bot-{index}",
+    "username": f"Bot-{index}",
+    "perfs": perfs,
+    "flair": "symbols.robot",
+    "title": "BOT",
+    "createdAt": created_at * 1000,
+    "profile": {"flag": rng.choice(FLAGS), "bio": "I am a synthetic bot. " * 4, "links": "https://github.com"},
+    "seenAt": (SYNTHETIC_CURRENT_TIME - rng.randrange(0, 30 * 24 * 3600)) * 1000,
+    "playTime": {"total": rng.randrange(0, 10**8), "tv": 0},
+    "patron": rng.random() < PATRON_PROBABILITY,
+    "url": f"https://lichess.org/@/Bot-{index}",
+  }
+
+
+def create_online_bot_lines(count: int, seed: int = 0) -> list[str]:
+  """Create a list of lines of ndjson which resemble the response of the online bots API."""
+  rng = random.Random(seed)  # noqa: S311 (not used for cryptography)
+  return [json.dumps(create_bot_user_dict(index, rng), separators=(",", ":")) for index in range(count)]
+
+
+class SyntheticLichessClient(LichessClient):
+  """A LichessClient which returns a fixed list of lines of ndjson."""
+
+  def __init__(self, lines: list[str]) -> None:
+    """Set the lines to return."""
+    self.lines = lines
+
+  def get_online_bots(self) -> str:
+    """Return a list of online bots represented as ndjson."""
+    return "\n".join(self.lines)
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time."""
+    yield from self.lines
+
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return a json list of the synthetic bots with the given ids."""
+    user_id_set = set(user_ids)
+    return f"[{','.join(line for line in self.lines if json.loads(line)['id'] in user_id_set)}]"
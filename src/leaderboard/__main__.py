@@ -9,21 +9,142 @@ Process for generating the leaderboards:
  - Generate html leaderboards from the data which are fun to look at.
 """
 
+import argparse
+import sys
+
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
 from src.leaderboard.chrono.real_time_provider import RealTimeProvider
+from src.leaderboard.data import data_generator as data_generator_functions
+from src.leaderboard.data.data_generator import DataFormat, DataGeneratorOptions, RankingEngine
+from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li import lichess_snapshots
+from src.leaderboard.li.lichess_client import LichessClient
 from src.leaderboard.li.real_lichess_client import RealLichessClient
+from src.leaderboard.li.recording_lichess_client import RecordingLichessClient
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
 from src.leaderboard.log.real_log_writer import RealLogWriter
-from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator, LeaderboardGeneratorOptions
+from src.leaderboard.page.html_generator import HtmlGeneratorOptions
+
+
+def parse_args() -> argparse.Namespace:
+  """Parse the command line arguments."""
+  parser = argparse.ArgumentParser(prog="python -m src.leaderboard", description="Generate lichess bot leaderboards.")
+  parser.add_argument(
+    "--refresh-offline-bots",
+    action="store_true",
+    help="also refresh known bots which are not currently online using the lichess bulk users endpoint",
+  )
+  parser.add_argument(
+    "--parse-workers",
+    type=int,
+    default=1,
+    metavar="N",
+    help="parse the online bots with a pool of N processes, which is faster for very large rosters (default: 1)",
+  )
+  parser.add_argument(
+    "--ranking-engine",
+    choices=[ranking_engine.name.lower() for ranking_engine in RankingEngine],
+    default=RankingEngine.PYTHON.name.lower(),
+    help="the implementation used to rank each leaderboard (numpy requires the optional requirements)",
+  )
+  parser.add_argument(
+    "--data-format",
+    choices=[data_format.name.lower() for data_format in DataFormat],
+    default=DataFormat.JSON.name.lower(),
+    help="the format the leaderboard data is loaded from and saved in (binary is a single snapshot loaded through mmap, "
+    "sqlite also keeps the history of every row)",
+  )
+  parser.add_argument(
+    "--convert-data",
+    choices=[data_format.name.lower() for data_format in DataFormat],
+    metavar="FROM_FORMAT",
+    help="convert the saved leaderboard data from FROM_FORMAT to --data-format and exit without generating",
+  )
+  parser.add_argument(
+    "--render-workers",
+    type=int,
+    default=1,
+    metavar="N",
+    help="render the pages with a pool of N processes, which produces the same html (default: 1)",
+  )
+  parser.add_argument(
+    "--stream-html",
+    action="store_true",
+    help="write each page to its file as it is rendered, rather than rendering every page before writing them",
+  )
+  parser.add_argument(
+    "--precompress",
+    action="store_true",
+    help="also write gzip (and brotli, if it is installed) copies of the html for a web server to send as they are",
+  )
+  parser.add_argument(
+    "--skip-unchanged-pages",
+    action="store_true",
+    help="reuse the html files of the pages which would not change, which requires the files of the last run to be kept",
+  )
+  snapshot_group = parser.add_mutually_exclusive_group()
+  snapshot_group.add_argument(
+    "--record",
+    action="store_true",
+    help="save a snapshot of each lichess response and of the leaderboard data under lichess_snapshots/{capture time}/",
+  )
+  snapshot_group.add_argument(
+    "--replay",
+    type=int,
+    metavar="CAPTURE_TIME",
+    help="replay the lichess responses recorded at CAPTURE_TIME instead of calling lichess, starting from the recorded "
+    "leaderboard data and writing into lichess_snapshots/CAPTURE_TIME/replay/",
+  )
+  return parser.parse_args()
 
 
 if __name__ == "__main__":
+  args = parse_args()
   # Instantiate dependencies
   file_system = RealFileSystem()
-  lichess_client = RealLichessClient()
-  time_provider = FixedTimeProvider(RealTimeProvider().get_current_time())
+  data_format = DataFormat[args.data_format.upper()]
+  if args.convert_data is not None:
+    from_data_format = DataFormat[args.convert_data.upper()]
+    data_generator_functions.convert_leaderboard_data(
+      file_system, from_data_format, data_format, RealTimeProvider().get_current_time()
+    )
+    sys.exit()
   log_writer = RealLogWriter(__name__)
+  lichess_client: LichessClient
+  if args.replay is not None:
+    lichess_snapshots.restore_input_data(file_system, args.replay)
+    replay_lichess_client = ReplayLichessClient(file_system, args.replay)
+    lichess_client = replay_lichess_client
+    time_provider = replay_lichess_client.create_time_provider()
+    # The replay reads and writes the restored copy of the leaderboard data rather than the live data
+    file_system = RealFileSystem(file_paths.replay_dir(args.replay))
+  else:
+    lichess_client = RealLichessClient(log_writer, file_system)
+    time_provider = FixedTimeProvider(RealTimeProvider().get_current_time())
+    if args.record:
+      lichess_snapshots.save_input_data(file_system, time_provider.get_current_time())
+      lichess_client = RecordingLichessClient(lichess_client, file_system, time_provider.get_current_time())
+  data_generator_options = DataGeneratorOptions(
+    refresh_offline_bots=args.refresh_offline_bots,
+    parse_workers=args.parse_workers,
+    ranking_engine=RankingEngine[args.ranking_engine.upper()],
+    data_format=data_format,
+  )
+  html_generator_options = HtmlGeneratorOptions(
+    precompress=args.precompress,
+    render_workers=args.render_workers,
+    stream_html=args.stream_html,
+    skip_unchanged_pages=args.skip_unchanged_pages,
+  )
   # Create generator
-  leaderboard_generator = LeaderboardGenerator(file_system, lichess_client, time_provider, log_writer)
+  leaderboard_generator = LeaderboardGenerator(
+    file_system,
+    lichess_client,
+    time_provider,
+    log_writer,
+    LeaderboardGeneratorOptions(data_generator_options, html_generator_options),
+  )
   # Generate leaderboards
   leaderboard_generator.generate_leaderboards()
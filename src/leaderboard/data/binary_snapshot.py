@@ -0,0 +1,209 @@
+"""A compact binary snapshot of the leaderboard data which is loaded through mmap.
+
+A snapshot holds the bot profiles and the rows of every perf type in a single file, which is laid out as:
+- a header with a magic number, the format version, and the number of tables
+- a directory with the name, offset, and record count of each table
+- a string table, where each name, flair, and flag is stored once however many records refer to it
+- a table of fixed-width records for the profiles and for each perf type, with strings stored as indexes into the string table
+
+Records are only decoded when they are accessed, so opening a snapshot takes the same time however many bots it holds.
+"""
+
+import dataclasses
+import functools
+import struct
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, TypeVar, overload
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+
+
+MAGIC = b"LBSN"
+VERSION = 1
+# Magic number, version, table count
+HEADER_STRUCT = struct.Struct("<4sII")
+# Table name, offset, record count
+DIRECTORY_STRUCT = struct.Struct("<16sQI")
+# Start and end of a string in the string table
+STRING_BOUNDS_STRUCT = struct.Struct("<II")
+STRING_OFFSET_STRUCT = struct.Struct("<I")
+# Name, flair, flag, created, last seen, patron, tos violation
+PROFILE_STRUCT = struct.Struct("<IIIqq??")
+# Name, the fields of LeaderboardPerf, then the fields of RankInfo
+ROW_STRUCT = struct.Struct("<I4i?6iq")
+STRINGS_TABLE_NAME = "strings"
+PROFILES_TABLE_NAME = "profiles"
+
+RecordT = TypeVar("RecordT")
+
+
+class StringTable:
+  """The strings of a snapshot, where each string is decoded the first time it is used and then shared."""
+
+  def __init__(self, buffer: memoryview, offset: int, count: int) -> None:
+    """Initialize a string table which starts at offset in the buffer."""
+    self.buffer = buffer
+    self.offset = offset
+    # The utf-8 bytes of the strings follow the count + 1 offsets which bound them
+    self.bytes_offset = offset + STRING_OFFSET_STRUCT.size * (count + 1)
+    self.strings: list[str | None] = [None] * count
+
+  def get_string(self, index: int) -> str:
+    """Return the string at the index."""
+    string = self.strings[index]
+    if string is None:
+      start, end = STRING_BOUNDS_STRUCT.unpack_from(self.buffer, self.offset + STRING_OFFSET_STRUCT.size * index)
+      string = str(self.buffer[self.bytes_offset + start : self.bytes_offset + end], "utf-8")
+      self.strings[index] = string
+    return string
+
+
+class SnapshotTable(Sequence[RecordT]):
+  """A table of fixed-width records which are decoded when they are accessed."""
+
+  def __init__(
+    self,
+    buffer: memoryview,
+    offset: int,
+    record_count: int,
+    record_struct: struct.Struct,
+    decode_record: Callable[[tuple[Any, ...]], RecordT],
+  ) -> None:
+    """Initialize a table of record_count records which starts at offset in the buffer."""
+    self.buffer = buffer
+    self.offset = offset
+    self.record_count = record_count
+    self.record_struct = record_struct
+    self.decode_record = decode_record
+
+  def __len__(self) -> int:
+    """Return the number of records in the table."""
+    return self.record_count
+
+  @overload
+  def __getitem__(self, index: int) -> RecordT: ...
+
+  @overload
+  def __getitem__(self, index: slice) -> list[RecordT]: ...
+
+  def __getitem__(self, index: int | slice) -> RecordT | list[RecordT]:
+    """Decode and return the record at the index, or a list of the records in the slice."""
+    if isinstance(index, slice):
+      return [self[record_index] for record_index in range(*index.indices(self.record_count))]
+    record_index = index + self.record_count if index < 0 else index
+    if not 0 <= record_index < self.record_count:
+      msg = f"Snapshot table index out of range: {index}"
+      raise IndexError(msg)
+    record_offset = self.offset + self.record_struct.size * record_index
+    return self.decode_record(self.record_struct.unpack_from(self.buffer, record_offset))
+
+  def __iter__(self) -> Iterator[RecordT]:
+    """Decode and yield every record in order."""
+    records = self.buffer[self.offset : self.offset + self.record_struct.size * self.record_count]
+    return map(self.decode_record, self.record_struct.iter_unpack(records))
+
+
+def decode_profile(string_table: StringTable, values: tuple[Any, ...]) -> BotProfile:
+  """Create a BotProfile from the values of a profile record.
+
+  Like BotProfile.from_dict, the bot will be assumed not to be new and to be offline.
+  """
+  name, flair, flag, created, last_seen, patron, tos_violation = values
+  get_string = string_table.get_string
+  return BotProfile(
+    get_string(name), get_string(flair), get_string(flag), created, last_seen, patron, tos_violation, False, False
+  )
+
+
+def decode_row(string_table: StringTable, values: tuple[Any, ...]) -> LeaderboardRow:
+  """Create a LeaderboardRow from the values of a row record."""
+  return LeaderboardRow(string_table.get_string(values[0]), LeaderboardPerf(*values[1:6]), RankInfo(*values[6:]))
+
+
+@dataclasses.dataclass(frozen=True)
+class BinarySnapshot:
+  """The tables of a snapshot, which decode their records when they are accessed."""
+
+  bot_profiles: SnapshotTable[BotProfile]
+  rows_by_perf_type: dict[PerfType, SnapshotTable[LeaderboardRow]]
+
+  @classmethod
+  def from_buffer(cls, buffer: memoryview) -> "BinarySnapshot":
+    """Open the snapshot in the buffer, which only reads the header and the directory."""
+    magic, version, table_count = HEADER_STRUCT.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+      msg = f"Not a version {VERSION} leaderboard snapshot"
+      raise ValueError(msg)
+    tables: dict[str, tuple[int, int]] = {}
+    for table_index in range(table_count):
+      directory_offset = HEADER_STRUCT.size + DIRECTORY_STRUCT.size * table_index
+      table_name, offset, count = DIRECTORY_STRUCT.unpack_from(buffer, directory_offset)
+      tables[table_name.rstrip(b"\0").decode()] = (offset, count)
+    string_table = StringTable(buffer, *tables.pop(STRINGS_TABLE_NAME))
+    bot_profiles = SnapshotTable(
+      buffer, *tables.pop(PROFILES_TABLE_NAME), PROFILE_STRUCT, functools.partial(decode_profile, string_table)
+    )
+    decode_rows = functools.partial(decode_row, string_table)
+    rows_by_perf_type = {
+      PerfType.from_json(table_name): SnapshotTable(buffer, offset, count, ROW_STRUCT, decode_rows)
+      for table_name, (offset, count) in tables.items()
+    }
+    return BinarySnapshot(bot_profiles, rows_by_perf_type)
+
+
+def encode_snapshot(bot_profiles: Iterable[BotProfile], rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> bytes:
+  """Return the snapshot of the bot profiles and the rows of each perf type."""
+  string_indexes: dict[str, int] = {}
+
+  def get_string_index(string: str) -> int:
+    return string_indexes.setdefault(string, len(string_indexes))
+
+  tables: list[tuple[str, bytes, int]] = []
+  profile_records = [
+    PROFILE_STRUCT.pack(
+      get_string_index(profile.name),
+      get_string_index(profile.flair),
+      get_string_index(profile.flag),
+      profile.created,
+      profile.last_seen,
+      profile.patron,
+      profile.tos_violation,
+    )
+    for profile in bot_profiles
+  ]
+  tables.append((PROFILES_TABLE_NAME, b"".join(profile_records), len(profile_records)))
+  for perf_type, rows in rows_by_perf_type.items():
+    row_records = [
+      ROW_STRUCT.pack(
+        get_string_index(row.name),
+        row.perf.rating,
+        row.perf.rd,
+        row.perf.prog,
+        row.perf.games,
+        row.perf.prov,
+        row.rank_info.rank,
+        row.rank_info.delta_rank,
+        row.rank_info.delta_rating,
+        row.rank_info.delta_games,
+        row.rank_info.peak_rank,
+        row.rank_info.peak_rating,
+        row.rank_info.last_played,
+      )
+      for row in rows
+    ]
+    tables.append((perf_type.to_string(), b"".join(row_records), len(row_records)))
+  encoded_strings = [string.encode() for string in string_indexes]
+  string_offsets = [0]
+  for encoded_string in encoded_strings:
+    string_offsets.append(string_offsets[-1] + len(encoded_string))
+  string_table = b"".join(STRING_OFFSET_STRUCT.pack(offset) for offset in string_offsets) + b"".join(encoded_strings)
+  tables.insert(0, (STRINGS_TABLE_NAME, string_table, len(encoded_strings)))
+  # Lay out the tables one after another after the directory
+  directory: list[bytes] = []
+  offset = HEADER_STRUCT.size + DIRECTORY_STRUCT.size * len(tables)
+  for table_name, table_bytes, count in tables:
+    directory.append(DIRECTORY_STRUCT.pack(table_name.encode(), offset, count))
+    offset += len(table_bytes)
+  header = HEADER_STRUCT.pack(MAGIC, VERSION, len(tables))
+  return b"".join([header, *directory, *(table_bytes for _, table_bytes, _ in tables)])
@@ -0,0 +1,33 @@
+"""A registry which assigns a stable integer ID to every bot in the rating history."""
+
+
+class BotIdRegistry:
+  """The integer ID of every bot which has been recorded.
+
+  IDs are assigned in the order that bots are first recorded and are never reused, so the registry is persisted as a json list
+  of names where the index of each name is its ID.
+  """
+
+  def __init__(self, names: list[str] | None = None) -> None:
+    """Initialize a registry where names[bot_id] is the name of each bot."""
+    self.names: list[str] = []
+    self.ids_by_name: dict[str, int] = {}
+    for name in names or []:
+      self.get_id(name)
+
+  def __len__(self) -> int:
+    """Return the number of bots in the registry."""
+    return len(self.names)
+
+  def get_id(self, name: str) -> int:
+    """Return the bot's ID, assigning the next ID if the bot has not been seen before."""
+    bot_id = self.ids_by_name.get(name)
+    if bot_id is None:
+      bot_id = len(self.names)
+      self.names.append(name)
+      self.ids_by_name[name] = bot_id
+    return bot_id
+
+  def get_name(self, bot_id: int) -> str:
+    """Return the name of the bot with the ID."""
+    return self.names[bot_id]
@@ -0,0 +1,258 @@
+"""A columnar implementation of create_ranked_rows which requires numpy.
+
+The updates for a leaderboard are converted to numpy columns so that sorting, checking eligibility, assigning 1224 ranks, and
+calculating the rank info are all vectorized. LeaderboardRow objects are only created at the end, directly from the columns.
+The rows are identical to those created by data_generator.create_ranked_rows.
+"""
+
+import array
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from src.leaderboard.chrono.durations import TWO_WEEKS
+from src.leaderboard.data.data_generator import ProfileIndex
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_update import (
+  CurrentBotPerfOnlyUpdate,
+  FullUpdate,
+  LeaderboardUpdate,
+  PreviousRowOnlyUpdate,
+)
+
+
+# The numeric values of an update in the order of LeaderboardColumns.COLUMN_NAMES
+UpdateValues = tuple[int, int, int, bool, int, int, bool, bool, bool, int, int, int, int, int]
+
+
+def get_full_update_values(
+  update: FullUpdate, bot_profiles_by_name: dict[str, BotProfile]
+) -> tuple[str, LeaderboardPerf, UpdateValues]:
+  """Return the name, the current perf, and the numeric values of the update."""
+  name, perf = update.current_bot_perf.name, update.current_bot_perf.perf
+  previous_perf, previous_rank_info = update.previous_row.perf, update.previous_row.rank_info
+  profile = bot_profiles_by_name[name]
+  return (
+    name,
+    perf,
+    (
+      perf.rating,
+      perf.rd,
+      perf.games,
+      perf.prov,
+      profile.created,
+      profile.last_seen,
+      profile.tos_violation,
+      True,
+      True,
+      previous_rank_info.rank,
+      previous_perf.rating,
+      previous_perf.games,
+      previous_rank_info.peak_rating,
+      previous_rank_info.last_played,
+    ),
+  )
+
+
+def get_previous_row_only_update_values(
+  update: PreviousRowOnlyUpdate, bot_profiles_by_name: dict[str, BotProfile]
+) -> tuple[str, LeaderboardPerf, UpdateValues]:
+  """Return the name, the current perf, and the numeric values of the update."""
+  name, perf, rank_info = update.row.name, update.row.perf, update.row.rank_info
+  profile = bot_profiles_by_name[name]
+  return (
+    name,
+    perf,
+    (
+      perf.rating,
+      perf.rd,
+      perf.games,
+      perf.prov,
+      profile.created,
+      profile.last_seen,
+      profile.tos_violation,
+      True,
+      False,
+      rank_info.rank,
+      perf.rating,
+      perf.games,
+      rank_info.peak_rating,
+      rank_info.last_played,
+    ),
+  )
+
+
+def get_current_bot_perf_only_update_values(
+  update: CurrentBotPerfOnlyUpdate, bot_profiles_by_name: dict[str, BotProfile]
+) -> tuple[str, LeaderboardPerf, UpdateValues]:
+  """Return the name, the current perf, and the numeric values of the update."""
+  name, perf = update.bot_perf.name, update.bot_perf.perf
+  profile = bot_profiles_by_name[name]
+  return (
+    name,
+    perf,
+    (
+      perf.rating,
+      perf.rd,
+      perf.games,
+      perf.prov,
+      profile.created,
+      profile.last_seen,
+      profile.tos_violation,
+      False,
+      True,
+      0,
+      0,
+      0,
+      0,
+      0,
+    ),
+  )
+
+
+# Looking up by type is faster than a chain of isinstance checks
+GET_VALUES_BY_UPDATE_TYPE: dict[type, Callable[[Any, dict[str, BotProfile]], tuple[str, LeaderboardPerf, UpdateValues]]] = {
+  FullUpdate: get_full_update_values,
+  PreviousRowOnlyUpdate: get_previous_row_only_update_values,
+  CurrentBotPerfOnlyUpdate: get_current_bot_perf_only_update_values,
+}
+
+
+class LeaderboardColumns:
+  """The values needed to rank a leaderboard, with one entry in each column per update."""
+
+  COLUMN_NAMES = (
+    "ratings",
+    "rds",
+    "games",
+    "prov",
+    "created",
+    "last_seen",
+    "tos_violation",
+    "has_previous_row",
+    "has_current_perf",
+    "previous_rank",
+    "previous_rating",
+    "previous_games",
+    "previous_peak_rating",
+    "previous_last_played",
+  )
+
+  def __init__(self, updates: list[LeaderboardUpdate], bot_profiles_by_name: dict[str, BotProfile]) -> None:
+    """Convert the updates into columns.
+
+    The values of every update are copied into a single buffer in one pass, which is much faster than building each column
+    separately. The values are not kept in intermediate tuples, which would otherwise trigger the garbage collector many
+    times for a large leaderboard. Updates without a previous row have zeros for all of the previous values.
+    """
+    self.names: list[str] = []
+    self.perfs: list[LeaderboardPerf] = []
+    values = array.array("q")
+    for update in updates:
+      name, perf, update_values = GET_VALUES_BY_UPDATE_TYPE[type(update)](update, bot_profiles_by_name)
+      self.names.append(name)
+      self.perfs.append(perf)
+      values.extend(update_values)
+    table = np.frombuffer(values, dtype=np.int64)
+    (
+      self.ratings,
+      self.rds,
+      self.games,
+      prov,
+      self.created,
+      self.last_seen,
+      tos_violation,
+      has_previous_row,
+      has_current_perf,
+      self.previous_rank,
+      self.previous_rating,
+      self.previous_games,
+      self.previous_peak_rating,
+      self.previous_last_played,
+    ) = table.reshape(len(updates), len(LeaderboardColumns.COLUMN_NAMES)).T
+    self.prov = prov.astype(np.bool_)
+    self.tos_violation = tos_violation.astype(np.bool_)
+    self.has_previous_row = has_previous_row.astype(np.bool_)
+    self.has_current_perf = has_current_perf.astype(np.bool_)
+
+  def get_sort_order(self) -> npt.NDArray[np.int64]:
+    """Return the indices of the updates in leaderboard order.
+
+    Primary sort: rating descending, Secondary sort: rd ascending, Tertiary sort: created time ascending
+    Further sort by name in lowercase (and then by name) for additional tie breaks
+    """
+    # lexsort sorts by the last key first, and numpy compares strings by code point the same as python
+    lower_names = np.array([name.lower() for name in self.names])
+    return np.lexsort((np.array(self.names), lower_names, self.created, self.rds, -self.ratings))
+
+  def get_last_played(self, current_time: int) -> npt.NDArray[np.int64]:
+    """Return the time each bot was last detected having played a game, the same as each LeaderboardUpdate."""
+    # A bot seen for the first time is given the benefit of the doubt
+    played_now = ~self.has_previous_row | (self.has_current_perf & (self.games != self.previous_games))
+    return np.where(played_now, current_time, self.previous_last_played)
+
+  def get_eligible(self, current_time: int, last_played: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+    """Return whether each bot is eligible, the same as BotProfile.is_eligible and LeaderboardUpdate.is_eligible."""
+    profile_eligible = ~self.tos_violation & (current_time - self.last_seen <= TWO_WEEKS)
+    return profile_eligible & ~self.prov & (current_time - last_played <= TWO_WEEKS)
+
+
+def assign_ranks(sorted_ratings: npt.NDArray[np.int64], sorted_eligible: npt.NDArray[np.bool_]) -> npt.NDArray[np.int64]:
+  """Return the 1224 rank of each row in leaderboard order, or zero if the row is not eligible.
+
+  This is the same as the loop in data_generator.create_ranked_rows: an eligible row whose rating differs from the row before
+  it (eligible or not) takes the number of eligible rows so far as its rank, and any other eligible row keeps the rank of the
+  row before it. The rating before the first row is zero.
+  """
+  previous_ratings = np.concatenate((np.zeros(1, dtype=np.int64), sorted_ratings[:-1]))
+  advances = sorted_eligible & (sorted_ratings != previous_ratings)
+  ranks_at_advances = np.where(advances, np.cumsum(sorted_eligible), 0)
+  return np.where(sorted_eligible, np.maximum.accumulate(ranks_at_advances), 0)
+
+
+def create_ranked_rows(
+  updates: list[LeaderboardUpdate],
+  bot_profiles_by_name: dict[str, BotProfile],
+  current_time: int,
+  profile_index: ProfileIndex | None = None,
+) -> list[LeaderboardRow]:
+  """Create the leaderboard rows for each perf type based on a list of updates.
+
+  The profile values are read into columns along with the update values, so the profile index is not used.
+  """
+  del profile_index
+  if not updates:
+    return []
+  columns = LeaderboardColumns(updates, bot_profiles_by_name)
+  order = columns.get_sort_order()
+  last_played = columns.get_last_played(current_time)[order]
+  ratings = columns.ratings[order]
+  ranks = assign_ranks(ratings, columns.get_eligible(current_time, columns.get_last_played(current_time))[order])
+  # The rank info of each update type as calculated by LeaderboardUpdate.to_leaderboard_row
+  has_previous_row = columns.has_previous_row[order]
+  has_current_perf = columns.has_current_perf[order]
+  is_full_update = has_previous_row & has_current_perf
+  previous_rank = columns.previous_rank[order]
+  previous_rating = columns.previous_rating[order]
+  delta_ranks = np.where(has_previous_row, previous_rank - ranks, 0)
+  delta_ratings = np.where(is_full_update, ratings - previous_rating, 0)
+  delta_games = np.where(is_full_update, columns.games[order] - columns.previous_games[order], 0)
+  peak_ranks = np.where(has_previous_row, np.minimum(previous_rank, ranks), ranks)
+  peak_ratings = np.where(
+    is_full_update,
+    np.maximum(previous_rating, ratings),
+    np.where(has_previous_row, columns.previous_peak_rating[order], ratings),
+  )
+  names = columns.names
+  perfs = columns.perfs
+  sorted_indices: list[int] = order.tolist()
+  return [
+    LeaderboardRow(names[index], perfs[index], RankInfo(*rank_info))
+    for index, rank_info in zip(
+      sorted_indices,
+      np.column_stack((ranks, delta_ranks, delta_ratings, delta_games, peak_ranks, peak_ratings, last_played)).tolist(),
+      strict=True,
+    )
+  ]
@@ -1,18 +1,37 @@
 """The main logic for generating the leaderboard data."""
 
+import contextlib
 import dataclasses
 import json
 from collections import defaultdict
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from enum import Enum
+from typing import Any, TypeVar
 
 from src.leaderboard.chrono.time_provider import TimeProvider
+from src.leaderboard.data import json_serializer, parallel_bot_parser
+from src.leaderboard.data.binary_snapshot import BinarySnapshot, encode_snapshot
+from src.leaderboard.data.leaderboard_data_decoder import create_leaderboard_data_decoder
 from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow
-from src.leaderboard.data.leaderboard_update import LeaderboardUpdate
+from src.leaderboard.data.leaderboard_update import (
+  CurrentBotPerfOnlyUpdate,
+  FullUpdate,
+  LeaderboardUpdate,
+  PreviousRowOnlyUpdate,
+)
+from src.leaderboard.data.sqlite_store import SqliteStore
 from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li import bulk_users
 from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder, create_bot_user_decoder
 from src.leaderboard.li.lichess_client import LichessClient
 from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.li.rate_limiter import RateLimiter
+
+
+# The types which are matched by name when creating updates
+NamedT = TypeVar("NamedT", LeaderboardRow, BotPerf)
 
 
 def load_json_list(file_system: FileSystem, file_name: str) -> list[dict[str, Any]]:
@@ -23,17 +42,20 @@ def load_json_list(file_system: FileSystem, file_name: str) -> list[dict[str, An
 
 def load_bot_profiles(file_system: FileSystem) -> dict[str, BotProfile]:
   """Load the known bot profiles."""
-  bot_profile_json_list = load_json_list(file_system, file_paths.bot_profiles_path())
-  bot_profiles = [BotProfile.from_dict(bot_profile_dict) for bot_profile_dict in bot_profile_json_list]
+  file_str = file_system.read_file(file_paths.bot_profiles_path())
+  bot_profiles = create_leaderboard_data_decoder().decode_bot_profiles(file_str) if file_str else []
   return {bot_profile.name: bot_profile for bot_profile in bot_profiles}
 
 
 def load_leaderboard_rows(file_system: FileSystem) -> dict[PerfType, list[LeaderboardRow]]:
-  """Load the previous leaderboard rows and return lists of leaderboard rows grouped by perf type."""
+  """Load the previous leaderboard rows and return lists of them grouped by perf type."""
+  perf_types = list(PerfType.all_except_unknown())
+  file_strs = file_system.read_files([file_paths.data_path(perf_type) for perf_type in perf_types])
+  leaderboard_data_decoder = create_leaderboard_data_decoder()
   previous_rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
-  for perf_type in PerfType.all_except_unknown():
-    row_json_list = load_json_list(file_system, file_paths.data_path(perf_type))
-    previous_rows_by_perf_type[perf_type] = [LeaderboardRow.from_dict(row_dict) for row_dict in row_json_list]
+  for perf_type in perf_types:
+    file_str = file_strs[file_paths.data_path(perf_type)]
+    previous_rows_by_perf_type[perf_type] = leaderboard_data_decoder.decode_leaderboard_rows(file_str) if file_str else []
   return previous_rows_by_perf_type
 
 
@@ -48,23 +70,172 @@ class BotInfoResult:
   bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]]
 
 
-def get_online_bot_info(lichess_client: LichessClient) -> BotInfoResult:
-  """Load all of the current online bots and return the information used to generate the leaderboard."""
+class RankingEngine(Enum):
+  """The implementations which can be used to sort and rank the rows of each leaderboard."""
+
+  # create_ranked_rows in this module
+  PYTHON = 1
+  # columnar_ranker.create_ranked_rows, which requires numpy
+  NUMPY = 2
+
+
+class DataFormat(Enum):
+  """The formats which the leaderboard data can be saved in."""
+
+  # An indented json file for the bot profiles and for each perf type
+  JSON = 1
+  # A single binary snapshot which is loaded through mmap (see binary_snapshot.py)
+  BINARY = 2
+  # A SQLite database which also holds the history of every row (see sqlite_store.py)
+  SQLITE = 3
+  # The same json files as JSON, without the whitespace
+  COMPACT_JSON = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class DataGeneratorOptions:
+  """Settings for the optional stages of generating the leaderboard data."""
+
+  # Whether to refresh the profiles and perfs of known bots which are not currently online
+  refresh_offline_bots: bool = False
+  # The maximum number of offline bots to refresh in a single run
+  max_offline_bots: int = 3000
+  # The number of threads used to fetch batches of offline bots
+  offline_bot_workers: int = 4
+  # The minimum time between the start of each request for a batch of offline bots (seconds)
+  offline_bot_request_interval: float = 0.5
+  # The number of processes used to parse the online bots (if 1 they are parsed one at a time in this process)
+  parse_workers: int = 1
+  # The implementation used to sort and rank the rows of each leaderboard
+  ranking_engine: RankingEngine = RankingEngine.PYTHON
+  # The format the leaderboard data is loaded from and saved in
+  data_format: DataFormat = DataFormat.JSON
+
+
+DEFAULT_DATA_GENERATOR_OPTIONS = DataGeneratorOptions()
+
+
+def load_binary_snapshot(file_system: FileSystem) -> BinarySnapshot | None:
+  """Open the binary snapshot of the leaderboard data, or return None if it has not been saved."""
+  buffer = file_system.map_binary_file(file_paths.binary_snapshot_path())
+  return BinarySnapshot.from_buffer(buffer) if buffer else None
+
+
+def load_leaderboard_data(
+  file_system: FileSystem, data_format: DataFormat
+) -> tuple[dict[str, BotProfile], Mapping[PerfType, Sequence[LeaderboardRow]]]:
+  """Load the known bot profiles and the previous leaderboard rows grouped by perf type.
+
+  If the binary snapshot or the SQLite store has not been saved yet the json files are loaded instead, so the first run
+  converts the data. The rows of a snapshot are the tables of the mapped file, which decode each row as it is accessed, so they
+  have to be read before the snapshot is saved again.
+  """
+  if data_format == DataFormat.BINARY:
+    binary_snapshot = load_binary_snapshot(file_system)
+    if binary_snapshot is not None:
+      bot_profiles_by_name = {bot_profile.name: bot_profile for bot_profile in binary_snapshot.bot_profiles}
+      previous_rows_by_perf_type: dict[PerfType, Sequence[LeaderboardRow]] = {
+        perf_type: binary_snapshot.rows_by_perf_type.get(perf_type, []) for perf_type in PerfType.all_except_unknown()
+      }
+      return bot_profiles_by_name, previous_rows_by_perf_type
+  elif data_format == DataFormat.SQLITE:
+    with contextlib.closing(file_system.connect_database(file_paths.sqlite_store_path())) as connection:
+      sqlite_store = SqliteStore(connection)
+      if sqlite_store.get_generation_count():
+        return sqlite_store.load_bot_profiles(), sqlite_store.load_leaderboard_rows()
+  return load_bot_profiles(file_system), load_leaderboard_rows(file_system)
+
+
+def save_leaderboard_data(
+  file_system: FileSystem,
+  data_format: DataFormat,
+  bot_profiles: list[BotProfile],
+  rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+  current_time: int,
+) -> None:
+  """Save the bot profiles and the leaderboard rows of each perf type in the data format.
+
+  The current time is only used by the SQLite store, which records it with the history of the rows.
+  """
+  if data_format == DataFormat.BINARY:
+    file_system.write_binary_file(file_paths.binary_snapshot_path(), encode_snapshot(bot_profiles, rows_by_perf_type))
+    return
+  if data_format == DataFormat.SQLITE:
+    with contextlib.closing(file_system.connect_database(file_paths.sqlite_store_path())) as connection:
+      SqliteStore(connection).save(bot_profiles, rows_by_perf_type, current_time)
+    return
+  layout = json_serializer.COMPACT_LAYOUT if data_format == DataFormat.COMPACT_JSON else json_serializer.PRETTY_LAYOUT
+  file_contents_by_name = {file_paths.bot_profiles_path(): json_serializer.encode_bot_profiles(bot_profiles, layout)}
+  for perf_type, rows in rows_by_perf_type.items():
+    file_contents_by_name[file_paths.data_path(perf_type)] = json_serializer.encode_leaderboard_rows(rows, layout)
+  file_system.write_files(file_contents_by_name)
+
+
+def convert_leaderboard_data(
+  file_system: FileSystem, from_data_format: DataFormat, to_data_format: DataFormat, current_time: int
+) -> None:
+  """Convert the saved leaderboard data from one format to another."""
+  bot_profiles_by_name, rows_by_perf_type = load_leaderboard_data(file_system, from_data_format)
+  row_lists_by_perf_type = {perf_type: list(rows) for perf_type, rows in rows_by_perf_type.items()}
+  save_leaderboard_data(file_system, to_data_format, list(bot_profiles_by_name.values()), row_lists_by_perf_type, current_time)
+
+
+def get_online_bot_info(
+  lichess_client: LichessClient, bot_user_decoder: BotUserDecoder, parse_workers: int = 1
+) -> BotInfoResult:
+  """Load all of the current online bots and return the information used to generate the leaderboard.
+
+  The bots are parsed one at a time as they are streamed from the client. If parse_workers is greater than 1, chunks of bots
+  are parsed by a pool of processes instead.
+  """
+  if parse_workers > 1:
+    bot_info = parallel_bot_parser.parse_online_bots(lichess_client.iter_online_bots(), type(bot_user_decoder), parse_workers)
+    return BotInfoResult(*bot_info)
   bot_profiles_by_name: dict[str, BotProfile] = {}
   bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]] = defaultdict(list)
-  for bot_json in lichess_client.get_online_bots().splitlines():
-    bot_user = BotUser.from_json(bot_json)
-    has_played_games = False
-    for perf in bot_user.perfs:
-      if perf.games:
-        has_played_games = True
-        bot_perf = BotPerf(bot_user.username, LeaderboardPerf.from_perf(perf))
-        bot_perfs_by_perf_type[perf.perf_type].append(bot_perf)
+  for bot_json in lichess_client.iter_online_bots():
+    bot_user = bot_user_decoder.decode(bot_json)
+    has_played_games = add_bot_perfs(bot_user, bot_perfs_by_perf_type)
     if has_played_games:
       bot_profiles_by_name[bot_user.username] = BotProfile.from_bot_user(bot_user)
   return BotInfoResult(bot_profiles_by_name, bot_perfs_by_perf_type)
 
 
+def add_bot_perfs(bot_user: BotUser, bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]]) -> bool:
+  """Add a BotPerf for each perf type the bot has played games in and return whether any games were played."""
+  played_perfs = bot_user.get_played_perfs()
+  for perf in played_perfs:
+    bot_perfs_by_perf_type[perf.perf_type].append(BotPerf(bot_user.username, LeaderboardPerf.from_perf(perf)))
+  return bool(played_perfs)
+
+
+def get_offline_bot_info(
+  lichess_client: LichessClient,
+  bot_user_decoder: BotUserDecoder,
+  offline_profiles: list[BotProfile],
+  options: DataGeneratorOptions,
+) -> BotInfoResult:
+  """Refresh the information about known bots which are not currently online.
+
+  The bots are looked up in batches with the lichess bulk users endpoint. The most recently seen bots are refreshed first
+  and at most options.max_offline_bots are refreshed, so the time taken stays bounded no matter how many dormant bots there
+  are. The refreshed profiles are neither new nor online.
+  """
+  profiles_to_refresh = sorted(offline_profiles, key=lambda profile: -profile.last_seen)[: options.max_offline_bots]
+  names_to_refresh = {profile.name for profile in profiles_to_refresh}
+  rate_limiter = RateLimiter(options.offline_bot_request_interval)
+  bot_profiles_by_name: dict[str, BotProfile] = {}
+  bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]] = defaultdict(list)
+  user_ids = [profile.name.lower() for profile in profiles_to_refresh]
+  for users_json in bulk_users.iter_user_batches(lichess_client, user_ids, options.offline_bot_workers, rate_limiter):
+    for bot_user in bot_user_decoder.decode_list(users_json):
+      # Only merge bots which match a known profile exactly (a bot can change the capitalization of their name)
+      if bot_user.username in names_to_refresh:
+        add_bot_perfs(bot_user, bot_perfs_by_perf_type)
+        bot_profiles_by_name[bot_user.username] = BotProfile.from_offline_bot_user(bot_user)
+  return BotInfoResult(bot_profiles_by_name, bot_perfs_by_perf_type)
+
+
 def merge_bot_profiles(
   previous_profiles_by_name: dict[str, BotProfile], current_profiles_by_name: dict[str, BotProfile]
 ) -> dict[str, BotProfile]:
@@ -82,16 +253,61 @@ def merge_bot_profiles(
   return merged_profiles_by_name
 
 
-def create_updates(previous_rows: list[LeaderboardRow], current_bot_perfs: list[BotPerf]) -> list[LeaderboardUpdate]:
-  """Group previous rows and current bot info by bot name and create updates."""
-  previous_row_by_name: dict[str, LeaderboardRow] = {row.name: row for row in previous_rows}
-  current_bot_perfs_by_name: dict[str, BotPerf] = {bot_perf.name: bot_perf for bot_perf in current_bot_perfs}
+def merge_bot_perfs(
+  online_bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]], offline_bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]]
+) -> dict[PerfType, list[BotPerf]]:
+  """Combine the bot perfs of the online and refreshed offline bots."""
+  return {
+    perf_type: online_bot_perfs_by_perf_type.get(perf_type, []) + offline_bot_perfs_by_perf_type.get(perf_type, [])
+    for perf_type in online_bot_perfs_by_perf_type.keys() | offline_bot_perfs_by_perf_type.keys()
+  }
+
+
+def sort_unique_by_name(items: Iterable[NamedT]) -> list[tuple[tuple[str, str], int, NamedT]]:
+  """Return (name sort key, index, item) triples sorted by name.
+
+  Only the last item for each name is kept, matching a dict keyed by name. Sorting input which is already in name order (like
+  the rows loaded from the leaderboard files) only takes linear time.
+  """
+  keyed_items = sorted([(name_sort_key(item.name), index, item) for index, item in enumerate(items)])
   return [
-    LeaderboardUpdate.create_update(previous_row_by_name.get(name), current_bot_perfs_by_name.get(name))
-    for name in previous_row_by_name.keys() | current_bot_perfs_by_name.keys()
+    keyed_item
+    for keyed_item, next_keyed_item in zip(keyed_items, [*keyed_items[1:], None], strict=False)
+    if next_keyed_item is None or next_keyed_item[0] != keyed_item[0]
   ]
 
 
+def iter_updates(previous_rows: Iterable[LeaderboardRow], current_bot_perfs: Iterable[BotPerf]) -> Iterator[LeaderboardUpdate]:
+  """Yield an update for each bot in name order by merge-joining the previous rows and the current bot perfs.
+
+  Both sequences are sorted by name and walked together, so no dicts keyed by name or set unions of names are created.
+  """
+  keyed_rows = sort_unique_by_name(previous_rows)
+  keyed_bot_perfs = sort_unique_by_name(current_bot_perfs)
+  row_index = 0
+  bot_perf_index = 0
+  while row_index < len(keyed_rows) and bot_perf_index < len(keyed_bot_perfs):
+    row_key, _, row = keyed_rows[row_index]
+    bot_perf_key, _, bot_perf = keyed_bot_perfs[bot_perf_index]
+    if row_key < bot_perf_key:
+      yield PreviousRowOnlyUpdate(row)
+      row_index += 1
+    elif bot_perf_key < row_key:
+      yield CurrentBotPerfOnlyUpdate(bot_perf)
+      bot_perf_index += 1
+    else:
+      yield FullUpdate(row, bot_perf)
+      row_index += 1
+      bot_perf_index += 1
+  yield from (PreviousRowOnlyUpdate(row) for _, _, row in keyed_rows[row_index:])
+  yield from (CurrentBotPerfOnlyUpdate(bot_perf) for _, _, bot_perf in keyed_bot_perfs[bot_perf_index:])
+
+
+def create_updates(previous_rows: Iterable[LeaderboardRow], current_bot_perfs: Iterable[BotPerf]) -> list[LeaderboardUpdate]:
+  """Match previous rows and current bot info by bot name and create updates in name order."""
+  return list(iter_updates(previous_rows, current_bot_perfs))
+
+
 def name_sort_key(name: str) -> tuple[str, str]:
   """Return a key for sorting by name: (name.lower(), name).
 
@@ -100,22 +316,69 @@ def name_sort_key(name: str) -> tuple[str, str]:
   return (name.lower(), name)
 
 
+def create_sort_key(
+  update: LeaderboardUpdate, bot_profiles_by_name: dict[str, BotProfile]
+) -> tuple[int, int, int, tuple[str, str]]:
+  """Return the key for sorting an update into leaderboard order.
+
+  Primary sort: rating descending, Secondary sort: rd ascending, Tertiary sort: created time ascending
+  Further sort by name in lowercase (and then by name) for additional tie breaks
+  """
+  return (
+    -update.get_rating(),
+    update.get_rd(),
+    bot_profiles_by_name[update.get_name()].created,
+    name_sort_key(update.get_name()),
+  )
+
+
+# Rating deviations are far smaller than this, so packing the rd below the rating never changes the order of the ratings
+RD_SCALE = 1 << 32
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ProfileIndex:
+  """The values from the bot profiles which are needed to rank the updates, computed once per run for every perf type."""
+
+  # Whether each bot's profile is eligible for the leaderboards at the current time
+  eligible_by_name: dict[str, bool]
+  # Each bot's created time and position in name order, packed into one integer which sorts in the same order
+  profile_key_by_name: dict[str, int]
+  # Every profile key is less than this
+  profile_key_scale: int
+
+  @classmethod
+  def create(cls, bot_profiles_by_name: dict[str, BotProfile], current_time: int) -> "ProfileIndex":
+    """Create the index for the bot profiles at the current time."""
+    eligible_by_name = {name: profile.is_eligible(current_time) for name, profile in bot_profiles_by_name.items()}
+    names = sorted(bot_profiles_by_name, key=name_sort_key)
+    profile_key_by_name = {
+      name: bot_profiles_by_name[name].created * len(names) + name_index for name_index, name in enumerate(names)
+    }
+    max_created = max((profile.created for profile in bot_profiles_by_name.values()), default=0)
+    return ProfileIndex(eligible_by_name, profile_key_by_name, (max_created + 1) * len(names))
+
+  def get_sort_key(self, update: LeaderboardUpdate) -> int:
+    """Return create_sort_key packed into one integer, which is much faster to create and compare than a tuple."""
+    rating_and_rd = update.get_rd() - update.get_rating() * RD_SCALE
+    return rating_and_rd * self.profile_key_scale + self.profile_key_by_name[update.get_name()]
+
+
 def create_ranked_rows(
-  updates: list[LeaderboardUpdate], bot_profiles_by_name: dict[str, BotProfile], current_time: int
+  updates: Iterable[LeaderboardUpdate],
+  bot_profiles_by_name: dict[str, BotProfile],
+  current_time: int,
+  profile_index: ProfileIndex | None = None,
 ) -> list[LeaderboardRow]:
-  """Create the leaderboard rows for each perf type based on a list of updates."""
+  """Create the leaderboard rows for each perf type based on the updates, which can be a generator such as iter_updates.
+
+  The profile index should be shared by all of the perf types. One is created if it is not given.
+  """
+  if profile_index is None:
+    profile_index = ProfileIndex.create(bot_profiles_by_name, current_time)
+  sorted_update_list = sorted(updates, key=profile_index.get_sort_key)
+  eligible_by_name = profile_index.eligible_by_name
   new_rows: list[LeaderboardRow] = []
-  # Primary sort: rating descending, Secondary sort: rd ascending, Tertiary sort: created time ascending
-  # Further sort by name in lowercase (and then by name) for additional tie breaks
-  sorted_update_list = sorted(
-    updates,
-    key=lambda update: (
-      -update.get_rating(),
-      update.get_rd(),
-      bot_profiles_by_name[update.get_name()].created,
-      name_sort_key(update.get_name()),
-    ),
-  )
   # The first in the list will be ranked #1
   rank = 0
   # Used for 1224 ranking (https://en.wikipedia.org/wiki/Ranking#Standard_competition_ranking_(%221224%22_ranking))
@@ -124,14 +387,14 @@ def create_ranked_rows(
   for update in sorted_update_list:
     # Rank equals zero signals that the bot should not be included on the leaderboard
     rank_to_set = 0
+    rating = update.get_rating()
     # Eligibility works slightly differently than for lichess' official leaderboards (https://lichess.org/faq#leaderboards)
     # 1. The bot must have not violated the TOS
     # 2. The bot must have appeared online in the last 2 weeks
     # 3. The bot must not have a provisional rating (https://lichess.org/faq#provisional)
     # 4. The bot must have played a game for that perf type in the last 2 weeks
-    bot_profile_eligible = bot_profiles_by_name[update.get_name()].is_eligible(current_time)
-    if bot_profile_eligible and update.is_eligible(current_time):
-      if update.get_rating() == previous_rating:
+    if eligible_by_name[update.get_name()] and update.is_eligible(current_time):
+      if rating == previous_rating:
         same_rank_count += 1
       else:
         rank += same_rank_count
@@ -139,10 +402,24 @@ def create_ranked_rows(
         same_rank_count = 0
       rank_to_set = rank
     new_rows.append(update.to_leaderboard_row(rank_to_set, current_time))
-    previous_rating = update.get_rating()
+    previous_rating = rating
   return new_rows
 
 
+def get_create_ranked_rows(
+  ranking_engine: RankingEngine,
+) -> Callable[[list[LeaderboardUpdate], dict[str, BotProfile], int, ProfileIndex | None], list[LeaderboardRow]]:
+  """Return the create_ranked_rows function for the ranking engine.
+
+  The engines are imported lazily so that numpy is only required when it is used (and because the engines use this module).
+  """
+  if ranking_engine == RankingEngine.NUMPY:
+    from src.leaderboard.data import columnar_ranker
+
+    return columnar_ranker.create_ranked_rows
+  return create_ranked_rows
+
+
 @dataclasses.dataclass(frozen=True)
 class LeaderboardDataResult:
   """The result of generating the leaderboard data.
@@ -180,31 +457,50 @@ class DataGenerator:
   The generator takes a file_system, a lichess_client, and a time_provider as parameters.
   """
 
-  def __init__(self, file_system: FileSystem, lichess_client: LichessClient, time_provider: TimeProvider) -> None:
+  def __init__(
+    self,
+    file_system: FileSystem,
+    lichess_client: LichessClient,
+    time_provider: TimeProvider,
+    options: DataGeneratorOptions = DEFAULT_DATA_GENERATOR_OPTIONS,
+  ) -> None:
     """Initialize a new generator."""
     self.file_system: FileSystem = file_system
     self.lichess_client: LichessClient = lichess_client
     self.time_provider: TimeProvider = time_provider
+    self.options: DataGeneratorOptions = options
+    self.bot_user_decoder: BotUserDecoder = create_bot_user_decoder()
+    self.create_ranked_rows = get_create_ranked_rows(options.ranking_engine)
 
   def generate_leaderboard_data(self) -> LeaderboardDataResult:
     """Generate and save all leaderboard data."""
     # Load the existing leaderboard data
-    bot_profiles_by_name = load_bot_profiles(self.file_system)
-    previous_rows_by_perf_type = load_leaderboard_rows(self.file_system)
+    bot_profiles_by_name, previous_rows_by_perf_type = load_leaderboard_data(self.file_system, self.options.data_format)
     # Get the current online bot info
-    online_bot_info = get_online_bot_info(self.lichess_client)
+    online_bot_info = get_online_bot_info(self.lichess_client, self.bot_user_decoder, self.options.parse_workers)
     # Update the bot profiles
     updated_bot_profiles = merge_bot_profiles(bot_profiles_by_name, online_bot_info.bot_profiles_by_name)
+    current_bot_perfs_by_perf_type = online_bot_info.bot_perfs_by_perf_type
+    # Optionally refresh the known bots which are not online
+    if self.options.refresh_offline_bots:
+      offline_profiles = [
+        profile for name, profile in bot_profiles_by_name.items() if name not in online_bot_info.bot_profiles_by_name
+      ]
+      offline_bot_info = get_offline_bot_info(self.lichess_client, self.bot_user_decoder, offline_profiles, self.options)
+      updated_bot_profiles.update(offline_bot_info.bot_profiles_by_name)
+      current_bot_perfs_by_perf_type = merge_bot_perfs(current_bot_perfs_by_perf_type, offline_bot_info.bot_perfs_by_perf_type)
     # Combine the data and create update objects for all of the leaderboards
     updates_by_perf_type = {
       perf_type: create_updates(
-        previous_rows_by_perf_type.get(perf_type, []), online_bot_info.bot_perfs_by_perf_type.get(perf_type, [])
+        previous_rows_by_perf_type.get(perf_type, []), current_bot_perfs_by_perf_type.get(perf_type, [])
       )
       for perf_type in PerfType.all_except_unknown()
     }
     # Create and return the leaderboards with rank information
+    current_time = self.time_provider.get_current_time()
+    profile_index = ProfileIndex.create(updated_bot_profiles, current_time)
     ranked_rows_by_perf_type = {
-      perf_type: create_ranked_rows(updates, updated_bot_profiles, self.time_provider.get_current_time())
+      perf_type: self.create_ranked_rows(updates, updated_bot_profiles, current_time, profile_index)
       for perf_type, updates in updates_by_perf_type.items()
     }
     return LeaderboardDataResult.create_result(updated_bot_profiles, ranked_rows_by_perf_type)
@@ -0,0 +1,21 @@
+"""An implementation of LeaderboardDataDecoder which uses the standard library json module."""
+
+import json
+from typing import Any
+
+from src.leaderboard.data.leaderboard_data_decoder import LeaderboardDataDecoder
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+
+
+class JsonLeaderboardDataDecoder(LeaderboardDataDecoder):
+  """Decodes the full json dicts and then converts each of them with from_dict."""
+
+  def decode_bot_profiles(self, json_str: str) -> list[BotProfile]:
+    """Parse a json list of bot profiles and convert it to a list of BotProfiles."""
+    bot_profile_dicts: list[dict[str, Any]] = json.loads(json_str)
+    return [BotProfile.from_dict(bot_profile_dict) for bot_profile_dict in bot_profile_dicts]
+
+  def decode_leaderboard_rows(self, json_str: str) -> list[LeaderboardRow]:
+    """Parse a json list of leaderboard rows and convert it to a list of LeaderboardRows."""
+    row_dicts: list[dict[str, Any]] = json.loads(json_str)
+    return [LeaderboardRow.from_dict(row_dict) for row_dict in row_dicts]
@@ -0,0 +1,137 @@
+"""Serializers which write the leaderboard data as json in a single pass.
+
+The output is the same as json.dumps of the as_dict of each object, so fields which have their default value are left out,
+but each field is written directly from the object instead of first copying the object into a dict and then removing the
+defaults from it.
+"""
+
+import dataclasses
+from collections.abc import Iterable
+from json.encoder import encode_basestring_ascii
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonLayout:
+  """The whitespace written between the values of a json document."""
+
+  # Written between a key and its value
+  key_separator: str
+  # Written before each item of a list or member of an object, followed by the indent once per level of nesting
+  line_break: str
+  indent: str
+
+  def get_item_separators(self, depth: int) -> tuple[str, str, str]:
+    """Return what is written before the first item, between items, and after the last item at the depth."""
+    item_indent = self.line_break + self.indent * (depth + 1)
+    return item_indent, "," + item_indent, self.line_break + self.indent * depth
+
+
+# The layout of json.dumps(..., indent=2)
+PRETTY_LAYOUT = JsonLayout(": ", "\n", "  ")
+# The layout of json.dumps(..., separators=(",", ":"))
+COMPACT_LAYOUT = JsonLayout(":", "", "")
+
+
+def encode_object(members: list[str], layout: JsonLayout, depth: int) -> str:
+  """Return a json object of the members, each of which is an encoded key and value."""
+  if not members:
+    return "{}"
+  start, separator, end = layout.get_item_separators(depth)
+  return "{" + start + separator.join(members) + end + "}"
+
+
+def encode_list(items: list[str], layout: JsonLayout) -> str:
+  """Return a json list of the encoded items."""
+  if not items:
+    return "[]"
+  start, separator, end = layout.get_item_separators(0)
+  return "[" + start + separator.join(items) + end + "]"
+
+
+def get_bot_profile_members(bot_profile: BotProfile, key_separator: str) -> list[str]:
+  """Return the encoded members of a bot profile which do not have their default values."""
+  members: list[str] = []
+  if bot_profile.name:
+    members.append(f'"name"{key_separator}{encode_basestring_ascii(bot_profile.name)}')
+  if bot_profile.flair:
+    members.append(f'"flair"{key_separator}{encode_basestring_ascii(bot_profile.flair)}')
+  if bot_profile.flag:
+    members.append(f'"flag"{key_separator}{encode_basestring_ascii(bot_profile.flag)}')
+  if bot_profile.created:
+    members.append(f'"created"{key_separator}{bot_profile.created}')
+  if bot_profile.last_seen:
+    members.append(f'"last_seen"{key_separator}{bot_profile.last_seen}')
+  if bot_profile.patron:
+    members.append(f'"patron"{key_separator}true')
+  if bot_profile.tos_violation:
+    members.append(f'"tos_violation"{key_separator}true')
+  if bot_profile.new:
+    members.append(f'"new"{key_separator}true')
+  if bot_profile.online:
+    members.append(f'"online"{key_separator}true')
+  return members
+
+
+def get_perf_members(perf: LeaderboardPerf, key_separator: str) -> list[str]:
+  """Return the encoded members of a perf which do not have their default values."""
+  members: list[str] = []
+  if perf.rating:
+    members.append(f'"rating"{key_separator}{perf.rating}')
+  if perf.rd:
+    members.append(f'"rd"{key_separator}{perf.rd}')
+  if perf.prog:
+    members.append(f'"prog"{key_separator}{perf.prog}')
+  if perf.games:
+    members.append(f'"games"{key_separator}{perf.games}')
+  if perf.prov:
+    members.append(f'"prov"{key_separator}true')
+  return members
+
+
+def get_rank_info_members(rank_info: RankInfo, key_separator: str) -> list[str]:
+  """Return the encoded members of a rank info which do not have their default values."""
+  members: list[str] = []
+  if rank_info.rank:
+    members.append(f'"rank"{key_separator}{rank_info.rank}')
+  if rank_info.delta_rank:
+    members.append(f'"delta_rank"{key_separator}{rank_info.delta_rank}')
+  if rank_info.delta_rating:
+    members.append(f'"delta_rating"{key_separator}{rank_info.delta_rating}')
+  if rank_info.delta_games:
+    members.append(f'"delta_games"{key_separator}{rank_info.delta_games}')
+  if rank_info.peak_rank:
+    members.append(f'"peak_rank"{key_separator}{rank_info.peak_rank}')
+  if rank_info.peak_rating:
+    members.append(f'"peak_rating"{key_separator}{rank_info.peak_rating}')
+  if rank_info.last_played:
+    members.append(f'"last_played"{key_separator}{rank_info.last_played}')
+  return members
+
+
+def encode_bot_profiles(bot_profiles: Iterable[BotProfile], layout: JsonLayout = PRETTY_LAYOUT) -> str:
+  """Return the json list of the bot profiles, as json.dumps would write the as_dict of each profile."""
+  key_separator = layout.key_separator
+  return encode_list(
+    [encode_object(get_bot_profile_members(bot_profile, key_separator), layout, 1) for bot_profile in bot_profiles], layout
+  )
+
+
+def encode_leaderboard_rows(rows: Iterable[LeaderboardRow], layout: JsonLayout = PRETTY_LAYOUT) -> str:
+  """Return the json list of the rows, as json.dumps would write the as_dict of each row."""
+  key_separator = layout.key_separator
+  encoded_rows: list[str] = []
+  for row in rows:
+    members: list[str] = []
+    if row.name:
+      members.append(f'"name"{key_separator}{encode_basestring_ascii(row.name)}')
+    # Like the fields with default values, objects where every field has its default value are left out
+    perf_members = get_perf_members(row.perf, key_separator)
+    if perf_members:
+      members.append(f'"perf"{key_separator}{encode_object(perf_members, layout, 2)}')
+    rank_info_members = get_rank_info_members(row.rank_info, key_separator)
+    if rank_info_members:
+      members.append(f'"rank_info"{key_separator}{encode_object(rank_info_members, layout, 2)}')
+    encoded_rows.append(encode_object(members, layout, 1))
+  return encode_list(encoded_rows, layout)
@@ -0,0 +1,36 @@
+"""An abstraction for decoding the json files of the leaderboard data into BotProfiles and LeaderboardRows."""
+
+import abc
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+
+
+class LeaderboardDataDecoder(abc.ABC):
+  """Interface for decoding the saved json lists of bot profiles and leaderboard rows.
+
+  The objects are the same as those created by BotProfile.from_dict and LeaderboardRow.from_dict.
+  """
+
+  @abc.abstractmethod
+  def decode_bot_profiles(self, json_str: str) -> list[BotProfile]:
+    """Parse a json list of bot profiles and convert it to a list of BotProfiles."""
+    ...
+
+  @abc.abstractmethod
+  def decode_leaderboard_rows(self, json_str: str) -> list[LeaderboardRow]:
+    """Parse a json list of leaderboard rows and convert it to a list of LeaderboardRows."""
+    ...
+
+
+def create_leaderboard_data_decoder() -> LeaderboardDataDecoder:
+  """Return the fastest decoder available.
+
+  The msgspec decoder is used if msgspec is installed, otherwise the decoder falls back to the standard library json module.
+  """
+  try:
+    from src.leaderboard.data.msgspec_leaderboard_data_decoder import MsgspecLeaderboardDataDecoder
+  except ImportError:
+    from src.leaderboard.data.json_leaderboard_data_decoder import JsonLeaderboardDataDecoder
+
+    return JsonLeaderboardDataDecoder()
+  return MsgspecLeaderboardDataDecoder()
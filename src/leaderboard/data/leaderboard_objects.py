@@ -8,7 +8,7 @@ from src.leaderboard.data import default_remover
 from src.leaderboard.li.bot_user import BotUser, Perf
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BotProfile:
   """Information related to the bot's profile.
 
@@ -54,6 +54,24 @@ class BotProfile:
       True,
     )
 
+  @classmethod
+  def from_offline_bot_user(cls, bot_user: BotUser) -> "BotProfile":
+    """Create a BotProfile from a BotUser which was looked up while the bot was offline.
+
+    The bot is already known so it will be assumed not to be new and to be offline.
+    """
+    return BotProfile(
+      bot_user.username,
+      bot_user.flair,
+      bot_user.flag,
+      bot_user.created_at,
+      bot_user.seen_at,
+      bot_user.patron,
+      bot_user.tos_violation,
+      False,
+      False,
+    )
+
   @classmethod
   def from_dict(cls, json_dict: dict[str, Any]) -> "BotProfile":
     """Create a BotProfile from a json dict.
@@ -104,7 +122,7 @@ class BotProfile:
     return default_remover.to_dict_without_defaults(dataclasses.asdict(self))
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class LeaderboardPerf:
   """Information related to a bot's performance for a particular PerfType.
 
@@ -139,7 +157,7 @@ class LeaderboardPerf:
     )
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BotPerf:
   """A pair of bot name and LeaderboardPerf."""
 
@@ -147,7 +165,7 @@ class BotPerf:
   perf: LeaderboardPerf
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class RankInfo:
   """Information related to the bot's rank in the leaderboard row."""
 
@@ -181,7 +199,7 @@ class RankInfo:
     )
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class LeaderboardRow:
   """Data that is specific to a row on a particular leaderboard."""
 
@@ -10,6 +10,9 @@ from src.leaderboard.data.leaderboard_objects import BotPerf, LeaderboardRow, Ra
 class LeaderboardUpdate(abc.ABC):
   """The information required to update a row in the leaderboard."""
 
+  # No instance attributes here so that the subclasses do not have a __dict__
+  __slots__ = ()
+
   @abc.abstractmethod
   def get_name(self) -> str:
     """Return the bot's name."""
@@ -57,7 +60,7 @@ class LeaderboardUpdate(abc.ABC):
     return not prov and played_in_last_two_weeks
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class PreviousRowOnlyUpdate(LeaderboardUpdate):
   """Only the previous row was found.
 
@@ -85,6 +88,12 @@ class PreviousRowOnlyUpdate(LeaderboardUpdate):
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
     """Convert the update information into a leaderboard row."""
     del current_time
+    previous_rank_info = self.row.rank_info
+    # If the bot has kept its rank and the previous row has no deltas, the new row would equal it, so the frozen row is reused
+    if previous_rank_info.rank == rank == previous_rank_info.peak_rank and not (
+      previous_rank_info.delta_rank or previous_rank_info.delta_rating or previous_rank_info.delta_games
+    ):
+      return self.row
     delta_rank = self.row.rank_info.rank - rank
     delta_rating = 0
     delta_games = 0
@@ -95,7 +104,7 @@ class PreviousRowOnlyUpdate(LeaderboardUpdate):
     return LeaderboardRow(self.row.name, self.row.perf, rank_info)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class CurrentBotPerfOnlyUpdate(LeaderboardUpdate):
   """Only the current perf was found.
 
@@ -133,12 +142,18 @@ class CurrentBotPerfOnlyUpdate(LeaderboardUpdate):
     return LeaderboardRow(self.bot_perf.name, self.bot_perf.perf, rank_info)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class FullUpdate(LeaderboardUpdate):
   """The bot is already on the leaderboard and we have new data."""
 
   previous_row: LeaderboardRow
   current_bot_perf: BotPerf
+  # Derived from the rows when the update is created, since both eligibility and the new row need it
+  delta_games: int = dataclasses.field(init=False, repr=False, compare=False)
+
+  def __post_init__(self) -> None:
+    """Cache the values derived from the previous row and the current perf."""
+    object.__setattr__(self, "delta_games", self.current_bot_perf.perf.games - self.previous_row.perf.games)
 
   def get_name(self) -> str:
     """Return the bot's name."""
@@ -155,9 +170,8 @@ class FullUpdate(LeaderboardUpdate):
 
   def get_delta_games_and_last_played(self, current_time: int) -> tuple[int, int]:
     """Return a pair of delta games and last played."""
-    delta_games = self.current_bot_perf.perf.games - self.previous_row.perf.games
-    last_played = current_time if delta_games else self.previous_row.rank_info.last_played
-    return delta_games, last_played
+    last_played = current_time if self.delta_games else self.previous_row.rank_info.last_played
+    return self.delta_games, last_played
 
   def is_eligible(self, current_time: int) -> bool:
     """Return whether the bot is eligible for the leaderboard."""
@@ -166,12 +180,14 @@ class FullUpdate(LeaderboardUpdate):
 
   def to_leaderboard_row(self, rank: int, current_time: int) -> LeaderboardRow:
     """Convert the update information into a leaderboard row."""
+    previous_rank_info = self.previous_row.rank_info
+    current_perf = self.current_bot_perf.perf
     # Moving up in the leaderboard should count as a positive delta (3 -> 1 yields +2)
-    delta_rank = self.previous_row.rank_info.rank - rank
-    delta_rating = self.current_bot_perf.perf.rating - self.previous_row.perf.rating
+    delta_rank = previous_rank_info.rank - rank
+    delta_rating = current_perf.rating - self.previous_row.perf.rating
     # Higher ranking, lower rank number
-    peak_rank = min(self.previous_row.rank_info.rank, rank)
-    peak_rating = max(self.previous_row.perf.rating, self.current_bot_perf.perf.rating)
+    peak_rank = min(previous_rank_info.rank, rank)
+    peak_rating = max(self.previous_row.perf.rating, current_perf.rating)
     delta_games, last_played = self.get_delta_games_and_last_played(current_time)
     rank_info = RankInfo(rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played)
-    return LeaderboardRow(self.current_bot_perf.name, self.current_bot_perf.perf, rank_info)
+    return LeaderboardRow(self.current_bot_perf.name, current_perf, rank_info)
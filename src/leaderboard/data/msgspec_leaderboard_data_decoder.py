@@ -0,0 +1,103 @@
+"""An implementation of LeaderboardDataDecoder which uses msgspec.
+
+msgspec is an optional dependency. The json is decoded straight into the structs below, which fill in the fields that were
+left out because they had their default values, so no dicts are created. Each struct is then converted by passing its fields
+to the object it stands for by name.
+"""
+
+import msgspec
+
+from src.leaderboard.data.leaderboard_data_decoder import LeaderboardDataDecoder
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+
+
+class BotProfileStruct(msgspec.Struct, gc=False):
+  """The saved fields of a BotProfile."""
+
+  name: str = ""
+  flair: str = ""
+  flag: str = ""
+  created: int = 0
+  last_seen: int = 0
+  patron: bool = False
+  tos_violation: bool = False
+
+
+class LeaderboardPerfStruct(msgspec.Struct, gc=False):
+  """The fields of a LeaderboardPerf."""
+
+  rating: int = 0
+  rd: int = 0
+  prog: int = 0
+  games: int = 0
+  prov: bool = False
+
+
+class RankInfoStruct(msgspec.Struct, gc=False):
+  """The fields of a RankInfo."""
+
+  rank: int = 0
+  delta_rank: int = 0
+  delta_rating: int = 0
+  delta_games: int = 0
+  peak_rank: int = 0
+  peak_rating: int = 0
+  last_played: int = 0
+
+
+class LeaderboardRowStruct(msgspec.Struct, gc=False):
+  """The fields of a LeaderboardRow."""
+
+  name: str = ""
+  perf: LeaderboardPerfStruct = msgspec.field(default_factory=LeaderboardPerfStruct)
+  rank_info: RankInfoStruct = msgspec.field(default_factory=RankInfoStruct)
+
+
+class MsgspecLeaderboardDataDecoder(LeaderboardDataDecoder):
+  """Decodes straight into typed structs and then converts those to BotProfiles and LeaderboardRows."""
+
+  def __init__(self) -> None:
+    """Create the reusable msgspec decoders."""
+    self.bot_profiles_decoder = msgspec.json.Decoder(list[BotProfileStruct])
+    self.leaderboard_rows_decoder = msgspec.json.Decoder(list[LeaderboardRowStruct])
+
+  def decode_bot_profiles(self, json_str: str) -> list[BotProfile]:
+    """Parse a json list of bot profiles and convert it to a list of BotProfiles.
+
+    Like BotProfile.from_dict, the bots will be assumed not to be new and to be offline.
+    """
+    return [
+      BotProfile(
+        name=struct.name,
+        flair=struct.flair,
+        flag=struct.flag,
+        created=struct.created,
+        last_seen=struct.last_seen,
+        patron=struct.patron,
+        tos_violation=struct.tos_violation,
+        new=False,
+        online=False,
+      )
+      for struct in self.bot_profiles_decoder.decode(json_str)
+    ]
+
+  def decode_leaderboard_rows(self, json_str: str) -> list[LeaderboardRow]:
+    """Parse a json list of leaderboard rows and convert it to a list of LeaderboardRows."""
+    return [
+      LeaderboardRow(
+        name=struct.name,
+        perf=LeaderboardPerf(
+          rating=struct.perf.rating, rd=struct.perf.rd, prog=struct.perf.prog, games=struct.perf.games, prov=struct.perf.prov
+        ),
+        rank_info=RankInfo(
+          rank=struct.rank_info.rank,
+          delta_rank=struct.rank_info.delta_rank,
+          delta_rating=struct.rank_info.delta_rating,
+          delta_games=struct.rank_info.delta_games,
+          peak_rank=struct.rank_info.peak_rank,
+          peak_rating=struct.rank_info.peak_rating,
+          last_played=struct.rank_info.last_played,
+        ),
+      )
+      for struct in self.leaderboard_rows_decoder.decode(json_str)
+    ]
@@ -0,0 +1,116 @@
+"""Functions for parsing the online bots with a pool of worker processes.
+
+Decoding the json and creating the perfs for tens of thousands of bots is the slowest part of loading the online bots. The
+lines are grouped into chunks of roughly equal size which are parsed in parallel. Each worker returns its results as plain
+tuples, which are cheap to send back to the main process, and the results are then merged in the order of the lines.
+"""
+
+import functools
+import itertools
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder
+from src.leaderboard.li.pert_type import PerfType
+
+
+# The approximate size of the chunks of lines which are parsed by each worker (characters)
+CHUNK_SIZE = 1_000_000
+
+# The name, flair, flag, created, last_seen, patron, and tos_violation of a BotProfile
+ProfileFields = tuple[str, str, str, int, int, bool, bool]
+# The name along with the rating, rd, prog, games, and prov of a LeaderboardPerf
+PerfFields = tuple[str, int, int, int, int, bool]
+# The profiles and the perfs (keyed by PerfType value) of the bots in a chunk which have played games
+ChunkResult = tuple[list[ProfileFields], dict[int, list[PerfFields]]]
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[str]:
+  """Join the lines into chunks of at least chunk_size characters, except for the last chunk.
+
+  Chunks always end on a line boundary and are yielded as soon as they are full, so parsing can overlap with receiving lines.
+  """
+  chunk_lines: list[str] = []
+  size = 0
+  for line in lines:
+    chunk_lines.append(line)
+    size += len(line) + 1
+    if size >= chunk_size:
+      yield "\n".join(chunk_lines)
+      chunk_lines = []
+      size = 0
+  if chunk_lines:
+    yield "\n".join(chunk_lines)
+
+
+@functools.cache
+def get_decoder(decoder_type: type[BotUserDecoder]) -> BotUserDecoder:
+  """Return a decoder which is reused for every chunk parsed by the current process."""
+  return decoder_type()
+
+
+def parse_chunk(decoder_type: type[BotUserDecoder], chunk: str) -> ChunkResult:
+  """Parse a chunk of lines of ndjson.
+
+  Like data_generator.add_bot_perfs, only the played perfs of each bot are included, and only the bots with any.
+  """
+  bot_user_decoder = get_decoder(decoder_type)
+  profile_fields: list[ProfileFields] = []
+  perf_fields_by_perf_type_value: dict[int, list[PerfFields]] = defaultdict(list)
+  for line in chunk.split("\n"):
+    bot_user = bot_user_decoder.decode(line)
+    played_perfs = bot_user.get_played_perfs()
+    for perf in played_perfs:
+      perf_fields = (bot_user.username, perf.rating, perf.rd, perf.prog, perf.games, perf.prov)
+      perf_fields_by_perf_type_value[perf.perf_type.value].append(perf_fields)
+    if played_perfs:
+      profile_fields.append(
+        (
+          bot_user.username,
+          bot_user.flair,
+          bot_user.flag,
+          bot_user.created_at,
+          bot_user.seen_at,
+          bot_user.patron,
+          bot_user.tos_violation,
+        )
+      )
+  return profile_fields, dict(perf_fields_by_perf_type_value)
+
+
+def merge_chunk_results(chunk_results: Iterable[ChunkResult]) -> tuple[dict[str, BotProfile], dict[PerfType, list[BotPerf]]]:
+  """Convert the results of each chunk into bot profiles and perfs, keeping the order of the lines."""
+  bot_profiles_by_name: dict[str, BotProfile] = {}
+  bot_perfs_by_perf_type: dict[PerfType, list[BotPerf]] = defaultdict(list)
+  for profile_fields, perf_fields_by_perf_type_value in chunk_results:
+    for fields in profile_fields:
+      # The bots are online and are assumed to be new, the same as BotProfile.from_bot_user
+      bot_profiles_by_name[fields[0]] = BotProfile(*fields, True, True)
+    for perf_type_value, perf_fields in perf_fields_by_perf_type_value.items():
+      bot_perfs_by_perf_type[PerfType(perf_type_value)].extend(
+        BotPerf(name, LeaderboardPerf(rating, rd, prog, games, prov)) for name, rating, rd, prog, games, prov in perf_fields
+      )
+  return bot_profiles_by_name, bot_perfs_by_perf_type
+
+
+def parse_online_bots(
+  lines: Iterable[str], decoder_type: type[BotUserDecoder], max_workers: int, chunk_size: int = CHUNK_SIZE
+) -> tuple[dict[str, BotProfile], dict[PerfType, list[BotPerf]]]:
+  """Parse the lines of ndjson with a pool of max_workers processes.
+
+  If all of the lines fit in a single chunk they are parsed in this process instead, because starting the workers would
+  take longer than parsing the lines.
+  """
+  chunks = iter_chunks(lines, chunk_size)
+  first_chunk = next(chunks, None)
+  second_chunk = next(chunks, None)
+  if first_chunk is None:
+    return merge_chunk_results([])
+  if second_chunk is None:
+    return merge_chunk_results([parse_chunk(decoder_type, first_chunk)])
+  with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    all_chunks = itertools.chain([first_chunk, second_chunk], chunks)
+    futures = [executor.submit(parse_chunk, decoder_type, chunk) for chunk in all_chunks]
+    return merge_chunk_results(future.result() for future in futures)
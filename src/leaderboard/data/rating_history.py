@@ -0,0 +1,250 @@
+"""An append-only store of the rating history of every bot, kept in compressed columnar chunks.
+
+The history of each perf type is split into chunks of CHUNK_GENERATIONS generations. Each chunk starts with a record of every
+row on the leaderboard, and after that a row is only recorded when it has changed, so the last state of every bot can be
+found without reading earlier chunks.
+
+The current chunk is saved as fixed-width records, and each generation only appends its new records to the end of the file.
+Once a generation falls in the next chunk, the current chunk is sealed: its records are sorted by bot ID, so that the records
+of a bot can be found by a binary search, then rearranged into columns, where similar values sit next to each other, and
+compressed with xz.
+
+The records refer to bots by the IDs of a BotIdRegistry, which is saved with the history. Since the history is never rewritten,
+a bot keeps its ID after it leaves the leaderboards.
+"""
+
+import bisect
+import dataclasses
+import json
+import lzma
+import operator
+import struct
+from collections.abc import Iterator
+
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.bot_id_registry import BotIdRegistry
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+# About a week of generations, when the leaderboards are generated every two hours
+CHUNK_GENERATIONS = 84
+# Generation, time, bot id, rating, rd, games, rank, online
+RECORD_FORMAT = "IqIiiii?"
+RECORD_STRUCT = struct.Struct(f"<{RECORD_FORMAT}")
+# Only the bot id of a record, which skips the generation and time before it and the values after it
+BOT_ID_STRUCT = struct.Struct(f"<{struct.calcsize('<Iq')}xI{RECORD_STRUCT.size - struct.calcsize('<IqI')}x")
+# The index of the bot id column of a sealed chunk
+BOT_ID_COLUMN = 2
+SEALED_CHUNK_MAGIC = b"LBHC"
+# Magic number, record count
+SEALED_CHUNK_HEADER_STRUCT = struct.Struct("<4sI")
+
+# The values of a record, in the order of RECORD_FORMAT
+RecordValues = tuple[int, int, int, int, int, int, int, bool]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HistoryRecord:
+  """The state of a bot's row on a leaderboard as of a generation."""
+
+  generation: int
+  time: int
+  bot_id: int
+  perf_type: PerfType
+  rating: int
+  rd: int
+  games: int
+  rank: int
+  online: bool
+
+
+def encode_sealed_chunk(records: list[RecordValues]) -> bytes:
+  """Return the records sorted by bot ID and then generation, rearranged into columns and compressed."""
+  records = sorted(records, key=operator.itemgetter(BOT_ID_COLUMN, 0))
+  columns = [
+    struct.pack(f"<{len(records)}{column_format}", *column_values)
+    for column_format, column_values in zip(RECORD_FORMAT, zip(*records, strict=True), strict=True)
+  ]
+  return lzma.compress(SEALED_CHUNK_HEADER_STRUCT.pack(SEALED_CHUNK_MAGIC, len(records)) + b"".join(columns))
+
+
+def decompress_sealed_chunk(chunk_bytes: bytes) -> tuple[bytes, int]:
+  """Return the columns of a sealed chunk, after its header, and the number of records."""
+  chunk_bytes = lzma.decompress(chunk_bytes)
+  magic, record_count = SEALED_CHUNK_HEADER_STRUCT.unpack_from(chunk_bytes)
+  if magic != SEALED_CHUNK_MAGIC:
+    msg = "Not a sealed rating history chunk"
+    raise ValueError(msg)
+  return chunk_bytes[SEALED_CHUNK_HEADER_STRUCT.size :], record_count
+
+
+def unpack_columns(columns_bytes: bytes, record_count: int, start: int, end: int) -> list[RecordValues]:
+  """Return the records from index start up to but not including end of the columns of a sealed chunk."""
+  offset = 0
+  columns: list[tuple[int, ...]] = []
+  for column_format in RECORD_FORMAT:
+    value_size = struct.calcsize(f"<{column_format}")
+    columns.append(struct.unpack_from(f"<{end - start}{column_format}", columns_bytes, offset + value_size * start))
+    offset += value_size * record_count
+  return list(zip(*columns, strict=True))
+
+
+def decode_sealed_chunk(chunk_bytes: bytes) -> list[RecordValues]:
+  """Return the records of a sealed chunk, sorted by bot ID and then generation."""
+  columns_bytes, record_count = decompress_sealed_chunk(chunk_bytes)
+  return unpack_columns(columns_bytes, record_count, 0, record_count)
+
+
+def decode_sealed_chunk_bot(chunk_bytes: bytes, bot_id: int) -> list[RecordValues]:
+  """Return the records of a bot in a sealed chunk, oldest first, which are found by a binary search of the bot ID column."""
+  columns_bytes, record_count = decompress_sealed_chunk(chunk_bytes)
+  bot_id_offset = sum(struct.calcsize(f"<{column_format}") for column_format in RECORD_FORMAT[:BOT_ID_COLUMN]) * record_count
+  bot_ids = struct.unpack_from(f"<{record_count}{RECORD_FORMAT[BOT_ID_COLUMN]}", columns_bytes, bot_id_offset)
+  start = bisect.bisect_left(bot_ids, bot_id)
+  end = bisect.bisect_right(bot_ids, bot_id, start)
+  return unpack_columns(columns_bytes, record_count, start, end)
+
+
+def trim_open_chunk(chunk_bytes: bytes) -> bytes:
+  """Return the bytes of the whole records of an open chunk, without a record which was cut off by an interrupted append."""
+  return chunk_bytes[: len(chunk_bytes) - len(chunk_bytes) % RECORD_STRUCT.size]
+
+
+def decode_open_chunk(chunk_bytes: bytes, bot_id: int | None = None) -> list[RecordValues]:
+  """Return the records of the chunk which is still being appended to, or only the bot's records if a bot_id is given."""
+  if bot_id is None:
+    return list(RECORD_STRUCT.iter_unpack(chunk_bytes))
+  # Only the bot ids are unpacked to find the bot's records
+  return [
+    RECORD_STRUCT.unpack_from(chunk_bytes, index * RECORD_STRUCT.size)
+    for index, (record_bot_id,) in enumerate(BOT_ID_STRUCT.iter_unpack(chunk_bytes))
+    if record_bot_id == bot_id
+  ]
+
+
+class RatingHistory:
+  """The rating history of every bot on every leaderboard, saved under leaderboard_data/history/."""
+
+  def __init__(self, file_system: FileSystem) -> None:
+    """Initialize a history which is read from and appended to the file system."""
+    self.file_system = file_system
+    ids_str = file_system.read_file(file_paths.bot_ids_path())
+    self.bot_id_registry = BotIdRegistry(json.loads(ids_str) if ids_str else [])
+
+  def load_open_chunk(self, perf_type: PerfType) -> bytes:
+    """Return the bytes of the whole records of the perf type's chunk which is still being appended to."""
+    return trim_open_chunk(self.file_system.read_binary_file(file_paths.open_history_chunk_path(perf_type)) or b"")
+
+  def load_sealed_chunk(self, perf_type: PerfType, chunk_index: int, bot_id: int | None = None) -> list[RecordValues]:
+    """Return the records of one of the perf type's sealed chunks, or only the bot's records if a bot_id is given.
+
+    The records are oldest first, and are empty if the chunk was never saved.
+    """
+    chunk_bytes = self.file_system.read_binary_file(file_paths.sealed_history_chunk_path(perf_type, chunk_index))
+    if not chunk_bytes:
+      return []
+    if bot_id is not None:
+      return decode_sealed_chunk_bot(chunk_bytes, bot_id)
+    # The sort is stable, so the records of each generation stay in bot ID order
+    return sorted(decode_sealed_chunk(chunk_bytes), key=operator.itemgetter(0))
+
+  def register_bots(self, rows_by_perf_type: dict[PerfType, list[LeaderboardRow]]) -> None:
+    """Give the bots of the rows which have not been recorded before an ID and save the IDs if any were added.
+
+    The new bots are registered in name order, so that their IDs do not depend on the order of the rows.
+    """
+    ids_by_name = self.bot_id_registry.ids_by_name
+    new_names = {row.name for rows in rows_by_perf_type.values() for row in rows if row.name not in ids_by_name}
+    if not new_names:
+      return
+    for name in sorted(new_names, key=data_generator.name_sort_key):
+      self.bot_id_registry.get_id(name)
+    self.file_system.write_file(file_paths.bot_ids_path(), json.dumps(self.bot_id_registry.names, indent=2))
+
+  def append(
+    self,
+    generation: int,
+    current_time: int,
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]],
+    bot_profiles_by_name: dict[str, BotProfile],
+  ) -> int:
+    """Append the rows of a generation which have changed since they were last recorded and return the number appended."""
+    self.register_bots(rows_by_perf_type)
+    chunk_index = generation // CHUNK_GENERATIONS
+    appended_count = 0
+    for perf_type, rows in rows_by_perf_type.items():
+      open_chunk_path = file_paths.open_history_chunk_path(perf_type)
+      stored_chunk_bytes = self.file_system.read_binary_file(open_chunk_path) or b""
+      open_chunk_bytes = trim_open_chunk(stored_chunk_bytes)
+      open_records = decode_open_chunk(open_chunk_bytes)
+      is_sealed = bool(open_records) and open_records[0][0] // CHUNK_GENERATIONS != chunk_index
+      if is_sealed:
+        # Seal the chunk and start the next one with a record of every row
+        sealed_chunk_path = file_paths.sealed_history_chunk_path(perf_type, open_records[0][0] // CHUNK_GENERATIONS)
+        self.file_system.write_binary_file(sealed_chunk_path, encode_sealed_chunk(open_records))
+        open_records = []
+      # The last record of each bot has its latest state
+      last_state_by_bot_id = {record[2]: record[3:] for record in open_records}
+      new_records: list[bytes] = []
+      for row in rows:
+        bot_id = self.bot_id_registry.get_id(row.name)
+        bot_profile = bot_profiles_by_name.get(row.name)
+        state = (
+          row.perf.rating,
+          row.perf.rd,
+          row.perf.games,
+          row.rank_info.rank,
+          bot_profile is not None and bot_profile.online,
+        )
+        if last_state_by_bot_id.get(bot_id) != state:
+          new_records.append(RECORD_STRUCT.pack(generation, current_time, bot_id, *state))
+      if is_sealed and new_records:
+        self.file_system.write_binary_file(open_chunk_path, b"".join(new_records))
+      elif len(open_chunk_bytes) != len(stored_chunk_bytes):
+        # Drop the record which was cut off rather than appending after it
+        self.file_system.write_binary_file(open_chunk_path, open_chunk_bytes + b"".join(new_records))
+      elif new_records:
+        self.file_system.append_binary_file(open_chunk_path, b"".join(new_records))
+      appended_count += len(new_records)
+    return appended_count
+
+  def iter_records(
+    self, perf_type: PerfType, start_generation: int = 0, end_generation: int | None = None, bot_id: int | None = None
+  ) -> Iterator[RecordValues]:
+    """Yield the perf type's records from start_generation up to but not including end_generation, oldest first.
+
+    If a bot_id is given, only the bot's records are yielded, which are found without decoding the other records.
+    """
+    open_chunk_bytes = self.load_open_chunk(perf_type)
+    if not open_chunk_bytes:
+      return
+    open_chunk_index = RECORD_STRUCT.unpack_from(open_chunk_bytes)[0] // CHUNK_GENERATIONS
+    last_chunk_index = (
+      open_chunk_index if end_generation is None else min(open_chunk_index, end_generation // CHUNK_GENERATIONS)
+    )
+    for chunk_index in range(start_generation // CHUNK_GENERATIONS, last_chunk_index + 1):
+      if chunk_index == open_chunk_index:
+        records = decode_open_chunk(open_chunk_bytes, bot_id)
+      else:
+        records = self.load_sealed_chunk(perf_type, chunk_index, bot_id)
+      for record in records:
+        if record[0] >= start_generation and (end_generation is None or record[0] < end_generation):
+          yield record
+
+  def scan_perf_type(
+    self, perf_type: PerfType, start_generation: int = 0, end_generation: int | None = None
+  ) -> list[HistoryRecord]:
+    """Return the records of every bot on the perf type's leaderboard in a range of generations, oldest first."""
+    records = self.iter_records(perf_type, start_generation, end_generation)
+    return [HistoryRecord(record[0], record[1], record[2], perf_type, *record[3:]) for record in records]
+
+  def scan_bot(self, bot_id: int, start_generation: int = 0, end_generation: int | None = None) -> list[HistoryRecord]:
+    """Return the bot's records on every leaderboard in a range of generations, grouped by perf type and oldest first."""
+    return [
+      HistoryRecord(record[0], record[1], record[2], perf_type, *record[3:])
+      for perf_type in PerfType.all_except_unknown()
+      for record in self.iter_records(perf_type, start_generation, end_generation, bot_id)
+    ]
@@ -0,0 +1,247 @@
+"""A store for the leaderboard data which is backed by a SQLite database.
+
+The database holds the bot profiles, the current rows of each perf type, and the history of every row. Saving only writes the
+profiles and rows which have changed, and each change to a row is also recorded in the history under the generation which
+made it. Rows can be queried by rank or by bot without loading the rest of the data.
+"""
+
+import sqlite3
+from collections.abc import Iterable
+from typing import Any
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+
+
+CREATE_TABLES_SCRIPT = """
+CREATE TABLE IF NOT EXISTS generations (
+  generation INTEGER PRIMARY KEY,
+  time INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bot_profiles (
+  name TEXT PRIMARY KEY,
+  flair TEXT NOT NULL,
+  flag TEXT NOT NULL,
+  created INTEGER NOT NULL,
+  last_seen INTEGER NOT NULL,
+  patron INTEGER NOT NULL,
+  tos_violation INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leaderboard_rows (
+  perf_type TEXT NOT NULL,
+  name TEXT NOT NULL,
+  rating INTEGER NOT NULL,
+  rd INTEGER NOT NULL,
+  prog INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  prov INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  delta_rank INTEGER NOT NULL,
+  delta_rating INTEGER NOT NULL,
+  delta_games INTEGER NOT NULL,
+  peak_rank INTEGER NOT NULL,
+  peak_rating INTEGER NOT NULL,
+  last_played INTEGER NOT NULL,
+  PRIMARY KEY (perf_type, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS leaderboard_rows_by_rank ON leaderboard_rows (perf_type, rank);
+CREATE INDEX IF NOT EXISTS leaderboard_rows_by_name ON leaderboard_rows (name);
+CREATE TABLE IF NOT EXISTS row_history (
+  perf_type TEXT NOT NULL,
+  name TEXT NOT NULL,
+  generation INTEGER NOT NULL,
+  rating INTEGER NOT NULL,
+  rd INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  rank INTEGER NOT NULL,
+  PRIMARY KEY (perf_type, name, generation)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS record_inserted_row AFTER INSERT ON leaderboard_rows BEGIN
+  INSERT INTO row_history
+  VALUES (NEW.perf_type, NEW.name, (SELECT MAX(generation) FROM generations), NEW.rating, NEW.rd, NEW.games, NEW.rank);
+END;
+CREATE TRIGGER IF NOT EXISTS record_updated_row AFTER UPDATE ON leaderboard_rows BEGIN
+  INSERT INTO row_history
+  VALUES (NEW.perf_type, NEW.name, (SELECT MAX(generation) FROM generations), NEW.rating, NEW.rd, NEW.games, NEW.rank);
+END;
+"""
+
+# Profiles and rows are only updated if one of their values has changed, so unchanged rows are not written or recorded
+UPSERT_BOT_PROFILE = """
+INSERT INTO bot_profiles VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+  flair = excluded.flair,
+  flag = excluded.flag,
+  created = excluded.created,
+  last_seen = excluded.last_seen,
+  patron = excluded.patron,
+  tos_violation = excluded.tos_violation
+WHERE (flair, flag, created, last_seen, patron, tos_violation)
+  IS NOT (excluded.flair, excluded.flag, excluded.created, excluded.last_seen, excluded.patron, excluded.tos_violation)
+"""
+UPSERT_LEADERBOARD_ROW = """
+INSERT INTO leaderboard_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (perf_type, name) DO UPDATE SET
+  rating = excluded.rating,
+  rd = excluded.rd,
+  prog = excluded.prog,
+  games = excluded.games,
+  prov = excluded.prov,
+  rank = excluded.rank,
+  delta_rank = excluded.delta_rank,
+  delta_rating = excluded.delta_rating,
+  delta_games = excluded.delta_games,
+  peak_rank = excluded.peak_rank,
+  peak_rating = excluded.peak_rating,
+  last_played = excluded.last_played
+WHERE (rating, rd, prog, games, prov, rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played)
+  IS NOT (
+    excluded.rating,
+    excluded.rd,
+    excluded.prog,
+    excluded.games,
+    excluded.prov,
+    excluded.rank,
+    excluded.delta_rank,
+    excluded.delta_rating,
+    excluded.delta_games,
+    excluded.peak_rank,
+    excluded.peak_rating,
+    excluded.last_played
+  )
+"""
+SELECT_LEADERBOARD_ROWS = """
+SELECT name, rating, rd, prog, games, prov, rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played
+FROM leaderboard_rows
+WHERE perf_type = ?
+"""
+SELECT_TOP_LEADERBOARD_ROWS = """
+SELECT name, rating, rd, prog, games, prov, rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played
+FROM leaderboard_rows
+WHERE perf_type = ? AND rank > 0
+ORDER BY rank
+LIMIT ?
+"""
+SELECT_BOT_LEADERBOARD_ROWS = """
+SELECT perf_type,
+  name, rating, rd, prog, games, prov, rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, last_played
+FROM leaderboard_rows
+WHERE name = ?
+"""
+SELECT_ROW_HISTORY = """
+SELECT generation, time, rating, rd, games, rank
+FROM row_history JOIN generations USING (generation)
+WHERE perf_type = ? AND name = ?
+ORDER BY generation
+"""
+
+
+def create_leaderboard_row(values: tuple[Any, ...]) -> LeaderboardRow:
+  """Create a LeaderboardRow from the values of a row selected with SELECT_LEADERBOARD_ROWS."""
+  name, rating, rd, prog, games, prov, *rank_info = values
+  return LeaderboardRow(name, LeaderboardPerf(rating, rd, prog, games, bool(prov)), RankInfo(*rank_info))
+
+
+class SqliteStore:
+  """The leaderboard data held in a SQLite database.
+
+  The store takes a connection, which the caller is responsible for closing.
+  """
+
+  def __init__(self, connection: sqlite3.Connection) -> None:
+    """Initialize a store, creating its tables if they do not exist yet."""
+    self.connection = connection
+    self.connection.executescript(CREATE_TABLES_SCRIPT)
+
+  def get_generation_count(self) -> int:
+    """Return the number of times that the leaderboard data has been saved."""
+    return self.connection.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+  def load_bot_profiles(self) -> dict[str, BotProfile]:
+    """Load the bot profiles.
+
+    Like BotProfile.from_dict, the bots will be assumed not to be new and to be offline.
+    """
+    cursor = self.connection.execute("SELECT * FROM bot_profiles")
+    bot_profiles = [
+      BotProfile(name, flair, flag, created, last_seen, bool(patron), bool(tos_violation), False, False)
+      for name, flair, flag, created, last_seen, patron, tos_violation in cursor
+    ]
+    return {bot_profile.name: bot_profile for bot_profile in bot_profiles}
+
+  def load_leaderboard_rows(self) -> dict[PerfType, list[LeaderboardRow]]:
+    """Load the rows of every leaderboard grouped by perf type."""
+    rows_by_perf_type: dict[PerfType, list[LeaderboardRow]] = {}
+    for perf_type in PerfType.all_except_unknown():
+      cursor = self.connection.execute(SELECT_LEADERBOARD_ROWS, (perf_type.to_string(),))
+      rows_by_perf_type[perf_type] = [
+        LeaderboardRow(name, LeaderboardPerf(rating, rd, prog, games, bool(prov)), RankInfo(*rank_info))
+        for name, rating, rd, prog, games, prov, *rank_info in cursor
+      ]
+    return rows_by_perf_type
+
+  def save(
+    self, bot_profiles: Iterable[BotProfile], rows_by_perf_type: dict[PerfType, list[LeaderboardRow]], current_time: int
+  ) -> int:
+    """Save the profiles and rows in a single transaction as a new generation and return the number of rows changed.
+
+    Rows are never removed from a leaderboard, so rows which are not saved are left as they were.
+    """
+    with self.connection:
+      self.connection.execute("INSERT INTO generations (time) VALUES (?)", (current_time,))
+      self.connection.executemany(
+        UPSERT_BOT_PROFILE,
+        (
+          (
+            profile.name,
+            profile.flair,
+            profile.flag,
+            profile.created,
+            profile.last_seen,
+            profile.patron,
+            profile.tos_violation,
+          )
+          for profile in bot_profiles
+        ),
+      )
+      changed_row_count = 0
+      for perf_type, rows in rows_by_perf_type.items():
+        perf_type_string = perf_type.to_string()
+        cursor = self.connection.executemany(
+          UPSERT_LEADERBOARD_ROW,
+          (
+            (
+              perf_type_string,
+              row.name,
+              row.perf.rating,
+              row.perf.rd,
+              row.perf.prog,
+              row.perf.games,
+              row.perf.prov,
+              row.rank_info.rank,
+              row.rank_info.delta_rank,
+              row.rank_info.delta_rating,
+              row.rank_info.delta_games,
+              row.rank_info.peak_rank,
+              row.rank_info.peak_rating,
+              row.rank_info.last_played,
+            )
+            for row in rows
+          ),
+        )
+        changed_row_count += cursor.rowcount
+    return changed_row_count
+
+  def get_top_rows(self, perf_type: PerfType, count: int) -> list[LeaderboardRow]:
+    """Return the rows of the count highest ranked bots on the leaderboard."""
+    cursor = self.connection.execute(SELECT_TOP_LEADERBOARD_ROWS, (perf_type.to_string(), count))
+    return list(map(create_leaderboard_row, cursor))
+
+  def get_bot_rows(self, name: str) -> dict[PerfType, LeaderboardRow]:
+    """Return the bot's row on each leaderboard that it is on."""
+    cursor = self.connection.execute(SELECT_BOT_LEADERBOARD_ROWS, (name,))
+    return {PerfType.from_json(values[0]): create_leaderboard_row(values[1:]) for values in cursor}
+
+  def get_row_history(self, perf_type: PerfType, name: str) -> list[tuple[int, int, int, int, int, int]]:
+    """Return the (generation, time, rating, rd, games, rank) of each change to the bot's row, oldest first."""
+    return self.connection.execute(SELECT_ROW_HISTORY, (perf_type.to_string(), name)).fetchall()
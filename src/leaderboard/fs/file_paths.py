@@ -4,6 +4,19 @@ from src.leaderboard.li.pert_type import PerfType
 
 
 LEADERBOARD_DATA_DIR = "leaderboard_data"
+LICHESS_CACHE_DIR = ".cache/lichess"
+LICHESS_SNAPSHOTS_DIR = "lichess_snapshots"
+TEMPLATE_CACHE_DIR = ".cache/templates"
+
+
+def binary_snapshot_path() -> str:
+  """Return "leaderboard_data/snapshot.bin"."""
+  return f"{LEADERBOARD_DATA_DIR}/snapshot.bin"
+
+
+def bot_ids_path() -> str:
+  """Return "leaderboard_data/history/bot_ids.json"."""
+  return f"{LEADERBOARD_DATA_DIR}/history/bot_ids.json"
 
 
 def bot_profiles_path() -> str:
@@ -21,6 +34,51 @@ def generation_number_path() -> str:
   return f"{LEADERBOARD_DATA_DIR}/generation_number.txt"
 
 
+def html_fingerprints_path() -> str:
+  """Return "leaderboard_data/html_fingerprints.json"."""
+  return f"{LEADERBOARD_DATA_DIR}/html_fingerprints.json"
+
+
 def html_path(name: str) -> str:
   """Return "leaderboard_html/{name}.html"."""
   return f"leaderboard_html/{name}.html"
+
+
+def lichess_cache_path(name: str) -> str:
+  """Return ".cache/lichess/{name}"."""
+  return f"{LICHESS_CACHE_DIR}/{name}"
+
+
+def lichess_snapshot_path(capture_time: int, name: str) -> str:
+  """Return "lichess_snapshots/{capture_time}/{name}"."""
+  return f"{LICHESS_SNAPSHOTS_DIR}/{capture_time}/{name}"
+
+
+def open_history_chunk_path(perf_type: PerfType) -> str:
+  """Return "leaderboard_data/history/{perf_type.to_string()}/open.bin"."""
+  return f"{LEADERBOARD_DATA_DIR}/history/{perf_type.to_string()}/open.bin"
+
+
+def replay_dir(capture_time: int) -> str:
+  """Return "lichess_snapshots/{capture_time}/replay"."""
+  return f"{LICHESS_SNAPSHOTS_DIR}/{capture_time}/replay"
+
+
+def sealed_history_chunk_path(perf_type: PerfType, chunk_index: int) -> str:
+  """Return "leaderboard_data/history/{perf_type.to_string()}/{chunk_index:05d}.bin.xz"."""
+  return f"{LEADERBOARD_DATA_DIR}/history/{perf_type.to_string()}/{chunk_index:05d}.bin.xz"
+
+
+def sqlite_store_path() -> str:
+  """Return "leaderboard_data/leaderboard.sqlite3"."""
+  return f"{LEADERBOARD_DATA_DIR}/leaderboard.sqlite3"
+
+
+def stylesheet_path() -> str:
+  """Return "leaderboard_html/css/style.css"."""
+  return "leaderboard_html/css/style.css"
+
+
+def template_cache_path(key: str) -> str:
+  """Return ".cache/templates/{key}.cache"."""
+  return f"{TEMPLATE_CACHE_DIR}/{key}.cache"
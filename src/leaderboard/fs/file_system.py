@@ -1,6 +1,31 @@
 """A representation of a file system."""
 
 import abc
+import contextlib
+import dataclasses
+import sqlite3
+from collections.abc import Iterator
+from typing import BinaryIO, TextIO
+
+
+@dataclasses.dataclass
+class WriteCounts:
+  """The files and bytes which were written, or skipped because the file already had the same contents."""
+
+  files_written: int = 0
+  bytes_written: int = 0
+  files_skipped: int = 0
+  bytes_skipped: int = 0
+
+  def count_write(self, byte_count: int) -> None:
+    """Count a file which was written."""
+    self.files_written += 1
+    self.bytes_written += byte_count
+
+  def count_skip(self, byte_count: int) -> None:
+    """Count a file which was not written because it already had the same contents."""
+    self.files_skipped += 1
+    self.bytes_skipped += byte_count
 
 
 class FileSystem(abc.ABC):
@@ -15,3 +40,74 @@ class FileSystem(abc.ABC):
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
     ...
+
+  @abc.abstractmethod
+  def read_files(self, file_names: list[str]) -> dict[str, str | None]:
+    """Load and return all of the contents of several files, keyed by file name."""
+    ...
+
+  @abc.abstractmethod
+  def write_files(self, file_contents_by_name: dict[str, str]) -> None:
+    """Save the contents of several files, keyed by file name."""
+    ...
+
+  @abc.abstractmethod
+  def open_file_writer(self, file_name: str) -> contextlib.AbstractContextManager[TextIO]:
+    """Return a context manager which opens a buffered writer for a file, and saves what was written when it exits.
+
+    The contents can be written in pieces as they are produced, so they are never all held in memory. If the context exits
+    with an exception, the file is left as it was.
+    """
+    ...
+
+  @abc.abstractmethod
+  def iter_file_lines(self, file_name: str) -> Iterator[str]:
+    """Yield the lines of a file without their line endings, reading them one at a time, or nothing if it does not exist."""
+    ...
+
+  @abc.abstractmethod
+  def read_binary_file(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    ...
+
+  @abc.abstractmethod
+  def write_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    ...
+
+  @abc.abstractmethod
+  def open_binary_file_writer(self, file_name: str) -> contextlib.AbstractContextManager[BinaryIO]:
+    """Return a context manager which opens a buffered writer for a binary file, like open_file_writer."""
+    ...
+
+  @abc.abstractmethod
+  def append_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Add the contents to the end of a binary file, which is created if it does not exist."""
+    ...
+
+  @abc.abstractmethod
+  def map_binary_file(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of the contents of a binary file, which is mapped into memory rather than read if possible."""
+    ...
+
+  @abc.abstractmethod
+  def connect_database(self, file_name: str) -> sqlite3.Connection:
+    """Return a new connection to a SQLite database, which is created if it does not exist."""
+    ...
+
+  @abc.abstractmethod
+  def copy_directory(self, source_dir: str, destination_dir: str) -> None:
+    """Replace the directory at destination_dir with a copy of the directory at source_dir and everything in it.
+
+    If there is no directory at source_dir, the directory at destination_dir is left empty.
+    """
+    ...
+
+  @abc.abstractmethod
+  def get_write_counts(self) -> WriteCounts:
+    """Return the files and bytes which have been written or skipped.
+
+    The counts include the files written by write_file, open_file_writer, write_binary_file, open_binary_file_writer, and
+    append_binary_file.
+    """
+    ...
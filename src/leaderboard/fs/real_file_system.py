@@ -1,16 +1,136 @@
 """An implementation of FileSystem which actually writes to and from disk."""
 
+import contextlib
+import filecmp
+import functools
+import io
+import mmap
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO, TextIO
 
-from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.file_system import FileSystem, WriteCounts
+
+
+# Reading and writing files mostly waits on the disk, so more threads than cores are useful
+IO_WORKERS = 8
+# Reading the umask sets it for the whole process, so the threads which write new files take turns to read it
+UMASK_LOCK = threading.Lock()
+# The size of the buffer of a file writer, so that the many small pieces of a rendered page are written in large chunks
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def get_umask() -> int:
+  """Return the process's umask, which can only be read by setting it."""
+  umask = os.umask(0)
+  os.umask(umask)
+  return umask
+
+
+@functools.cache
+def get_new_file_mode() -> int:
+  """Return the permissions of a file created by open, reading the umask the first time they are needed."""
+  return 0o666 & ~get_umask()
+
+
+def get_file_mode(path: Path) -> int:
+  """Return the permissions of the file at path, or those of a file created by open if there is no file at path."""
+  try:
+    return stat.S_IMODE(path.stat().st_mode)
+  except FileNotFoundError:
+    with UMASK_LOCK:
+      return get_new_file_mode()
+
+
+def has_contents(path: Path, file_contents: bytes) -> bool:
+  """Return whether the file at path exists and already has the contents.
+
+  The sizes are compared first, so a file which has changed size is not read.
+  """
+  try:
+    if path.stat().st_size != len(file_contents):
+      return False
+    return path.read_bytes() == file_contents
+  except FileNotFoundError:
+    return False
+
+
+def write_if_changed(path: Path, file_contents: bytes) -> bool:
+  """Replace the file at path with the contents unless it already has them, and return whether it was written."""
+  if has_contents(path, file_contents):
+    return False
+  replace_file(path, file_contents)
+  return True
+
+
+def has_same_contents(path: Path, other_path: Path) -> bool:
+  """Return whether the files at both paths exist and have the same contents, which are only read if the sizes match."""
+  try:
+    return filecmp.cmp(path, other_path, shallow=False)
+  except FileNotFoundError:
+    return False
+
+
+def create_temp_file(path: Path) -> tuple[int, Path]:
+  """Create a temporary file in the directory of the file at path, and return its file descriptor and path."""
+  path.parent.mkdir(parents=True, exist_ok=True)
+  file_descriptor, temp_file_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+  return file_descriptor, Path(temp_file_name)
+
+
+def publish_temp_file(temp_path: Path, path: Path) -> None:
+  """Rename a temporary file, which has been flushed to disk, over the file at path."""
+  # mkstemp creates the file readable only by its owner, so give it the permissions of the file it replaces
+  temp_path.chmod(get_file_mode(path))
+  temp_path.replace(path)
+
+
+def replace_file(path: Path, file_contents: bytes) -> None:
+  """Atomically replace the file at path with the contents.
+
+  The contents are written to a temporary file in the same directory, which is flushed to disk and then renamed over the
+  file. If the process dies part way through, the file has either its old or its new contents, never a mix of the two.
+  """
+  file_descriptor, temp_path = create_temp_file(path)
+  try:
+    with os.fdopen(file_descriptor, "wb") as file:
+      file.write(file_contents)
+      file.flush()
+      os.fsync(file.fileno())
+    publish_temp_file(temp_path, path)
+  except BaseException:
+    temp_path.unlink(missing_ok=True)
+    raise
 
 
 class RealFileSystem(FileSystem):
-  """Read and write files from disk."""
+  """Read and write files from disk.
+
+  Files are only written if their contents have changed, and are replaced atomically when they are.
+  """
+
+  def __init__(self, root_dir: str = ".") -> None:
+    """Initialize the counts of the files which have been written or skipped.
+
+    The file names are relative to root_dir, which is the working directory by default.
+    """
+    self.root_dir = Path(root_dir)
+    self.write_counts = WriteCounts()
+
+  def get_path(self, file_name: str) -> Path:
+    """Return the path of a file, which is relative to the root directory."""
+    return self.root_dir / file_name
 
   def read_file(self, file_name: str) -> str | None:
     """Load and return all of the contents of a file."""
-    path = Path(file_name)
+    path = self.get_path(file_name)
     if not path.exists():
       return None
     with path.open() as file:
@@ -18,7 +138,138 @@ class RealFileSystem(FileSystem):
 
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
-    path = Path(file_name)
+    self.write_binary_file(file_name, file_contents.encode("utf-8"))
+
+  @contextlib.contextmanager
+  def open_file_writer(self, file_name: str) -> Iterator[TextIO]:
+    """Open a buffered writer for a file, and save what was written when the context exits, like open_binary_file_writer."""
+    with self.open_binary_file_writer(file_name) as binary_file:
+      # The newlines are written as they are, like write_file
+      file = io.TextIOWrapper(binary_file, encoding="utf-8", newline="")
+      yield file
+      # Detaching flushes the text to the binary file, which is left open to be saved
+      file.detach()
+
+  def iter_file_lines(self, file_name: str) -> Iterator[str]:
+    """Yield the lines of a file without their line endings, reading them one at a time, or nothing if it does not exist."""
+    path = self.get_path(file_name)
+    if not path.exists():
+      return
+    with path.open(encoding="utf-8") as file:
+      for line in file:
+        yield line.removesuffix("\n")
+
+  def read_binary_file(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    path = self.get_path(file_name)
+    if not path.exists():
+      return None
+    return path.read_bytes()
+
+  def write_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    self.count_write(write_if_changed(self.get_path(file_name), file_contents), len(file_contents))
+
+  @contextlib.contextmanager
+  def open_binary_file_writer(self, file_name: str) -> Iterator[BinaryIO]:
+    """Open a buffered writer for a binary file, and save what was written when the context exits.
+
+    The contents are written to a temporary file in the same directory as they are produced. When the context exits, the
+    temporary file is compared with the file, and is either flushed to disk and renamed over it, or removed if the file
+    already had the same contents.
+    """
+    path = self.get_path(file_name)
+    file_descriptor, temp_path = create_temp_file(path)
+    try:
+      with os.fdopen(file_descriptor, "wb", buffering=WRITE_BUFFER_SIZE) as file:
+        yield file
+        file.flush()
+        was_written = not has_same_contents(temp_path, path)
+        if was_written:
+          os.fsync(file.fileno())
+      byte_count = temp_path.stat().st_size
+      if was_written:
+        publish_temp_file(temp_path, path)
+      else:
+        temp_path.unlink()
+    except BaseException:
+      temp_path.unlink(missing_ok=True)
+      raise
+    self.count_write(was_written, byte_count)
+
+  def append_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Add the contents to the end of a binary file, which is created if it does not exist.
+
+    Only the new contents are written, so unlike the other writes the file is not replaced atomically. If the process dies part
+    way through, the file may end with part of the contents.
+    """
+    path = self.get_path(file_name)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as file:
+    with path.open("ab") as file:
       file.write(file_contents)
+      file.flush()
+      os.fsync(file.fileno())
+    self.count_write(bool(file_contents), len(file_contents))
+
+  def read_files(self, file_names: list[str]) -> dict[str, str | None]:
+    """Load and return all of the contents of several files, keyed by file name.
+
+    The files are read on a thread pool, so the time spent waiting on each file overlaps.
+    """
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+      return dict(zip(file_names, executor.map(self.read_file, file_names), strict=True))
+
+  def write_files(self, file_contents_by_name: dict[str, str]) -> None:
+    """Save the contents of several files, keyed by file name.
+
+    The files are written on a thread pool, so the time spent waiting on each file overlaps. The writes are counted afterwards
+    so that the counts are only updated by one thread.
+    """
+    paths = [self.get_path(file_name) for file_name in file_contents_by_name]
+    encoded_contents = [file_contents.encode("utf-8") for file_contents in file_contents_by_name.values()]
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+      written = list(executor.map(write_if_changed, paths, encoded_contents))
+    for was_written, file_contents in zip(written, encoded_contents, strict=True):
+      self.count_write(was_written, len(file_contents))
+
+  def map_binary_file(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of the contents of a binary file, which is mapped into memory rather than read if possible."""
+    path = self.get_path(file_name)
+    if not path.exists():
+      return None
+    with path.open("rb") as file:
+      # Empty files cannot be mapped
+      if not path.stat().st_size:
+        return memoryview(b"")
+      # The mapping stays open after the file is closed, until the view is released
+      return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+  def connect_database(self, file_name: str) -> sqlite3.Connection:
+    """Return a new connection to a SQLite database, which is created if it does not exist."""
+    path = self.get_path(file_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return sqlite3.connect(path)
+
+  def copy_directory(self, source_dir: str, destination_dir: str) -> None:
+    """Replace the directory at destination_dir with a copy of the directory at source_dir and everything in it.
+
+    If there is no directory at source_dir, the directory at destination_dir is left empty.
+    """
+    destination_path = self.get_path(destination_dir)
+    shutil.rmtree(destination_path, ignore_errors=True)
+    source_path = self.get_path(source_dir)
+    if source_path.exists():
+      shutil.copytree(source_path, destination_path)
+    else:
+      destination_path.mkdir(parents=True)
+
+  def count_write(self, was_written: bool, byte_count: int) -> None:
+    """Count a write, or a skipped write if the file already had the same contents."""
+    if was_written:
+      self.write_counts.count_write(byte_count)
+    else:
+      self.write_counts.count_skip(byte_count)
+
+  def get_write_counts(self) -> WriteCounts:
+    """Return the files and bytes which have been written or skipped by write_file, open_file_writer, and write_binary_file."""
+    return self.write_counts
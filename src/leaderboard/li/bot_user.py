@@ -10,7 +10,7 @@ from typing import Any
 from src.leaderboard.li.pert_type import PerfType
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Perf:
   """Performance refers to a players ratings for a particular time control or variant.
 
@@ -45,7 +45,7 @@ class Perf:
     return Perf(perf_type, games, rating, rd, prog, prov)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class BotUser:
   """A bot user and their list of performances.
 
@@ -72,8 +72,11 @@ class BotUser:
   @classmethod
   def from_json(cls, json_str: str) -> "BotUser":
     """Parse a line of ndjson and converts it to an BotUser."""
-    json_dict = json.loads(json_str)
+    return BotUser.from_json_dict(json.loads(json_str))
 
+  @classmethod
+  def from_json_dict(cls, json_dict: dict[str, Any]) -> "BotUser":
+    """Convert a lichess json user dict to a BotUser."""
     username = json_dict.get("username", "")
     flair = json_dict.get("flair", "")
     profile_dict = json_dict.get("profile", {})
@@ -84,7 +87,11 @@ class BotUser:
     tos_violation = json_dict.get("tosViolation", False)
 
     perfs: list[Perf] = []
-    for perf_type_key, perf_json in json_dict.get("perfs", []).items():
+    for perf_type_key, perf_json in json_dict.get("perfs", {}).items():
       perfs.append(Perf.from_json_dict(perf_type_key, perf_json))
 
     return BotUser(username, flair, flag, created_at, seen_at, patron, tos_violation, perfs)
+
+  def get_played_perfs(self) -> list[Perf]:
+    """Return the perfs which the bot has played games in, which are the only ones shown on the leaderboards."""
+    return [perf for perf in self.perfs if perf.games]
@@ -0,0 +1,33 @@
+"""An abstraction for decoding lines of lichess ndjson into BotUsers."""
+
+import abc
+
+from src.leaderboard.li.bot_user import BotUser
+
+
+class BotUserDecoder(abc.ABC):
+  """Interface for decoding a line of ndjson into a BotUser."""
+
+  @abc.abstractmethod
+  def decode(self, json_str: str) -> BotUser:
+    """Parse a line of ndjson and convert it to a BotUser."""
+    ...
+
+  @abc.abstractmethod
+  def decode_list(self, json_str: str) -> list[BotUser]:
+    """Parse a json list of users and convert it to a list of BotUsers."""
+    ...
+
+
+def create_bot_user_decoder() -> BotUserDecoder:
+  """Return the fastest decoder available.
+
+  The msgspec decoder is used if msgspec is installed, otherwise the decoder falls back to the standard library json module.
+  """
+  try:
+    from src.leaderboard.li.msgspec_bot_user_decoder import MsgspecBotUserDecoder
+  except ImportError:
+    from src.leaderboard.li.json_bot_user_decoder import JsonBotUserDecoder
+
+    return JsonBotUserDecoder()
+  return MsgspecBotUserDecoder()
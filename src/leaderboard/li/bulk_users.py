@@ -0,0 +1,36 @@
+"""Functions for fetching many users from lichess in batches."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.li.rate_limiter import RateLimiter
+
+
+# The maximum number of ids accepted by the lichess bulk users endpoint
+MAX_USERS_PER_BATCH = 300
+
+
+def create_batches(user_ids: list[str], batch_size: int = MAX_USERS_PER_BATCH) -> list[list[str]]:
+  """Split the user ids into batches of at most batch_size ids."""
+  return [user_ids[start : start + batch_size] for start in range(0, len(user_ids), batch_size)]
+
+
+def iter_user_batches(
+  lichess_client: LichessClient, user_ids: list[str], max_workers: int, rate_limiter: RateLimiter
+) -> Iterator[str]:
+  """Fetch the users in batches and yield each json list response in the same order as the batches.
+
+  The batches are fetched by a small pool of threads so that the latency of each request overlaps, while the rate limiter
+  keeps the requests from starting too close together.
+  """
+
+  def get_users(batch: list[str]) -> str:
+    rate_limiter.acquire()
+    return lichess_client.get_users(batch)
+
+  batches = create_batches(user_ids)
+  if not batches:
+    return
+  with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+    yield from executor.map(get_users, batches)
@@ -0,0 +1,18 @@
+"""An implementation of BotUserDecoder which uses the standard library json module."""
+
+import json
+
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder
+
+
+class JsonBotUserDecoder(BotUserDecoder):
+  """Decodes the full json dict and then picks out the fields which are used."""
+
+  def decode(self, json_str: str) -> BotUser:
+    """Parse a line of ndjson and convert it to a BotUser."""
+    return BotUser.from_json(json_str)
+
+  def decode_list(self, json_str: str) -> list[BotUser]:
+    """Parse a json list of users and convert it to a list of BotUsers."""
+    return [BotUser.from_json_dict(json_dict) for json_dict in json.loads(json_str)]
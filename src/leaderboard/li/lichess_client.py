@@ -1,6 +1,7 @@
 """Client for communicating with lichess."""
 
 import abc
+from collections.abc import Iterator
 
 
 class LichessClient(abc.ABC):
@@ -10,3 +11,16 @@ class LichessClient(abc.ABC):
   def get_online_bots(self) -> str:
     """Return a list of online bots represented as ndjson."""
     ...
+
+  @abc.abstractmethod
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time as the response is received."""
+    ...
+
+  @abc.abstractmethod
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return a json list of the users with the given ids (at most 300 per call).
+
+    Ids which are not found are left out of the response.
+    """
+    ...
@@ -0,0 +1,71 @@
+"""Module containing functions for saving and loading snapshots of lichess responses.
+
+A snapshot is the raw body of a response, compressed with gzip and saved under the time it was captured. Snapshots are
+recorded by RecordingLichessClient and played back by ReplayLichessClient. The leaderboard data which the recorded run started
+from is saved with them, so that a replay starts from the same data and makes the same requests.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import io
+from collections.abc import Iterator
+from typing import TextIO
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+
+
+ONLINE_BOTS_SNAPSHOT_NAME = "online_bots.ndjson.gz"
+
+
+def users_snapshot_name(user_ids: list[str]) -> str:
+  """Return "users_{digest}.json.gz" where the digest identifies the ids which were requested."""
+  digest = hashlib.sha256(",".join(user_ids).encode("utf-8")).hexdigest()[:16]
+  return f"users_{digest}.json.gz"
+
+
+@contextlib.contextmanager
+def open_snapshot_writer(file_system: FileSystem, capture_time: int, name: str) -> Iterator[TextIO]:
+  """Open a writer which compresses the body of a response as it is produced, and save the snapshot when the context exits.
+
+  The gzip header does not include a modification time, so the same body always produces the same bytes.
+  """
+  with (
+    file_system.open_binary_file_writer(file_paths.lichess_snapshot_path(capture_time, name)) as file,
+    gzip.GzipFile("", "wb", fileobj=file, mtime=0) as gzip_file,
+    io.TextIOWrapper(gzip_file, encoding="utf-8", newline="") as text_file,
+  ):
+    yield text_file
+
+
+def save_snapshot(file_system: FileSystem, capture_time: int, name: str, body: str) -> None:
+  """Compress and save the body of a response."""
+  with open_snapshot_writer(file_system, capture_time, name) as file:
+    file.write(body)
+
+
+def load_snapshot(file_system: FileSystem, capture_time: int, name: str) -> str:
+  """Load and decompress the body of a response which was saved previously."""
+  snapshot_path = file_paths.lichess_snapshot_path(capture_time, name)
+  compressed_body = file_system.read_binary_file(snapshot_path)
+  if not compressed_body:
+    message = f"No snapshot found at {snapshot_path}"
+    raise FileNotFoundError(message)
+  return gzip.decompress(compressed_body).decode("utf-8")
+
+
+def save_input_data(file_system: FileSystem, capture_time: int) -> None:
+  """Save a copy of the leaderboard data before a recorded run changes it."""
+  input_data_dir = file_paths.lichess_snapshot_path(capture_time, file_paths.LEADERBOARD_DATA_DIR)
+  file_system.copy_directory(file_paths.LEADERBOARD_DATA_DIR, input_data_dir)
+
+
+def restore_input_data(file_system: FileSystem, capture_time: int) -> None:
+  """Replace the leaderboard data in the replay directory with the copy saved before the recorded run.
+
+  A replay reads and writes the leaderboard data in the replay directory, so the live leaderboard data is left as it is and
+  every replay starts from the same data.
+  """
+  input_data_dir = file_paths.lichess_snapshot_path(capture_time, file_paths.LEADERBOARD_DATA_DIR)
+  file_system.copy_directory(input_data_dir, f"{file_paths.replay_dir(capture_time)}/{file_paths.LEADERBOARD_DATA_DIR}")
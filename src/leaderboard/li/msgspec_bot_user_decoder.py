@@ -0,0 +1,85 @@
+"""An implementation of BotUserDecoder which uses msgspec.
+
+msgspec is an optional dependency. The structs below only declare the fields which are used, so every other field in the
+lichess json is skipped without being decoded into python objects.
+"""
+
+import msgspec
+
+from src.leaderboard.li.bot_user import BotUser, Perf
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder
+from src.leaderboard.li.pert_type import PerfType
+
+
+# Built once rather than on every call to PerfType.from_json
+PERF_TYPE_BY_JSON_KEY = {perf_type.to_string(): perf_type for perf_type in PerfType.all_except_unknown()}
+
+
+class PerfStruct(msgspec.Struct, gc=False):
+  """The fields of a lichess perf which are used by Perf."""
+
+  games: int = 0
+  rating: int = 0
+  rd: int = 0
+  prog: int = 0
+  prov: bool = False
+
+
+class ProfileStruct(msgspec.Struct, gc=False):
+  """The fields of a lichess profile which are used by BotUser."""
+
+  flag: str = ""
+
+
+class BotUserStruct(msgspec.Struct, rename="camel"):
+  """The fields of a lichess user which are used by BotUser."""
+
+  username: str = ""
+  flair: str = ""
+  profile: ProfileStruct = msgspec.field(default_factory=ProfileStruct)
+  created_at: int = 0
+  seen_at: int = 0
+  patron: bool = False
+  tos_violation: bool = False
+  perfs: dict[str, PerfStruct] = msgspec.field(default_factory=dict[str, PerfStruct])
+
+
+class MsgspecBotUserDecoder(BotUserDecoder):
+  """Decodes straight into typed structs and then converts those to a BotUser."""
+
+  def __init__(self) -> None:
+    """Create the reusable msgspec decoders."""
+    self.decoder = msgspec.json.Decoder(BotUserStruct)
+    self.list_decoder = msgspec.json.Decoder(list[BotUserStruct])
+
+  def decode(self, json_str: str) -> BotUser:
+    """Parse a line of ndjson and convert it to a BotUser."""
+    return MsgspecBotUserDecoder.to_bot_user(self.decoder.decode(json_str))
+
+  def decode_list(self, json_str: str) -> list[BotUser]:
+    """Parse a json list of users and convert it to a list of BotUsers."""
+    return [MsgspecBotUserDecoder.to_bot_user(bot_user_struct) for bot_user_struct in self.list_decoder.decode(json_str)]
+
+  @classmethod
+  def to_bot_user(cls, bot_user_struct: BotUserStruct) -> BotUser:
+    """Convert the decoded struct to a BotUser."""
+    return BotUser(
+      bot_user_struct.username,
+      bot_user_struct.flair,
+      bot_user_struct.profile.flag,
+      bot_user_struct.created_at // 1000,
+      bot_user_struct.seen_at // 1000,
+      bot_user_struct.patron,
+      bot_user_struct.tos_violation,
+      [
+        Perf(
+          PERF_TYPE_BY_JSON_KEY.get(perf_type_key, PerfType.UNKNOWN),
+          perf.games,
+          perf.rating,
+          perf.rd,
+          perf.prog,
+          perf.prov,
+        )
+        for perf_type_key, perf in bot_user_struct.perfs.items()
+      ],
+    )
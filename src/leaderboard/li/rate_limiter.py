@@ -0,0 +1,34 @@
+"""A client side rate limiter for calls to the lichess API."""
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class RateLimiter:
+  """Spaces out calls so that they start at least a minimum interval apart.
+
+  This is safe to share between threads. Each caller reserves the next available slot and then waits outside of the lock.
+  """
+
+  def __init__(
+    self,
+    min_interval: float,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+  ) -> None:
+    """Initialize a rate limiter which allows one call per min_interval seconds."""
+    self.min_interval = min_interval
+    self.clock = clock
+    self.sleep = sleep
+    self.lock = threading.Lock()
+    self.next_slot = 0.0
+
+  def acquire(self) -> None:
+    """Wait until the next call is allowed to start."""
+    with self.lock:
+      now = self.clock()
+      slot = max(now, self.next_slot)
+      self.next_slot = slot + self.min_interval
+    if slot > now:
+      self.sleep(slot - now)
@@ -1,20 +1,275 @@
 """An implementation of LichessClient which actually calls the lichess API."""
 
+import contextlib
+import dataclasses
+import email.utils
+import io
+import json
+import random
+import time
+from collections.abc import Callable, Iterator
+from typing import TextIO
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
 from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.log.log_writer import LogWriter
+
+
+LICHESS_URL = "https://lichess.org"
+ONLINE_BOTS_PATH = "/api/team/lucky_0wls-bots/users"
+USERS_PATH = "/api/users"
+NDJSON_HEADERS = {"Accept": "application/x-ndjson"}
+USERS_HEADERS = {"Accept": "application/json", "Content-Type": "text/plain"}
+
+# Transient statuses which are worth retrying: too many requests, and server errors which are likely to go away
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+HTTP_NOT_MODIFIED = 304
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+  """How many times and how long to wait before retrying a failed request."""
+
+  # The number of retries after the first attempt
+  max_retries: int = 4
+  # The backoff before the first retry, which doubles on each subsequent retry (seconds)
+  base_backoff: float = 1.0
+  # The upper bound for the backoff and for honoring Retry-After (seconds)
+  max_backoff: float = 60.0
+  # The timeout for connecting and for each read from the socket (seconds)
+  timeout: float = 10.0
+  # Returns a random number between its two arguments, which spreads out the retries of clients which failed together
+  jitter: Callable[[float, float], float] = random.SystemRandom().uniform
+
+  def get_backoff(self, retry_number: int) -> float:
+    """Return the exponential backoff before the nth retry with "full jitter" applied."""
+    return self.jitter(0, min(self.max_backoff, self.base_backoff * 2**retry_number))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+@dataclasses.dataclass(frozen=True)
+class AttemptStats:
+  """Instrumentation for a single attempt at an http request."""
+
+  method: str
+  url: str
+  # Zero if no response was received
+  status_code: int
+  # The time until the response headers were received (seconds)
+  latency: float
+  # The number of bytes in the response body
+  bytes_received: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedResponse:
+  """The validators of a previous response for making conditional requests, whose body is cached separately."""
+
+  etag: str
+  last_modified: str
+
+  @classmethod
+  def from_response(cls, response: requests.Response) -> "CachedResponse | None":
+    """Create a CachedResponse if the response included any validators."""
+    etag = response.headers.get("ETag", "")
+    last_modified = response.headers.get("Last-Modified", "")
+    return CachedResponse(etag, last_modified) if etag or last_modified else None
+
+  def get_conditional_headers(self) -> dict[str, str]:
+    """Return the headers which make a request conditional on the response having changed."""
+    headers: dict[str, str] = {}
+    if self.etag:
+      headers["If-None-Match"] = self.etag
+    if self.last_modified:
+      headers["If-Modified-Since"] = self.last_modified
+    return headers
+
+
+def parse_retry_after(retry_after: str | None) -> float | None:
+  """Parse the value of a Retry-After header, which is either a number of seconds or an http date."""
+  if not retry_after:
+    return None
+  if retry_after.strip().isdigit():
+    return float(retry_after)
+  try:
+    retry_after_datetime = email.utils.parsedate_to_datetime(retry_after)
+  except (TypeError, ValueError):
+    return None
+  return max(0.0, retry_after_datetime.timestamp() - time.time())
 
 
 class RealLichessClient(LichessClient):
-  """Calls the lichess API."""
+  """Calls the lichess API.
+
+  Requests share a pooled session, transient failures are retried with exponential backoff and jitter, and responses with
+  validators (ETag or Last-Modified) are cached so that an unchanged response only costs a 304.
+  """
+
+  def __init__(
+    self,
+    log_writer: LogWriter,
+    cache_file_system: FileSystem | None = None,
+    base_url: str = LICHESS_URL,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    sleep: Callable[[float], None] = time.sleep,
+  ) -> None:
+    """Initialize the session.
+
+    If cache_file_system is set, cached responses are persisted so that they can be reused by the next run, and their bodies
+    are written and read one line at a time rather than held in memory.
+    """
+    self.log_writer = log_writer
+    self.cache_file_system = cache_file_system
+    self.base_url = base_url
+    self.retry_policy = retry_policy
+    self.sleep = sleep
+    self.session = requests.Session()
+    # Retries are handled below so that every attempt can be instrumented
+    # The pool is large enough for the threads which fetch users in batches
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0)
+    self.session.mount("https://", adapter)
+    self.session.mount("http://", adapter)
+    self.attempt_stats: list[AttemptStats] = []
+    self.cached_responses: dict[str, CachedResponse] = {}
+    # The bodies of the cached responses if they are not persisted
+    self.cached_bodies: dict[str, str] = {}
+
+  def record_attempt(self, attempt_stats: AttemptStats) -> None:
+    """Keep and log the instrumentation for an attempt."""
+    self.attempt_stats.append(attempt_stats)
+    self.log_writer.info(
+      "%s %s -> %d in %.3fs (%d bytes)",
+      attempt_stats.method,
+      attempt_stats.url,
+      attempt_stats.status_code,
+      attempt_stats.latency,
+      attempt_stats.bytes_received,
+    )
+
+  def request_with_retries(self, method: str, url: str, headers: dict[str, str], data: str | None = None) -> requests.Response:
+    """Make a streaming request, retrying transient failures.
+
+    The response which is returned has not had its body read yet. If every attempt fails, the last error is raised.
+    """
+    retry_number = 0
+    while True:
+      start_time = time.perf_counter()
+      try:
+        response = self.session.request(
+          method, url, headers=headers, data=data, timeout=self.retry_policy.timeout, stream=True
+        )
+      except (requests.ConnectionError, requests.Timeout):
+        self.record_attempt(AttemptStats(method, url, 0, time.perf_counter() - start_time, 0))
+        if retry_number >= self.retry_policy.max_retries:
+          raise
+        delay = self.retry_policy.get_backoff(retry_number)
+      else:
+        if response.ok or response.status_code == HTTP_NOT_MODIFIED:
+          return response
+        latency = time.perf_counter() - start_time
+        self.record_attempt(AttemptStats(method, url, response.status_code, latency, len(response.content)))
+        if response.status_code not in RETRYABLE_STATUS_CODES or retry_number >= self.retry_policy.max_retries:
+          response.raise_for_status()
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        delay = self.retry_policy.get_backoff(retry_number) if retry_after is None else retry_after
+        response.close()
+      retry_number += 1
+      self.sleep(min(delay, self.retry_policy.max_backoff))
+
+  def load_cached_response(self, name: str) -> CachedResponse | None:
+    """Return the validators of the cached response from memory, or from the previous run if they were persisted."""
+    if name in self.cached_responses or not self.cache_file_system:
+      return self.cached_responses.get(name)
+    validators_str = self.cache_file_system.read_file(file_paths.lichess_cache_path(f"{name}.json"))
+    if not validators_str:
+      return None
+    validators = json.loads(validators_str)
+    cached_response = CachedResponse(validators.get("etag", ""), validators.get("last_modified", ""))
+    self.cached_responses[name] = cached_response
+    return cached_response
+
+  def save_cached_response(self, name: str, cached_response: CachedResponse) -> None:
+    """Keep the validators of a response whose body has been cached, persisting them if possible."""
+    self.cached_responses[name] = cached_response
+    if self.cache_file_system:
+      validators = {"etag": cached_response.etag, "last_modified": cached_response.last_modified}
+      self.cache_file_system.write_file(file_paths.lichess_cache_path(f"{name}.json"), json.dumps(validators))
+
+  @contextlib.contextmanager
+  def open_cached_body_writer(self, name: str) -> Iterator[TextIO]:
+    """Open a writer for the body of a response, which is cached when the context exits without an exception.
+
+    If the body is persisted, it is written to disk as it is produced, so it is never all held in memory.
+    """
+    if self.cache_file_system:
+      with self.cache_file_system.open_file_writer(file_paths.lichess_cache_path(f"{name}.ndjson")) as file:
+        yield file
+      return
+    with io.StringIO() as file:
+      yield file
+      self.cached_bodies[name] = file.getvalue()
+
+  def iter_cached_lines(self, name: str) -> Iterator[str]:
+    """Yield the lines of the cached body of a response, reading them one at a time if the body was persisted."""
+    if self.cache_file_system:
+      yield from self.cache_file_system.iter_file_lines(file_paths.lichess_cache_path(f"{name}.ndjson"))
+    else:
+      yield from self.cached_bodies.get(name, "").splitlines()
+
+  def iter_conditional_ndjson(self, name: str, path: str) -> Iterator[str]:
+    """Yield the lines of an ndjson response, which may come from the cache if the response has not changed."""
+    url = f"{self.base_url}{path}"
+    cached_response = self.load_cached_response(name)
+    headers = NDJSON_HEADERS | (cached_response.get_conditional_headers() if cached_response else {})
+    start_time = time.perf_counter()
+    with self.request_with_retries("GET", url, headers) as response:
+      latency = time.perf_counter() - start_time
+      if response.status_code == HTTP_NOT_MODIFIED and cached_response:
+        self.record_attempt(AttemptStats("GET", url, response.status_code, latency, 0))
+        yield from self.iter_cached_lines(name)
+        return
+      # Only cache the body if the server supports conditional requests
+      new_cached_response = CachedResponse.from_response(response)
+      bytes_received = 0
+      with self.open_cached_body_writer(name) if new_cached_response else contextlib.nullcontext() as body_file:
+        for line in response.iter_lines():
+          bytes_received += len(line) + 1
+          # Skip keep-alive new lines
+          if line:
+            line_str = line.decode("utf-8")
+            if body_file:
+              body_file.write(f"{line_str}\n")
+            yield line_str
+      self.record_attempt(AttemptStats("GET", url, response.status_code, latency, bytes_received))
+      if new_cached_response:
+        self.save_cached_response(name, new_cached_response)
 
   def get_online_bots(self) -> str:
-    """Return a list of online bots represented as ndjson.
+    """Return a list of online bots represented as ndjson."""
+    return "\n".join(self.iter_online_bots())
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time as the response is received.
+
+    Only a single line of the response is held in memory at once, unless it is cached without a file system to persist it to.
+    """
+    yield from self.iter_conditional_ndjson("online_bots", ONLINE_BOTS_PATH)
+
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return a json list of the users with the given ids (at most 300 per call).
 
-    Timeout of 10 seconds. No exception handling.
+    Ids which are not found are left out of the response. This is safe to call from multiple threads.
     """
-    url = "https://lichess.org/api/team/lucky_0wls-bots/users"
-    headers = {"Accept": "application/x-ndjson"}
-    response = requests.get(url, headers=headers, timeout=10, stream=True)
-    response.raise_for_status()
-    return response.text
+    url = f"{self.base_url}{USERS_PATH}"
+    start_time = time.perf_counter()
+    with self.request_with_retries("POST", url, USERS_HEADERS, ",".join(user_ids)) as response:
+      latency = time.perf_counter() - start_time
+      users_json = response.text
+      self.record_attempt(AttemptStats("POST", url, response.status_code, latency, len(response.content)))
+      return users_json
@@ -0,0 +1,43 @@
+"""An implementation of LichessClient which saves a snapshot of every response from another LichessClient."""
+
+from collections.abc import Iterator
+
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li import lichess_snapshots
+from src.leaderboard.li.lichess_client import LichessClient
+
+
+class RecordingLichessClient(LichessClient):
+  """Wraps a LichessClient and records each response so that it can be replayed later with ReplayLichessClient."""
+
+  def __init__(self, lichess_client: LichessClient, file_system: FileSystem, capture_time: int) -> None:
+    """Set the client to record and where to save the snapshots."""
+    self.lichess_client = lichess_client
+    self.file_system = file_system
+    self.capture_time = capture_time
+
+  def get_online_bots(self) -> str:
+    """Return a list of online bots represented as ndjson."""
+    return "\n".join(self.iter_online_bots())
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time and save the snapshot once all of the lines have been received.
+
+    The lines are compressed into the snapshot as they are received, so they are never all held in memory.
+    """
+    snapshot_name = lichess_snapshots.ONLINE_BOTS_SNAPSHOT_NAME
+    with lichess_snapshots.open_snapshot_writer(self.file_system, self.capture_time, snapshot_name) as file:
+      # The lines are separated by new lines, like the body returned by get_online_bots
+      separator = ""
+      for line in self.lichess_client.iter_online_bots():
+        file.write(separator)
+        file.write(line)
+        separator = "\n"
+        yield line
+
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return a json list of the users with the given ids and save the snapshot."""
+    users_json = self.lichess_client.get_users(user_ids)
+    snapshot_name = lichess_snapshots.users_snapshot_name(user_ids)
+    lichess_snapshots.save_snapshot(self.file_system, self.capture_time, snapshot_name, users_json)
+    return users_json
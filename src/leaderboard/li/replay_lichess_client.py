@@ -0,0 +1,43 @@
+"""An implementation of LichessClient which plays back the snapshots saved by RecordingLichessClient."""
+
+from collections.abc import Iterator
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li import lichess_snapshots
+from src.leaderboard.li.lichess_client import LichessClient
+
+
+class ReplayLichessClient(LichessClient):
+  """Serves recorded responses without using the network.
+
+  Paired with the time provider from create_time_provider, and with the leaderboard data restored into the replay directory by
+  lichess_snapshots.restore_input_data, a run can be repeated exactly as it happened when the snapshots were captured. This
+  is useful for profiling and benchmarking the whole pipeline on real data.
+  """
+
+  def __init__(self, file_system: FileSystem, capture_time: int) -> None:
+    """Set where to load the snapshots from."""
+    self.file_system = file_system
+    self.capture_time = capture_time
+
+  def create_time_provider(self) -> FixedTimeProvider:
+    """Return a time provider which is fixed at the time the snapshots were captured."""
+    return FixedTimeProvider(self.capture_time)
+
+  def get_online_bots(self) -> str:
+    """Return the recorded list of online bots represented as ndjson."""
+    return lichess_snapshots.load_snapshot(self.file_system, self.capture_time, lichess_snapshots.ONLINE_BOTS_SNAPSHOT_NAME)
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the recorded online bots one line of ndjson at a time."""
+    yield from self.get_online_bots().splitlines()
+
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return the recorded json list of the users with the given ids.
+
+    The ids must be the same as those which were recorded, which is the case when replaying from the restored leaderboard data
+    with the same options.
+    """
+    snapshot_name = lichess_snapshots.users_snapshot_name(user_ids)
+    return lichess_snapshots.load_snapshot(self.file_system, self.capture_time, snapshot_name)
@@ -1,35 +1,60 @@
 """Leaderboard generator."""
 
-import json
+import dataclasses
 import time
 
 from src.leaderboard.chrono.time_provider import TimeProvider
-from src.leaderboard.data.data_generator import DataGenerator
+from src.leaderboard.data import data_generator as data_generator_functions
+from src.leaderboard.data.data_generator import DEFAULT_DATA_GENERATOR_OPTIONS, DataGenerator, DataGeneratorOptions
+from src.leaderboard.data.rating_history import RatingHistory
 from src.leaderboard.fs import file_paths
 from src.leaderboard.fs.file_system import FileSystem
 from src.leaderboard.li.lichess_client import LichessClient
 from src.leaderboard.log.log_writer import LogWriter
-from src.leaderboard.page.html_generator import HtmlGenerator
+from src.leaderboard.page import precompressor
+from src.leaderboard.page.html_generator import DEFAULT_HTML_GENERATOR_OPTIONS, HtmlGenerator, HtmlGeneratorOptions
+
+
+def get_generation_number(file_system: FileSystem) -> int:
+  """Return the value of the generation number file, which is the number of times the leaderboards have been generated."""
+  value_str = file_system.read_file(file_paths.generation_number_path())
+  return int(value_str) if value_str else 0
 
 
 def increment_generation_number(file_system: FileSystem) -> None:
   """Increments the value generation number number file."""
-  value_str = file_system.read_file(file_paths.generation_number_path())
-  value = int(value_str) if value_str else 0
-  file_system.write_file(file_paths.generation_number_path(), str(value + 1))
+  file_system.write_file(file_paths.generation_number_path(), str(get_generation_number(file_system) + 1))
+
+
+@dataclasses.dataclass(frozen=True)
+class LeaderboardGeneratorOptions:
+  """Settings for the optional stages of generating the leaderboard data and html."""
+
+  data_generator_options: DataGeneratorOptions = DEFAULT_DATA_GENERATOR_OPTIONS
+  html_generator_options: HtmlGeneratorOptions = DEFAULT_HTML_GENERATOR_OPTIONS
+
+
+DEFAULT_LEADERBOARD_GENERATOR_OPTIONS = LeaderboardGeneratorOptions()
 
 
 class LeaderboardGenerator:
   """Generator of leaderboards."""
 
   def __init__(
-    self, file_system: FileSystem, lichess_client: LichessClient, time_provider: TimeProvider, log_writer: LogWriter
+    self,
+    file_system: FileSystem,
+    lichess_client: LichessClient,
+    time_provider: TimeProvider,
+    log_writer: LogWriter,
+    options: LeaderboardGeneratorOptions = DEFAULT_LEADERBOARD_GENERATOR_OPTIONS,
   ) -> None:
     """Initialize a new generator."""
     self.file_system = file_system
     self.lichess_client = lichess_client
     self.time_provider = time_provider
     self.log_writer = log_writer
+    self.data_generator_options = options.data_generator_options
+    self.html_generator_options = options.html_generator_options
 
   def generate_leaderboards(self) -> None:
     """Generate the leaderboards."""
@@ -38,27 +63,73 @@ class LeaderboardGenerator:
     self.log_writer.info("Generating leaderboards...")
 
     # Generate leaderboard data
-    data_generator = DataGenerator(self.file_system, self.lichess_client, self.time_provider)
+    data_generator = DataGenerator(self.file_system, self.lichess_client, self.time_provider, self.data_generator_options)
     leaderboard_data = data_generator.generate_leaderboard_data()
 
     # Save the leaderboard data
-    bot_profile_dicts = [bot_profile.as_dict() for bot_profile in leaderboard_data.get_bot_profiles_sorted()]
-    self.file_system.write_file(file_paths.bot_profiles_path(), json.dumps(bot_profile_dicts, indent=2))
-    for perf_type, rows in leaderboard_data.get_ranked_rows_sorted().items():
-      row_dicts = [row.as_dict() for row in rows]
-      self.file_system.write_file(file_paths.data_path(perf_type), json.dumps(row_dicts, indent=2))
+    data_generator_functions.save_leaderboard_data(
+      self.file_system,
+      self.data_generator_options.data_format,
+      leaderboard_data.get_bot_profiles_sorted(),
+      leaderboard_data.get_ranked_rows_sorted(),
+      self.time_provider.get_current_time(),
+    )
+    rating_history = RatingHistory(self.file_system)
+    rating_history.append(
+      get_generation_number(self.file_system),
+      self.time_provider.get_current_time(),
+      leaderboard_data.ranked_rows_by_perf_type,
+      leaderboard_data.bot_profiles_by_name,
+    )
 
-    # Generate leaderboard html
-    html_generator = HtmlGenerator(self.time_provider)
-    html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+    # Generate and save the leaderboard html
+    html_generator = HtmlGenerator(
+      self.time_provider,
+      self.file_system,
+      self.html_generator_options.render_workers,
+      self.html_generator_options.skip_unchanged_pages,
+    )
+    if self.html_generator_options.stream_html:
+      html_paths = html_generator.write_leaderboard_html(leaderboard_data, self.file_system)
+    else:
+      html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+      html_by_path = {file_paths.html_path(name): html for name, html in html_by_name.items()}
+      self.file_system.write_files(html_by_path)
+      html_paths = list(html_by_path)
 
-    # Save the leaderboard html
-    for name, html in html_by_name.items():
-      self.file_system.write_file(file_paths.html_path(name), html)
+    # Optionally write compressed copies of the html
+    if self.html_generator_options.precompress:
+      self.precompress_leaderboard_html(html_paths)
 
     # Make note of how many times we have generated the leaderboards
     increment_generation_number(self.file_system)
 
-    # Print time elapsed
+    # Print how much was written, and time elapsed
+    write_counts = self.file_system.get_write_counts()
+    self.log_writer.info(
+      "Wrote %d bytes to %d files, skipped %d bytes in %d unchanged files",
+      write_counts.bytes_written,
+      write_counts.files_written,
+      write_counts.bytes_skipped,
+      write_counts.files_skipped,
+    )
     time_elapsed = time.time() - start_time
     self.log_writer.info("Finished in %.2fs", time_elapsed)
+
+  def precompress_leaderboard_html(self, html_paths: list[str]) -> None:
+    """Write compressed copies of the html files and report how much smaller they are."""
+    start_time = time.time()
+    # The html is read back, as it is not kept in memory when it is written as it is rendered
+    html_by_path = {path: html for path, html in self.file_system.read_files(html_paths).items() if html is not None}
+    counts = precompressor.precompress_leaderboard_html(self.file_system, html_by_path)
+    ratios = ", ".join(
+      f"{encoding_name} {counts.get_ratio(encoding_name):.1%}" for encoding_name in counts.compressed_bytes_by_encoding
+    )
+    self.log_writer.info(
+      "Compressed %d files (%d unchanged) of %d bytes to %s in %.2fs",
+      counts.files_compressed,
+      counts.files_unchanged,
+      counts.original_bytes,
+      ratios,
+      time.time() - start_time,
+    )
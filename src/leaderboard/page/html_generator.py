@@ -2,6 +2,7 @@
 
 import dataclasses
 import itertools
+from collections.abc import Iterable, Iterator, Mapping
 
 from jinja2 import Environment, FileSystemLoader
 
@@ -9,13 +10,34 @@ from src.leaderboard.chrono import date_formatter, duration_formatter
 from src.leaderboard.chrono.time_provider import TimeProvider
 from src.leaderboard.data.data_generator import LeaderboardDataResult
 from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
 from src.leaderboard.li.pert_type import PerfType
-from src.leaderboard.page import flag_emoji, meta_tags
+from src.leaderboard.page import flag_emoji, meta_tags, page_fingerprint
+from src.leaderboard.page.page_fingerprint import PageFingerprints
+from src.leaderboard.page.template_cache import TemplateBytecodeCache
 
 
 MAX_RANK_FOR_PREVIEW = 10
 
 
+@dataclasses.dataclass(frozen=True)
+class HtmlGeneratorOptions:
+  """Settings for the optional stages of generating the leaderboard html."""
+
+  # Whether to write gzip (and brotli, if it is installed) copies of the html for a web server to send as they are
+  precompress: bool = False
+  # The number of processes used to render the pages (if 1 they are rendered one at a time in this process)
+  render_workers: int = 1
+  # Whether to write each page to its file as it is rendered, rather than rendering every page before writing them
+  stream_html: bool = False
+  # Whether to reuse the files of the pages whose fingerprints have not changed, rather than rendering every page again
+  skip_unchanged_pages: bool = False
+
+
+DEFAULT_HTML_GENERATOR_OPTIONS = HtmlGeneratorOptions()
+
+
 @dataclasses.dataclass(frozen=True)
 class NavLink:
   """An element of the navigation bar."""
@@ -208,29 +230,117 @@ class HtmlLeaderboard:
 
   title: LeaderboardTitle
   perf_type_str: str
-  leaderboard_rows: list[HtmlLeaderboardRow]
+  # The rows are only iterated once, so they can be converted while the page is rendered
+  leaderboard_rows: Iterable[HtmlLeaderboardRow]
 
   @classmethod
-  def from_leaderboard_data(
-    cls, leaderboard_data: LeaderboardDataResult, perf_type: PerfType, current_time: int, preview: bool = False
-  ) -> "HtmlLeaderboard":
-    """Create an HtmlLeaderboard from a LeaderboardDataResult.
+  def from_rows(cls, perf_type: PerfType, leaderboard_rows: Iterable[HtmlLeaderboardRow]) -> "HtmlLeaderboard":
+    """Create an HtmlLeaderboard of the perf type with rows which have already been converted."""
+    return HtmlLeaderboard(LeaderboardTitle.from_perf_type(perf_type), perf_type.to_string(), leaderboard_rows)
+
+
+def get_shown_rows(leaderboard_data: LeaderboardDataResult, perf_type: PerfType) -> Iterator[LeaderboardRow]:
+  """Yield the rows of the bots which are eligible for the perf type's leaderboard, which are the rows shown on its page."""
+  for row in leaderboard_data.ranked_rows_by_perf_type.get(perf_type, []):
+    # The rank is set to zero when the bot is not eligible for the leaderboard
+    if row.rank_info.rank:
+      yield row
+
+
+def get_shown_preview_rows(leaderboard_data: LeaderboardDataResult, perf_type: PerfType) -> Iterator[LeaderboardRow]:
+  """Yield the rows of the perf type which are shown in its preview on the index page."""
+  # The rows are in rank order, so the preview is the rows before the first one outside of the top n ranks
+  return itertools.takewhile(
+    lambda row: row.rank_info.rank <= MAX_RANK_FOR_PREVIEW, get_shown_rows(leaderboard_data, perf_type)
+  )
+
+
+def get_page_rows(
+  leaderboard_data: LeaderboardDataResult, perf_type: PerfType | None
+) -> Mapping[PerfType, Iterable[LeaderboardRow]]:
+  """Return the rows shown on the perf type's page, or on the index if the perf type is None, keyed by perf type."""
+  if perf_type is None:
+    return {
+      preview_perf_type: get_shown_preview_rows(leaderboard_data, preview_perf_type)
+      for preview_perf_type in PerfType.all_except_unknown()
+    }
+  return {perf_type: get_shown_rows(leaderboard_data, perf_type)}
+
+
+def get_page_name(perf_type: PerfType | None) -> str:
+  """Return the name of the perf type's page, or of the index if the perf type is None."""
+  return perf_type.to_string() if perf_type else "index"
+
+
+class HtmlLeaderboardCache:
+  """The HtmlLeaderboardRows of each perf type, converted once and shared by every page which shows them.
+
+  A cache is created for each generation of the html, since the rows depend on the current time.
+  """
+
+  def __init__(self, leaderboard_data: LeaderboardDataResult, current_time: int) -> None:
+    """Initialize an empty cache of the leaderboard data's rows."""
+    self.leaderboard_data = leaderboard_data
+    self.current_time = current_time
+    self.html_rows_by_perf_type: dict[PerfType, list[HtmlLeaderboardRow]] = {}
+    self.preview_rows_by_perf_type: dict[PerfType, list[HtmlLeaderboardRow]] = {}
+
+  def convert_rows(self, rows: Iterable[LeaderboardRow]) -> Iterator[HtmlLeaderboardRow]:
+    """Convert the rows one at a time."""
+    bot_profiles_by_name = self.leaderboard_data.bot_profiles_by_name
+    for row in rows:
+      yield HtmlLeaderboardRow.from_leaderboard_row(row, bot_profiles_by_name[row.name], self.current_time)
+
+  def get_remaining_rows(self, perf_type: PerfType, preview_rows: list[HtmlLeaderboardRow]) -> Iterator[HtmlLeaderboardRow]:
+    """Convert the rows of the perf type which come after the rows of its preview, which have already been converted."""
+    return self.convert_rows(itertools.islice(get_shown_rows(self.leaderboard_data, perf_type), len(preview_rows), None))
+
+  def get_rows(self, perf_type: PerfType) -> list[HtmlLeaderboardRow]:
+    """Return the rows of the bots which are eligible for the perf type's leaderboard, converting them the first time."""
+    html_rows = self.html_rows_by_perf_type.get(perf_type)
+    if html_rows is None:
+      preview_rows = self.preview_rows_by_perf_type.get(perf_type, [])
+      html_rows = [*preview_rows, *self.get_remaining_rows(perf_type, preview_rows)]
+      self.html_rows_by_perf_type[perf_type] = html_rows
+    return html_rows
+
+  def get_preview_rows(self, perf_type: PerfType) -> list[HtmlLeaderboardRow]:
+    """Return the top n rows of the perf type, which are shown in its preview on the index page.
+
+    If the perf type's rows have not all been converted, only the rows of the preview are converted.
+    """
+    preview_rows = self.preview_rows_by_perf_type.get(perf_type)
+    if preview_rows is None:
+      html_rows = self.html_rows_by_perf_type.get(perf_type)
+      if html_rows is None:
+        preview_rows = list(self.convert_rows(get_shown_preview_rows(self.leaderboard_data, perf_type)))
+      else:
+        preview_rows = html_rows[: sum(1 for _ in get_shown_preview_rows(self.leaderboard_data, perf_type))]
+      self.preview_rows_by_perf_type[perf_type] = preview_rows
+    return preview_rows
+
+  def stream_rows(self, perf_type: PerfType) -> Iterator[HtmlLeaderboardRow]:
+    """Yield the rows of the perf type, converting each one as it is needed and keeping only the rows of the preview.
+
+    This is used when the page is written as it is rendered, so the converted rows of a whole leaderboard are never all held
+    in memory at once.
+    """
+    html_rows = self.html_rows_by_perf_type.get(perf_type)
+    if html_rows is not None:
+      yield from html_rows
+      return
+    preview_rows = self.get_preview_rows(perf_type)
+    yield from preview_rows
+    yield from self.get_remaining_rows(perf_type, preview_rows)
+
+  def get_leaderboard(self, perf_type: PerfType, preview: bool = False) -> HtmlLeaderboard:
+    """Return the perf type's HtmlLeaderboard.
 
     If preview is true, only return the top n rows. This is used to show previews on the index page.
     """
-    rows = leaderboard_data.ranked_rows_by_perf_type.get(perf_type, [])
-    # Only include bots within the top n ranks if creating a preview leaderboard for the index page
-    rows = itertools.takewhile(lambda row: row.rank_info.rank <= MAX_RANK_FOR_PREVIEW, rows) if preview else rows
-    return HtmlLeaderboard(
-      LeaderboardTitle.from_perf_type(perf_type),
-      perf_type.to_string(),
-      [
-        HtmlLeaderboardRow.from_leaderboard_row(row, leaderboard_data.bot_profiles_by_name[row.name], current_time)
-        for row in rows
-        # The rank is set to zero when the bot is not eligible for the leaderboard
-        if row.rank_info.rank
-      ],
-    )
+    if preview:
+      return HtmlLeaderboard.from_rows(perf_type, self.get_preview_rows(perf_type))
+    return HtmlLeaderboard.from_rows(perf_type, self.get_rows(perf_type))
 
 
 def create_nav_links(active_perf_type: PerfType | None) -> list[NavLink]:
@@ -250,28 +360,152 @@ def create_nav_links(active_perf_type: PerfType | None) -> list[NavLink]:
 class HtmlGenerator:
   """Generator for html."""
 
-  def __init__(self, time_provider: TimeProvider) -> None:
-    """Initialize a new generator."""
+  def __init__(
+    self,
+    time_provider: TimeProvider,
+    file_system: FileSystem | None = None,
+    render_workers: int = 1,
+    skip_unchanged_pages: bool = False,
+  ) -> None:
+    """Initialize a new generator.
+
+    If a file_system is given, the compiled templates are cached in it, so that they are only compiled when they change. If
+    skip_unchanged_pages is also set, the fingerprint of each page is saved in it, so that a page whose fingerprint has not
+    changed is not rendered again. That relies on the html files of the last run still being there. If render_workers is
+    more than one, the pages are rendered in parallel by a pool of that many processes.
+    """
     self.time_provider = time_provider
-    self.jinja_env = Environment(loader=FileSystemLoader("templates"), autoescape=True)
+    self.file_system = file_system
+    self.render_workers = render_workers
+    self.skip_unchanged_pages = skip_unchanged_pages
+    bytecode_cache = TemplateBytecodeCache(file_system) if file_system is not None else None
+    self.jinja_env = Environment(loader=FileSystemLoader("templates"), autoescape=True, bytecode_cache=bytecode_cache)
+
+  def load_templates(self) -> None:
+    """Load the templates of every page, which compiles them if they are not cached."""
+    self.jinja_env.get_template("index.html.jinja")
+    self.jinja_env.get_template("leaderboard.html.jinja")
+
+  def get_index_context(self, html_leaderboard_cache: HtmlLeaderboardCache, current_time: int) -> dict[str, object]:
+    """Return the variables of the index template, which has a preview of each leaderboard."""
+    return {
+      "main_frame": MainFrame.from_perf_type(None, current_time),
+      "preview_leaderboards": [
+        html_leaderboard_cache.get_leaderboard(perf_type, preview=True) for perf_type in PerfType.all_except_unknown()
+      ],
+    }
+
+  def render_index_html(self, html_leaderboard_cache: HtmlLeaderboardCache, current_time: int) -> str:
+    """Render the index, which has a preview of each leaderboard."""
+    return self.jinja_env.get_template("index.html.jinja").render(self.get_index_context(html_leaderboard_cache, current_time))
+
+  def render_leaderboard_html(
+    self, html_leaderboard_cache: HtmlLeaderboardCache, perf_type: PerfType, current_time: int
+  ) -> str:
+    """Render the perf type's leaderboard."""
+    return self.jinja_env.get_template("leaderboard.html.jinja").render(
+      main_frame=MainFrame.from_perf_type(perf_type, current_time),
+      leaderboard=html_leaderboard_cache.get_leaderboard(perf_type),
+    )
+
+  def create_page_fingerprints(self, leaderboard_data: LeaderboardDataResult, current_time: int) -> PageFingerprints | None:
+    """Return the fingerprints of the pages, or None if unchanged pages are not skipped or there is nowhere to save them."""
+    if not self.skip_unchanged_pages or self.file_system is None:
+      return None
+    templates_digest = page_fingerprint.get_templates_digest(self.jinja_env)
+    return PageFingerprints(self.file_system, templates_digest, leaderboard_data.bot_profiles_by_name, current_time)
+
+  def get_unchanged_html(
+    self, page_fingerprints: PageFingerprints | None, leaderboard_data: LeaderboardDataResult, perf_type: PerfType | None
+  ) -> str | None:
+    """Return the html of the perf type's page (or of the index if the perf type is None) if it need not be rendered."""
+    if page_fingerprints is None:
+      return None
+    return page_fingerprints.get_unchanged_html(get_page_name(perf_type), get_page_rows(leaderboard_data, perf_type))
 
   def generate_leaderboard_html(self, leaderboard_data: LeaderboardDataResult) -> dict[str, str]:
-    """Generate index and leaderboard html."""
+    """Generate index and leaderboard html.
+
+    If unchanged pages are skipped, the pages whose fingerprints have not changed since they were last generated are not
+    rendered again. Instead the html of their files is reused with the last updated time replaced.
+    """
     current_time = self.time_provider.get_current_time()
-    html_by_name: dict[str, str] = {}
-    # Create index html
-    html_by_name["index"] = self.jinja_env.get_template("index.html.jinja").render(
-      main_frame=MainFrame.from_perf_type(None, current_time),
-      preview_leaderboards=[
-        HtmlLeaderboard.from_leaderboard_data(leaderboard_data, perf_type, current_time, True)
-        for perf_type in PerfType.all_except_unknown()
-      ],
-    )
-    # Create leaderboard html
+    page_fingerprints = self.create_page_fingerprints(leaderboard_data, current_time)
+    if self.render_workers > 1:
+      # Imported here because the renderer uses this module
+      from src.leaderboard.page import parallel_renderer
+
+      html_by_name = parallel_renderer.render_leaderboard_html(leaderboard_data, current_time, self.render_workers)
+      # Every page is rendered by the pool, but the fingerprints are saved so that the next generation can use them
+      if page_fingerprints is not None:
+        for perf_type in [None, *PerfType.all_except_unknown()]:
+          page_fingerprints.add_fingerprint(get_page_name(perf_type), get_page_rows(leaderboard_data, perf_type))
+        page_fingerprints.save()
+      return html_by_name
+    html_leaderboard_cache = HtmlLeaderboardCache(leaderboard_data, current_time)
+    # Create leaderboard html before the index, so that only the previews of the unchanged leaderboards are converted
+    leaderboard_html_by_name: dict[str, str] = {}
     for perf_type in PerfType.all_except_unknown():
-      html_by_name[perf_type.to_string()] = self.jinja_env.get_template("leaderboard.html.jinja").render(
-        main_frame=MainFrame.from_perf_type(perf_type, current_time),
-        leaderboard=HtmlLeaderboard.from_leaderboard_data(leaderboard_data, perf_type, current_time),
-      )
+      html = self.get_unchanged_html(page_fingerprints, leaderboard_data, perf_type)
+      if html is None:
+        html = self.render_leaderboard_html(html_leaderboard_cache, perf_type, current_time)
+      leaderboard_html_by_name[perf_type.to_string()] = html
+    # Create index html
+    index_html = self.get_unchanged_html(page_fingerprints, leaderboard_data, None)
+    if index_html is None:
+      index_html = self.render_index_html(html_leaderboard_cache, current_time)
+    if page_fingerprints is not None:
+      page_fingerprints.save()
     # Return file name to html contents map
-    return html_by_name
+    return {"index": index_html, **leaderboard_html_by_name}
+
+  def write_leaderboard_html(self, leaderboard_data: LeaderboardDataResult, file_system: FileSystem) -> list[str]:
+    """Write the index and leaderboard html to their files as they are rendered, and return the paths of the files.
+
+    Each page is written in pieces as the template produces them, so no page is held in memory as a whole, and each file is
+    saved before the next page is rendered. The leaderboards are written before the index, so that only the rows of their
+    previews are kept for it. If render_workers is more than one, the pages are rendered by the pool and then written. As
+    with generate_leaderboard_html, unchanged pages may be skipped.
+    """
+    if self.render_workers > 1:
+      html_by_path = {
+        file_paths.html_path(name): html for name, html in self.generate_leaderboard_html(leaderboard_data).items()
+      }
+      file_system.write_files(html_by_path)
+      return list(html_by_path)
+    current_time = self.time_provider.get_current_time()
+    page_fingerprints = self.create_page_fingerprints(leaderboard_data, current_time)
+    html_leaderboard_cache = HtmlLeaderboardCache(leaderboard_data, current_time)
+    html_paths: list[str] = []
+    # Write leaderboard html
+    leaderboard_template = self.jinja_env.get_template("leaderboard.html.jinja")
+    for perf_type in PerfType.all_except_unknown():
+      html_path = file_paths.html_path(perf_type.to_string())
+      html = self.get_unchanged_html(page_fingerprints, leaderboard_data, perf_type)
+      if html is not None:
+        file_system.write_file(html_path, html)
+      else:
+        leaderboard = HtmlLeaderboard.from_rows(perf_type, html_leaderboard_cache.stream_rows(perf_type))
+        with file_system.open_file_writer(html_path) as file:
+          file.writelines(
+            leaderboard_template.generate(
+              main_frame=MainFrame.from_perf_type(perf_type, current_time), leaderboard=leaderboard
+            )
+          )
+      html_paths.append(html_path)
+    # Write index html
+    html_path = file_paths.html_path("index")
+    html = self.get_unchanged_html(page_fingerprints, leaderboard_data, None)
+    if html is not None:
+      file_system.write_file(html_path, html)
+    else:
+      with file_system.open_file_writer(html_path) as file:
+        file.writelines(
+          self.jinja_env.get_template("index.html.jinja").generate(
+            self.get_index_context(html_leaderboard_cache, current_time)
+          )
+        )
+    html_paths.append(html_path)
+    if page_fingerprints is not None:
+      page_fingerprints.save()
+    return html_paths
@@ -0,0 +1,162 @@
+"""Functions for finding the pages whose html would not change if they were rendered again.
+
+A page only depends on the rows it shows, the fields of their bots' profiles, the ages and last seen times of those bots (which
+are formatted in whole months and hours), the templates, and the time it was last updated. The fingerprint of a page is a hash
+of everything but the last updated time, and is saved with the time the page was last updated. If a page has the same
+fingerprint as when it was last written, its html is the html of the file with only the last updated time replaced.
+"""
+
+import dataclasses
+import hashlib
+import json
+from collections.abc import Callable, Iterable, Mapping
+
+from jinja2 import Environment
+
+from src.leaderboard.chrono import date_formatter, duration_formatter
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.li.pert_type import PerfType
+
+
+# Increase when the conversion of the rows to html changes, so that every page is rendered again
+FINGERPRINT_VERSION = 1
+FINGERPRINT_DIGEST_SIZE = 16
+# The text around the last updated time in the footer of every page
+LAST_UPDATED_PREFIX = "Last Updated: "
+LAST_UPDATED_SUFFIX = " UTC"
+
+
+@dataclasses.dataclass
+class SavedFingerprints:
+  """The fingerprint of each page, keyed by page name, and the last updated time which was written in the pages."""
+
+  last_updated_date: str = ""
+  fingerprints_by_name: dict[str, str] = dataclasses.field(default_factory=dict[str, str])
+
+
+def load_saved_fingerprints(file_system: FileSystem) -> SavedFingerprints:
+  """Load the fingerprints saved when the pages were last written, or none if they were not saved."""
+  file_str = file_system.read_file(file_paths.html_fingerprints_path())
+  if not file_str:
+    return SavedFingerprints()
+  json_dict = json.loads(file_str)
+  return SavedFingerprints(json_dict["last_updated_date"], json_dict["fingerprints_by_name"])
+
+
+def save_fingerprints(file_system: FileSystem, saved_fingerprints: SavedFingerprints) -> None:
+  """Save the fingerprints of the pages which have been written."""
+  file_system.write_file(file_paths.html_fingerprints_path(), json.dumps(dataclasses.asdict(saved_fingerprints), indent=2))
+
+
+def get_templates_digest(environment: Environment) -> bytes:
+  """Return a hash of the source of every template, so that the pages are rendered again when a template changes."""
+  hasher = hashlib.blake2b(str(FINGERPRINT_VERSION).encode("utf-8"), digest_size=FINGERPRINT_DIGEST_SIZE)
+  if environment.loader is not None:
+    for template_name in sorted(environment.loader.list_templates()):
+      source, _, _ = environment.loader.get_source(environment, template_name)
+      hasher.update(template_name.encode("utf-8"))
+      hasher.update(source.encode("utf-8"))
+  return hasher.digest()
+
+
+def get_profile_fields(profile: BotProfile, current_time: int) -> bytes:
+  """Return everything about the bot which is shown in its rows, with its age and last seen time as they are formatted."""
+  profile_fields = (
+    profile.name,
+    profile.flag,
+    profile.new,
+    profile.online,
+    profile.patron,
+    duration_formatter.format_age(profile.created, current_time),
+    duration_formatter.format_last_seen(profile.last_seen, current_time),
+  )
+  return repr(profile_fields).encode("utf-8")
+
+
+def create_fingerprint(
+  templates_digest: bytes,
+  rows_by_perf_type: Mapping[PerfType, Iterable[LeaderboardRow]],
+  get_bot_profile_fields: Callable[[str], bytes],
+) -> str:
+  """Return a hash of the rows shown on a page, keyed by perf type, and of the shown fields of their bots' profiles."""
+  hasher = hashlib.blake2b(templates_digest, digest_size=FINGERPRINT_DIGEST_SIZE)
+  for perf_type, rows in rows_by_perf_type.items():
+    hasher.update(perf_type.to_string().encode("utf-8"))
+    for row in rows:
+      perf = row.perf
+      rank_info = row.rank_info
+      row_fields = (
+        perf.rating,
+        perf.rd,
+        perf.games,
+        rank_info.rank,
+        rank_info.delta_rank,
+        rank_info.delta_rating,
+        rank_info.delta_games,
+      )
+      hasher.update(get_bot_profile_fields(row.name))
+      hasher.update(repr(row_fields).encode("utf-8"))
+  return hasher.hexdigest()
+
+
+def replace_last_updated_date(html: str, last_updated_date: str, new_last_updated_date: str) -> str | None:
+  """Return the html with its last updated time replaced, or None if the html was not last updated at last_updated_date."""
+  # The footer is at the end of the page, so it is found from the end
+  start = html.rfind(LAST_UPDATED_PREFIX)
+  if start < 0:
+    return None
+  start += len(LAST_UPDATED_PREFIX)
+  end = html.find(LAST_UPDATED_SUFFIX, start)
+  if end < 0 or html[start:end] != last_updated_date:
+    return None
+  return html[:start] + new_last_updated_date + html[end:]
+
+
+class PageFingerprints:
+  """The fingerprints of the pages of one generation of the html, and of the pages which were last written."""
+
+  def __init__(
+    self, file_system: FileSystem, templates_digest: bytes, bot_profiles_by_name: dict[str, BotProfile], current_time: int
+  ) -> None:
+    """Load the saved fingerprints, to be compared with the pages of the current time."""
+    self.file_system = file_system
+    self.templates_digest = templates_digest
+    self.bot_profiles_by_name = bot_profiles_by_name
+    self.current_time = current_time
+    self.saved_fingerprints = load_saved_fingerprints(file_system)
+    self.fingerprints = SavedFingerprints(date_formatter.format_yyyy_mm_dd_hh_mm_ss(current_time))
+    # Most bots are on several pages, so the shown fields of each profile are only formatted once
+    self.profile_fields_by_name: dict[str, bytes] = {}
+
+  def get_bot_profile_fields(self, name: str) -> bytes:
+    """Return the shown fields of the profile of the bot with the name, formatting them the first time."""
+    profile_fields = self.profile_fields_by_name.get(name)
+    if profile_fields is None:
+      profile_fields = get_profile_fields(self.bot_profiles_by_name[name], self.current_time)
+      self.profile_fields_by_name[name] = profile_fields
+    return profile_fields
+
+  def add_fingerprint(self, name: str, rows_by_perf_type: Mapping[PerfType, Iterable[LeaderboardRow]]) -> str:
+    """Create and return the fingerprint of the page, which is saved with the fingerprints of the other pages."""
+    fingerprint = create_fingerprint(self.templates_digest, rows_by_perf_type, self.get_bot_profile_fields)
+    self.fingerprints.fingerprints_by_name[name] = fingerprint
+    return fingerprint
+
+  def get_unchanged_html(self, name: str, rows_by_perf_type: Mapping[PerfType, Iterable[LeaderboardRow]]) -> str | None:
+    """Return the html of the page with the current last updated time, or None if the page has to be rendered.
+
+    The page has to be rendered if its fingerprint has changed, or if its file was not written with the saved fingerprints.
+    """
+    fingerprint = self.add_fingerprint(name, rows_by_perf_type)
+    if fingerprint != self.saved_fingerprints.fingerprints_by_name.get(name):
+      return None
+    html = self.file_system.read_file(file_paths.html_path(name))
+    if not html:
+      return None
+    return replace_last_updated_date(html, self.saved_fingerprints.last_updated_date, self.fingerprints.last_updated_date)
+
+  def save(self) -> None:
+    """Save the fingerprints of the pages, so that the next generation can find the pages which have not changed."""
+    save_fingerprints(self.file_system, self.fingerprints)
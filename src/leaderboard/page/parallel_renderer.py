@@ -0,0 +1,132 @@
+"""Functions for rendering the leaderboard html with a pool of worker processes.
+
+Each page only depends on the rows that it shows and on the profiles of their bots, so the pages are rendered in parallel.
+Each worker is sent the fields of those rows and profiles as plain tuples, which are cheap to send, and renders the page
+with the same HtmlGenerator methods as when the pages are rendered one at a time, so the html is exactly the same.
+"""
+
+import functools
+import itertools
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.page.html_generator import MAX_RANK_FOR_PREVIEW, HtmlGenerator, HtmlLeaderboardCache
+
+
+# The name, rating, rd, prog, games, prov, rank, delta_rank, delta_rating, delta_games, peak_rank, peak_rating, and last_played
+# of a LeaderboardRow
+RowFields = tuple[str, int, int, int, int, bool, int, int, int, int, int, int, int]
+# The name, flair, flag, created, last_seen, patron, tos_violation, new, and online of a BotProfile
+ProfileFields = tuple[str, str, str, int, int, bool, bool, bool, bool]
+# The rows shown on a page (keyed by PerfType value) and the profiles of their bots
+PageData = tuple[dict[int, list[RowFields]], list[ProfileFields]]
+
+
+def create_page_data(
+  leaderboard_data: LeaderboardDataResult, rows_by_perf_type: Mapping[PerfType, Iterable[LeaderboardRow]]
+) -> PageData:
+  """Return the fields of the rows, leaving out the rows of bots which are not eligible, and of the profiles of their bots."""
+  row_fields_by_perf_type_value: dict[int, list[RowFields]] = {}
+  profile_fields_by_name: dict[str, ProfileFields] = {}
+  for perf_type, rows in rows_by_perf_type.items():
+    row_fields: list[RowFields] = []
+    for row in rows:
+      # The rank is set to zero when the bot is not eligible for the leaderboard
+      if not row.rank_info.rank:
+        continue
+      perf = row.perf
+      rank_info = row.rank_info
+      row_fields.append(
+        (
+          row.name,
+          perf.rating,
+          perf.rd,
+          perf.prog,
+          perf.games,
+          perf.prov,
+          rank_info.rank,
+          rank_info.delta_rank,
+          rank_info.delta_rating,
+          rank_info.delta_games,
+          rank_info.peak_rank,
+          rank_info.peak_rating,
+          rank_info.last_played,
+        )
+      )
+      if row.name not in profile_fields_by_name:
+        profile = leaderboard_data.bot_profiles_by_name[row.name]
+        profile_fields_by_name[row.name] = (
+          profile.name,
+          profile.flair,
+          profile.flag,
+          profile.created,
+          profile.last_seen,
+          profile.patron,
+          profile.tos_violation,
+          profile.new,
+          profile.online,
+        )
+    row_fields_by_perf_type_value[perf_type.value] = row_fields
+  return row_fields_by_perf_type_value, list(profile_fields_by_name.values())
+
+
+def create_leaderboard_data(page_data: PageData) -> LeaderboardDataResult:
+  """Convert the fields of a page's rows and profiles back into leaderboard data."""
+  row_fields_by_perf_type_value, profile_fields = page_data
+  return LeaderboardDataResult.create_result(
+    {fields[0]: BotProfile(*fields) for fields in profile_fields},
+    {
+      PerfType(perf_type_value): [
+        LeaderboardRow(name, LeaderboardPerf(rating, rd, prog, games, prov), RankInfo(*rank_info))
+        for name, rating, rd, prog, games, prov, *rank_info in row_fields
+      ]
+      for perf_type_value, row_fields in row_fields_by_perf_type_value.items()
+    },
+  )
+
+
+@functools.cache
+def get_html_generator() -> HtmlGenerator:
+  """Return a generator which is reused for every page rendered by the current process.
+
+  The time is passed to each render rather than taken from the generator's time provider.
+  """
+  return HtmlGenerator(FixedTimeProvider(0))
+
+
+def load_templates() -> None:
+  """Load the templates when a worker starts, so that they are compiled before the first page is sent to it."""
+  get_html_generator().load_templates()
+
+
+def render_page(perf_type_value: int | None, page_data: PageData, current_time: int) -> str:
+  """Render the leaderboard of the perf type, or the index if the perf type value is None."""
+  html_generator = get_html_generator()
+  html_leaderboard_cache = HtmlLeaderboardCache(create_leaderboard_data(page_data), current_time)
+  if perf_type_value is None:
+    return html_generator.render_index_html(html_leaderboard_cache, current_time)
+  return html_generator.render_leaderboard_html(html_leaderboard_cache, PerfType(perf_type_value), current_time)
+
+
+def render_leaderboard_html(leaderboard_data: LeaderboardDataResult, current_time: int, max_workers: int) -> dict[str, str]:
+  """Render the index and each leaderboard with a pool of max_workers processes and return the html keyed by page name."""
+  perf_types = list(PerfType.all_except_unknown())
+  ranked_rows_by_perf_type = leaderboard_data.ranked_rows_by_perf_type
+  # The index only shows the rows up to the first one outside of the top ranks
+  preview_rows_by_perf_type = {
+    perf_type: itertools.takewhile(
+      lambda row: row.rank_info.rank <= MAX_RANK_FOR_PREVIEW, ranked_rows_by_perf_type.get(perf_type, [])
+    )
+    for perf_type in perf_types
+  }
+  with ProcessPoolExecutor(max_workers=max_workers, initializer=load_templates) as executor:
+    index_page_data = create_page_data(leaderboard_data, preview_rows_by_perf_type)
+    futures_by_name = {"index": executor.submit(render_page, None, index_page_data, current_time)}
+    for perf_type in perf_types:
+      page_data = create_page_data(leaderboard_data, {perf_type: ranked_rows_by_perf_type.get(perf_type, [])})
+      futures_by_name[perf_type.to_string()] = executor.submit(render_page, perf_type.value, page_data, current_time)
+    return {name: future.result() for name, future in futures_by_name.items()}
@@ -0,0 +1,133 @@
+"""Write compressed copies of the leaderboard html next to each file, for a web server to send as they are.
+
+A server which supports precompressed files (such as nginx with gzip_static) sends index.html.gz in place of index.html to a
+browser which accepts gzip, so the pages are compressed once when they are generated rather than on every request.
+
+A copy is only compressed again when its file has changed, which is found by decompressing the existing copy. Decompressing
+is fast and the copies are replaced atomically, so an existing copy is always a whole one.
+"""
+
+import dataclasses
+import gzip
+import typing
+from collections.abc import Callable
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+
+
+# Compressing the pages at the highest gzip level takes about a second, which is worth it for files that are served many times
+GZIP_LEVEL = 9
+# Brotli qualities 10 and 11 make the pages about 15% smaller than quality 9, but are about 75 times slower. Every page has a
+# last updated date, so every page is compressed on every run.
+BROTLI_QUALITY = 9
+
+
+class BrotliModule(typing.Protocol):
+  """The parts of the optional brotli module which are used, which has no type stubs."""
+
+  MODE_TEXT: int
+
+  def compress(self, string: bytes, mode: int, quality: int) -> bytes:
+    """Return the bytes compressed with brotli."""
+    ...
+
+  def decompress(self, string: bytes) -> bytes:
+    """Return the bytes decompressed with brotli."""
+    ...
+
+
+@dataclasses.dataclass(frozen=True)
+class Encoding:
+  """A content encoding which the files are compressed with."""
+
+  name: str
+  # Appended to the file name of the compressed copy
+  extension: str
+  compress: Callable[[bytes], bytes]
+  decompress: Callable[[bytes], bytes]
+
+  def get_path(self, file_name: str) -> str:
+    """Return the path of the file's compressed copy."""
+    return f"{file_name}.{self.extension}"
+
+
+@dataclasses.dataclass
+class PrecompressionCounts:
+  """The files which were compressed, or skipped because their compressed copies were up to date, and their sizes."""
+
+  files_compressed: int = 0
+  files_unchanged: int = 0
+  original_bytes: int = 0
+  compressed_bytes_by_encoding: dict[str, int] = dataclasses.field(default_factory=dict[str, int])
+
+  def get_ratio(self, encoding_name: str) -> float:
+    """Return the size of the compressed copies as a fraction of the size of the files."""
+    return self.compressed_bytes_by_encoding.get(encoding_name, 0) / self.original_bytes if self.original_bytes else 0.0
+
+
+def compress_gzip(contents: bytes) -> bytes:
+  """Return the contents compressed with gzip.
+
+  The timestamp is left out of the gzip header, so that the same contents are always compressed to the same bytes.
+  """
+  return gzip.compress(contents, GZIP_LEVEL, mtime=0)
+
+
+GZIP_ENCODING = Encoding("gzip", "gz", compress_gzip, gzip.decompress)
+
+
+def get_available_encodings() -> list[Encoding]:
+  """Return the gzip encoding, and the brotli encoding if brotli is installed."""
+  try:
+    import brotli as brotli_module  # pyright: ignore[reportMissingImports, reportMissingTypeStubs]
+  except ImportError:
+    return [GZIP_ENCODING]
+  brotli = typing.cast(BrotliModule, brotli_module)  # We need to cast because brotli has no type stubs
+
+  def compress_brotli(contents: bytes) -> bytes:
+    """Return the contents compressed with brotli."""
+    return brotli.compress(contents, brotli.MODE_TEXT, BROTLI_QUALITY)
+
+  return [GZIP_ENCODING, Encoding("brotli", "br", compress_brotli, brotli.decompress)]
+
+
+def get_static_file_paths() -> list[str]:
+  """Return the files of the leaderboard html which are not generated but are worth compressing.
+
+  The fonts are left out because woff and woff2 files are already compressed.
+  """
+  return [file_paths.stylesheet_path()]
+
+
+def precompress_files(
+  file_system: FileSystem, file_contents_by_name: dict[str, bytes], encodings: list[Encoding]
+) -> PrecompressionCounts:
+  """Write a compressed copy of each file in each encoding, unless the existing copy already has the same contents."""
+  counts = PrecompressionCounts(compressed_bytes_by_encoding={encoding.name: 0 for encoding in encodings})
+  for file_name, file_contents in file_contents_by_name.items():
+    counts.original_bytes += len(file_contents)
+    is_unchanged = True
+    for encoding in encodings:
+      compressed_path = encoding.get_path(file_name)
+      compressed_contents = file_system.read_binary_file(compressed_path)
+      if not compressed_contents or encoding.decompress(compressed_contents) != file_contents:
+        compressed_contents = encoding.compress(file_contents)
+        file_system.write_binary_file(compressed_path, compressed_contents)
+        is_unchanged = False
+      counts.compressed_bytes_by_encoding[encoding.name] += len(compressed_contents)
+    if is_unchanged:
+      counts.files_unchanged += 1
+    else:
+      counts.files_compressed += 1
+  return counts
+
+
+def precompress_leaderboard_html(file_system: FileSystem, html_by_path: dict[str, str]) -> PrecompressionCounts:
+  """Write compressed copies of the generated pages, keyed by path, and of the static files in every available encoding."""
+  file_contents_by_name = {path: html.encode("utf-8") for path, html in html_by_path.items()}
+  for static_file_path in get_static_file_paths():
+    static_file_contents = file_system.read_binary_file(static_file_path)
+    if static_file_contents:
+      file_contents_by_name[static_file_path] = static_file_contents
+  return precompress_files(file_system, file_contents_by_name, get_available_encodings())
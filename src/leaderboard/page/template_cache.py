@@ -0,0 +1,30 @@
+"""A cache of compiled Jinja templates which is saved through a FileSystem.
+
+Jinja compiles each template from source into python bytecode the first time that it is loaded. With the cache the bytecode is
+saved, so a later run loads it without lexing, parsing or compiling the template again. Each template is saved under the
+hash of its name, and the saved bytecode is only used if the hash of the template's source and the python version both match,
+so a template is compiled again whenever it is edited.
+"""
+
+from jinja2.bccache import Bucket, BytecodeCache
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+
+
+class TemplateBytecodeCache(BytecodeCache):
+  """A Jinja bytecode cache which saves each template's bytecode in a file under .cache/templates/."""
+
+  def __init__(self, file_system: FileSystem) -> None:
+    """Initialize a cache which is loaded from and saved to the file system."""
+    self.file_system = file_system
+
+  def load_bytecode(self, bucket: Bucket) -> None:
+    """Load the saved bytecode of the bucket's template, which the bucket discards if its source has changed."""
+    bytecode = self.file_system.read_binary_file(file_paths.template_cache_path(bucket.key))
+    if bytecode:
+      bucket.bytecode_from_string(bytecode)
+
+  def dump_bytecode(self, bucket: Bucket) -> None:
+    """Save the bytecode of a template which has just been compiled."""
+    self.file_system.write_binary_file(file_paths.template_cache_path(bucket.key), bucket.bytecode_to_string())
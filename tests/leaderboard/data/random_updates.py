@@ -0,0 +1,59 @@
+"""Functions for creating random leaderboard updates which exercise the edge cases of ranking."""
+
+import random
+
+from src.leaderboard.chrono.durations import TWO_WEEKS
+from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.leaderboard_update import (
+  CurrentBotPerfOnlyUpdate,
+  FullUpdate,
+  LeaderboardUpdate,
+  PreviousRowOnlyUpdate,
+)
+from tests.leaderboard.chrono.epoch_seconds import DATE_2025_04_01
+
+
+# A few names which differ only by case so that the name tie breaks are used
+NAMES = ["Bot-A", "bot-a", "BOT-A", "Bot-B", "bot-b", "Bot-C", "ßot", "Ärger", "zed", "Zed"]
+# A small range of ratings (including zero) and rds so that there are many ties
+RATINGS = [0, 1500, 1500, 1600, 1700, 1700, 1700]
+RDS = [45, 45, 60]
+PROVISIONAL_PROBABILITY = 0.1
+TOS_VIOLATION_PROBABILITY = 0.05
+TIMES = [DATE_2025_04_01, DATE_2025_04_01 - TWO_WEEKS, DATE_2025_04_01 - TWO_WEEKS - 1, DATE_2025_04_01 - 10 * TWO_WEEKS]
+
+
+def create_random_perf(rng: random.Random) -> LeaderboardPerf:
+  """Create a perf with values from a small range."""
+  return LeaderboardPerf(rng.choice(RATINGS), rng.choice(RDS), 0, rng.randrange(1, 4), rng.random() < PROVISIONAL_PROBABILITY)
+
+
+def create_random_updates(rng: random.Random, count: int) -> tuple[list[LeaderboardUpdate], dict[str, BotProfile]]:
+  """Create a random mix of updates along with the profiles of the bots."""
+  updates: list[LeaderboardUpdate] = []
+  bot_profiles_by_name: dict[str, BotProfile] = {}
+  for index in range(count):
+    name = f"{rng.choice(NAMES)}-{index // 3}"
+    bot_profiles_by_name[name] = BotProfile(
+      name,
+      "",
+      "",
+      rng.choice(TIMES),
+      rng.choice(TIMES),
+      False,
+      rng.random() < TOS_VIOLATION_PROBABILITY,
+      False,
+      False,
+    )
+    previous_row = LeaderboardRow(
+      name, create_random_perf(rng), RankInfo(rng.randrange(0, count), 0, 0, 0, rng.randrange(0, count), 0, rng.choice(TIMES))
+    )
+    current_bot_perf = BotPerf(name, create_random_perf(rng))
+    update_type = rng.randrange(3)
+    if update_type == 0:
+      updates.append(PreviousRowOnlyUpdate(previous_row))
+    elif update_type == 1:
+      updates.append(CurrentBotPerfOnlyUpdate(current_bot_perf))
+    else:
+      updates.append(FullUpdate(previous_row, current_bot_perf))
+  return updates, bot_profiles_by_name
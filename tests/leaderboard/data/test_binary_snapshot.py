@@ -0,0 +1,68 @@
+"""Tests for binary_snapshot.py."""
+
+import unittest
+
+from src.leaderboard.data.binary_snapshot import BinarySnapshot, encode_snapshot
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2024_04_01, DATE_2025_04_01
+
+
+BOT_1_PROFILE = BotProfile("Bot-1", "symbols.robot", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False)
+BOT_2_PROFILE = BotProfile("Bøt-2", "", "", DATE_2024_04_01, DATE_2024_04_01, False, True, False, False)
+BOT_1_ROW_BULLET = LeaderboardRow(
+  "Bot-1", LeaderboardPerf(3000, 45, -12, 1000, False), RankInfo(1, 2, -30, 5, 1, 3050, DATE_2025_04_01)
+)
+BOT_2_ROW_BULLET = LeaderboardRow(
+  "Bøt-2", LeaderboardPerf(1500, 350, 0, 3, True), RankInfo(0, 0, 0, 0, 0, 1500, DATE_2024_04_01)
+)
+BOT_1_ROW_BLITZ = LeaderboardRow(
+  "Bot-1", LeaderboardPerf(2500, 60, 7, 200, False), RankInfo(1, -1, 7, 2, 1, 2600, DATE_2025_04_01)
+)
+
+
+def create_snapshot() -> BinarySnapshot:
+  """Encode and then open a snapshot of two bots."""
+  rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET], PerfType.BLITZ: [BOT_1_ROW_BLITZ]}
+  return BinarySnapshot.from_buffer(memoryview(encode_snapshot([BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type)))
+
+
+class TestBinarySnapshot(unittest.TestCase):
+  """Tests for BinarySnapshot."""
+
+  def test_round_trip(self) -> None:
+    binary_snapshot = create_snapshot()
+    self.assertListEqual(list(binary_snapshot.bot_profiles), [BOT_1_PROFILE, BOT_2_PROFILE])
+    self.assertListEqual(list(binary_snapshot.rows_by_perf_type), [PerfType.BULLET, PerfType.BLITZ])
+    self.assertListEqual(list(binary_snapshot.rows_by_perf_type[PerfType.BULLET]), [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET])
+    self.assertListEqual(list(binary_snapshot.rows_by_perf_type[PerfType.BLITZ]), [BOT_1_ROW_BLITZ])
+
+  def test_empty(self) -> None:
+    binary_snapshot = BinarySnapshot.from_buffer(memoryview(encode_snapshot([], {PerfType.BULLET: []})))
+    self.assertEqual(len(binary_snapshot.bot_profiles), 0)
+    self.assertListEqual(list(binary_snapshot.rows_by_perf_type[PerfType.BULLET]), [])
+
+  def test_get_item(self) -> None:
+    bullet_rows = create_snapshot().rows_by_perf_type[PerfType.BULLET]
+    self.assertEqual(len(bullet_rows), 2)
+    self.assertEqual(bullet_rows[1], BOT_2_ROW_BULLET)
+    self.assertEqual(bullet_rows[-2], BOT_1_ROW_BULLET)
+    self.assertListEqual(bullet_rows[::-1], [BOT_2_ROW_BULLET, BOT_1_ROW_BULLET])
+    with self.assertRaises(IndexError):
+      bullet_rows[2]
+
+  def test_sequence_methods(self) -> None:
+    bullet_rows = create_snapshot().rows_by_perf_type[PerfType.BULLET]
+    self.assertEqual(bullet_rows.count(BOT_2_ROW_BULLET), 1)
+    self.assertEqual(bullet_rows.index(BOT_2_ROW_BULLET), 1)
+    self.assertIn(BOT_1_ROW_BULLET, bullet_rows)
+
+  def test_names_are_shared(self) -> None:
+    binary_snapshot = create_snapshot()
+    bot_1_name = binary_snapshot.bot_profiles[0].name
+    self.assertIs(binary_snapshot.rows_by_perf_type[PerfType.BULLET][0].name, bot_1_name)
+    self.assertIs(binary_snapshot.rows_by_perf_type[PerfType.BLITZ][0].name, bot_1_name)
+
+  def test_invalid_snapshot(self) -> None:
+    with self.assertRaises(ValueError):
+      BinarySnapshot.from_buffer(memoryview(b"[\n  {}\n]\n\0\0\0\0"))
@@ -0,0 +1,26 @@
+"""Tests for bot_id_registry.py."""
+
+import unittest
+
+from src.leaderboard.data.bot_id_registry import BotIdRegistry
+
+
+class TestBotIdRegistry(unittest.TestCase):
+  """Tests for BotIdRegistry."""
+
+  def test_get_id(self) -> None:
+    bot_id_registry = BotIdRegistry(["Bot-2", "Bot-1"])
+    self.assertEqual(bot_id_registry.get_id("Bot-2"), 0)
+    self.assertEqual(bot_id_registry.get_id("Bot-1"), 1)
+    self.assertEqual(bot_id_registry.get_id("Bot-3"), 2)
+    self.assertEqual(bot_id_registry.get_id("Bot-3"), 2)
+    self.assertEqual(len(bot_id_registry), 3)
+    self.assertListEqual(bot_id_registry.names, ["Bot-2", "Bot-1", "Bot-3"])
+
+  def test_get_name(self) -> None:
+    bot_id_registry = BotIdRegistry(["Bot-2", "Bot-1"])
+    self.assertEqual(bot_id_registry.get_name(0), "Bot-2")
+    self.assertEqual(bot_id_registry.get_name(1), "Bot-1")
+
+  def test_duplicate_names(self) -> None:
+    self.assertListEqual(BotIdRegistry(["Bot-1", "Bot-1", "bot-1"]).names, ["Bot-1", "bot-1"])
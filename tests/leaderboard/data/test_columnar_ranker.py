@@ -0,0 +1,41 @@
+"""Tests for columnar_ranker.py."""
+
+import importlib.util
+import random
+import unittest
+
+from src.leaderboard.data import data_generator
+from tests.leaderboard.chrono.epoch_seconds import DATE_2025_04_01
+from tests.leaderboard.data.random_updates import create_random_updates
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class TestColumnarRanker(unittest.TestCase):
+  """Tests for columnar_ranker functions."""
+
+  def test_create_ranked_rows_empty(self) -> None:
+    from src.leaderboard.data import columnar_ranker
+
+    self.assertListEqual(columnar_ranker.create_ranked_rows([], {}, DATE_2025_04_01), [])
+
+  def test_create_ranked_rows_matches_python(self) -> None:
+    from src.leaderboard.data import columnar_ranker
+
+    rng = random.Random(7)  # noqa: S311 (not used for cryptography)
+    for count in [1, 2, 3, 10, 100, 1000]:
+      for _ in range(5):
+        updates, bot_profiles_by_name = create_random_updates(rng, count)
+        self.assertListEqual(
+          columnar_ranker.create_ranked_rows(updates, bot_profiles_by_name, DATE_2025_04_01),
+          data_generator.create_ranked_rows(updates, bot_profiles_by_name, DATE_2025_04_01),
+        )
+
+  def test_get_create_ranked_rows(self) -> None:
+    from src.leaderboard.data import columnar_ranker
+
+    self.assertIs(
+      data_generator.get_create_ranked_rows(data_generator.RankingEngine.NUMPY), columnar_ranker.create_ranked_rows
+    )
+    self.assertIs(
+      data_generator.get_create_ranked_rows(data_generator.RankingEngine.PYTHON), data_generator.create_ranked_rows
+    )
@@ -1,14 +1,23 @@
 """Tests for data_generator.py."""
 
+import dataclasses
 import json
+import random
 import unittest
 
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
 from src.leaderboard.data import data_generator as data_generator_functions
-from src.leaderboard.data.data_generator import DataGenerator
+from src.leaderboard.data.binary_snapshot import SnapshotTable
+from src.leaderboard.data.data_generator import DataFormat, DataGenerator, DataGeneratorOptions
 from src.leaderboard.data.leaderboard_objects import BotPerf, BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
-from src.leaderboard.data.leaderboard_update import CurrentBotPerfOnlyUpdate, LeaderboardUpdate
+from src.leaderboard.data.leaderboard_update import (
+  CurrentBotPerfOnlyUpdate,
+  FullUpdate,
+  LeaderboardUpdate,
+  PreviousRowOnlyUpdate,
+)
 from src.leaderboard.fs import file_paths
+from src.leaderboard.li.json_bot_user_decoder import JsonBotUserDecoder
 from src.leaderboard.li.pert_type import PerfType
 from tests.leaderboard.chrono.epoch_seconds import (
   DATE_2021_04_01,
@@ -17,6 +26,7 @@ from tests.leaderboard.chrono.epoch_seconds import (
   DATE_2024_04_01,
   DATE_2025_04_01,
 )
+from tests.leaderboard.data.random_updates import create_random_updates
 from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
 from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
 
@@ -108,6 +118,14 @@ def remove_whitespace(whitespace_str: str) -> str:
   return whitespace_str.replace(" ", "").replace("\n", "")
 
 
+def load_leaderboard_lists(
+  file_system: InMemoryFileSystem, data_format: DataFormat
+) -> tuple[dict[str, BotProfile], dict[PerfType, list[LeaderboardRow]]]:
+  """Load the leaderboard data with the rows of each perf type in a list, so that the formats can be compared."""
+  bot_profiles_by_name, rows_by_perf_type = data_generator_functions.load_leaderboard_data(file_system, data_format)
+  return bot_profiles_by_name, {perf_type: list(rows) for perf_type, rows in rows_by_perf_type.items()}
+
+
 class TestDataGeneratorFunctions(unittest.TestCase):
   """Tests for data_generator functions."""
 
@@ -139,10 +157,69 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     self.assertListEqual(previous_rows_by_perf_type[PerfType.BULLET], [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET])
     self.assertListEqual(previous_rows_by_perf_type[PerfType.BLITZ], [BOT_2_ROW_BLITZ, BOT_1_ROW_BLITZ])
 
+  def test_load_leaderboard_data_binary_falls_back_to_json(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file(file_paths.bot_profiles_path(), json.dumps([BOT_1_PROFILE.as_dict()]))
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), json.dumps([BOT_1_ROW_BULLET.as_dict()]))
+    bot_profiles_by_name, previous_rows_by_perf_type = data_generator_functions.load_leaderboard_data(
+      file_system, DataFormat.BINARY
+    )
+    self.assertListEqual(list(bot_profiles_by_name), ["Bot-1"])
+    self.assertListEqual(list(previous_rows_by_perf_type[PerfType.BULLET]), [BOT_1_ROW_BULLET])
+
+  def test_load_leaderboard_data_binary_decodes_rows_lazily(self) -> None:
+    file_system = InMemoryFileSystem()
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]}
+    data_generator_functions.save_leaderboard_data(
+      file_system, DataFormat.BINARY, [BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type, DATE_2025_04_01
+    )
+    _, previous_rows_by_perf_type = data_generator_functions.load_leaderboard_data(file_system, DataFormat.BINARY)
+    self.assertIsInstance(previous_rows_by_perf_type[PerfType.BULLET], SnapshotTable)
+    self.assertEqual(previous_rows_by_perf_type[PerfType.BULLET][1], BOT_2_ROW_BULLET)
+
+  def test_save_and_load_leaderboard_data(self) -> None:
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET], PerfType.BLITZ: [BOT_2_ROW_BLITZ]}
+    for data_format in DataFormat:
+      file_system = InMemoryFileSystem()
+      data_generator_functions.save_leaderboard_data(
+        file_system, data_format, [BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type, DATE_2025_04_01
+      )
+      bot_profiles_by_name, previous_rows_by_perf_type = data_generator_functions.load_leaderboard_data(
+        file_system, data_format
+      )
+      # When loading the bot profiles new and online are set to false
+      self.assertDictEqual(
+        bot_profiles_by_name,
+        {
+          "Bot-1": dataclasses.replace(BOT_1_PROFILE, new=False, online=False),
+          "Bot-2": dataclasses.replace(BOT_2_PROFILE, new=False, online=False),
+        },
+      )
+      self.assertEqual(len(previous_rows_by_perf_type), 13)
+      self.assertListEqual(list(previous_rows_by_perf_type[PerfType.BULLET]), [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET])
+      self.assertListEqual(list(previous_rows_by_perf_type[PerfType.BLITZ]), [BOT_2_ROW_BLITZ])
+      self.assertListEqual(list(previous_rows_by_perf_type[PerfType.RAPID]), [])
+
+  def test_convert_leaderboard_data(self) -> None:
+    file_system = InMemoryFileSystem()
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]}
+    data_generator_functions.save_leaderboard_data(
+      file_system, DataFormat.JSON, [BOT_1_PROFILE], rows_by_perf_type, DATE_2025_04_01
+    )
+    json_data = load_leaderboard_lists(file_system, DataFormat.JSON)
+    data_generator_functions.convert_leaderboard_data(file_system, DataFormat.JSON, DataFormat.BINARY, DATE_2025_04_01)
+    self.assertIsNotNone(data_generator_functions.load_binary_snapshot(file_system))
+    self.assertTupleEqual(load_leaderboard_lists(file_system, DataFormat.BINARY), json_data)
+    data_generator_functions.convert_leaderboard_data(file_system, DataFormat.BINARY, DataFormat.SQLITE, DATE_2025_04_01)
+    self.assertTupleEqual(load_leaderboard_lists(file_system, DataFormat.SQLITE), json_data)
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), "[]")
+    data_generator_functions.convert_leaderboard_data(file_system, DataFormat.SQLITE, DataFormat.JSON, DATE_2025_04_01)
+    self.assertTupleEqual(load_leaderboard_lists(file_system, DataFormat.JSON), json_data)
+
   def test_get_online_bot_info(self) -> None:
     lichess_client = FakeLichessClient()
     lichess_client.set_online_bots("\n".join([remove_whitespace(BOT_1_CURRENT_JSON), remove_whitespace(BOT_2_CURRENT_JSON)]))
-    bot_info = data_generator_functions.get_online_bot_info(lichess_client)
+    bot_info = data_generator_functions.get_online_bot_info(lichess_client, JsonBotUserDecoder())
     self.assertDictEqual(bot_info.bot_profiles_by_name, {"Bot-1": BOT_1_CURRENT_PROFILE, "Bot-2": BOT_2_CURRENT_PROFILE})
     expected_bot_perfs_by_perf_type = {
       PerfType.BULLET: [BOT_1_CURRENT_PERF_BULLET, BOT_2_CURRENT_PERF_BULLET],
@@ -155,17 +232,54 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     lichess_client.set_online_bots(
       """{ "username": "Bot-1", "perfs": { "bullet": { "games": 1000 }, "blitz": { "rating": 1500, "prov": true } } }"""
     )
-    bot_info = data_generator_functions.get_online_bot_info(lichess_client)
+    bot_info = data_generator_functions.get_online_bot_info(lichess_client, JsonBotUserDecoder())
     self.assertListEqual(list(bot_info.bot_profiles_by_name.keys()), ["Bot-1"])
     self.assertListEqual(list(bot_info.bot_perfs_by_perf_type.keys()), [PerfType.BULLET])
 
   def test_get_online_bot_info_no_games_played(self) -> None:
     lichess_client = FakeLichessClient()
     lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 1500, "prov": true } } }""")
-    bot_info = data_generator_functions.get_online_bot_info(lichess_client)
+    bot_info = data_generator_functions.get_online_bot_info(lichess_client, JsonBotUserDecoder())
     self.assertDictEqual(bot_info.bot_profiles_by_name, {})
     self.assertDictEqual(bot_info.bot_perfs_by_perf_type, {})
 
+  def test_get_offline_bot_info(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.add_user(remove_whitespace(BOT_2_CURRENT_JSON))
+    # A bot whose name no longer matches the known profile exactly is not refreshed
+    lichess_client.add_user('{"username": "BOT-3", "perfs": {"bullet": {"games": 10, "rating": 2000}}}')
+    offline_profiles = [BOT_1_PROFILE, BOT_2_PROFILE, BOT_3_PROFILE]
+    bot_info = data_generator_functions.get_offline_bot_info(
+      lichess_client, JsonBotUserDecoder(), offline_profiles, DataGeneratorOptions(offline_bot_request_interval=0)
+    )
+    offline_bot_2_profile = BotProfile("Bot-2", "", "", DATE_2022_04_01, DATE_2025_04_01, False, False, False, False)
+    self.assertDictEqual(bot_info.bot_profiles_by_name, {"Bot-2": offline_bot_2_profile})
+    expected_bot_perfs_by_perf_type = {
+      PerfType.BULLET: [BOT_2_CURRENT_PERF_BULLET],
+      PerfType.BLITZ: [BOT_2_CURRENT_PERF_BLITZ],
+    }
+    self.assertDictEqual(bot_info.bot_perfs_by_perf_type, expected_bot_perfs_by_perf_type)
+    self.assertListEqual(lichess_client.get_users_calls, [["bot-1", "bot-2", "bot-3"]])
+
+  def test_get_offline_bot_info_most_recently_seen_first(self) -> None:
+    lichess_client = FakeLichessClient()
+    offline_profiles = [
+      BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2023_04_01, False, False, False, False),
+      BotProfile("Bot-2", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, False),
+      BotProfile("Bot-3", "", "", DATE_2021_04_01, DATE_2024_04_01, False, False, False, False),
+    ]
+    options = DataGeneratorOptions(max_offline_bots=2, offline_bot_request_interval=0)
+    data_generator_functions.get_offline_bot_info(lichess_client, JsonBotUserDecoder(), offline_profiles, options)
+    self.assertListEqual(lichess_client.get_users_calls, [["bot-2", "bot-3"]])
+
+  def test_merge_bot_perfs(self) -> None:
+    online_bot_perfs_by_perf_type = {PerfType.BULLET: [BOT_1_PERF_BULLET]}
+    offline_bot_perfs_by_perf_type = {PerfType.BULLET: [BOT_2_PERF_BULLET], PerfType.BLITZ: [BOT_2_CURRENT_PERF_BLITZ]}
+    self.assertDictEqual(
+      data_generator_functions.merge_bot_perfs(online_bot_perfs_by_perf_type, offline_bot_perfs_by_perf_type),
+      {PerfType.BULLET: [BOT_1_PERF_BULLET, BOT_2_PERF_BULLET], PerfType.BLITZ: [BOT_2_CURRENT_PERF_BLITZ]},
+    )
+
   def test_merge_bot_profiles(self) -> None:
     previous_profiles_by_name = {"Bot-1": BOT_1_PROFILE}
     current_profiles_by_name = {"Bot-1": BOT_1_CURRENT_PROFILE}
@@ -184,11 +298,44 @@ class TestDataGeneratorFunctions(unittest.TestCase):
     ]
     self.assertCountEqual(updates, expected_updates)
 
+  def test_iter_updates(self) -> None:
+    previous_rows = [BOT_2_ROW_BULLET, BOT_1_ROW_BULLET]
+    current_bot_perfs = [BOT_3_PERF_BULLET, BOT_2_PERF_BULLET, BOT_2_CURRENT_PERF_BULLET]
+    expected_updates = [
+      PreviousRowOnlyUpdate(BOT_1_ROW_BULLET),
+      # Like a dict keyed by name, the last perf for a bot is used
+      FullUpdate(BOT_2_ROW_BULLET, BOT_2_CURRENT_PERF_BULLET),
+      CurrentBotPerfOnlyUpdate(BOT_3_PERF_BULLET),
+    ]
+    self.assertListEqual(list(data_generator_functions.iter_updates(previous_rows, current_bot_perfs)), expected_updates)
+    self.assertListEqual(list(data_generator_functions.iter_updates([], [])), [])
+
+  def test_create_ranked_rows_from_iter_updates(self) -> None:
+    current_bot_perfs = [BOT_2_PERF_BULLET, BOT_1_PERF_BULLET]
+    updates = data_generator_functions.iter_updates([], current_bot_perfs)
+    leaderboard_rows = data_generator_functions.create_ranked_rows(updates, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    self.assertListEqual([row.name for row in leaderboard_rows], ["Bot-1", "Bot-2"])
+
   def test_create_sort_key(self) -> None:
     bot_names = ["BOT-4", "Bot-2", "Bot-5", "bot-3", "bot-1", "Bot-4", "Bot-1"]
     sorted_bot_names = sorted(bot_names, key=lambda name: data_generator_functions.name_sort_key(name))
     self.assertListEqual(sorted_bot_names, ["Bot-1", "bot-1", "Bot-2", "bot-3", "BOT-4", "Bot-4", "Bot-5"])
 
+  def test_profile_index(self) -> None:
+    bot_profiles_by_name = BOT_PROFILES_BY_NAME | {"bot-1": BOT_1_PROFILE}
+    profile_index = data_generator_functions.ProfileIndex.create(bot_profiles_by_name, DATE_2025_04_01)
+    self.assertDictEqual(profile_index.eligible_by_name, dict.fromkeys(bot_profiles_by_name, True))
+    updates, _ = create_random_updates(random.Random(19), 1000)  # noqa: S311 (not used for cryptography)
+    # Use bots with the same created time and names which only differ by case to test every tie break
+    for update in updates:
+      if update.get_name() not in bot_profiles_by_name:
+        bot_profiles_by_name[update.get_name()] = BOT_1_PROFILE
+    profile_index = data_generator_functions.ProfileIndex.create(bot_profiles_by_name, DATE_2025_04_01)
+    self.assertListEqual(
+      sorted(updates, key=profile_index.get_sort_key),
+      sorted(updates, key=lambda update: data_generator_functions.create_sort_key(update, bot_profiles_by_name)),
+    )
+
   def test_create_ranked_rows(self) -> None:
     updates: list[LeaderboardUpdate] = [
       CurrentBotPerfOnlyUpdate(BOT_2_PERF_BULLET),
@@ -300,3 +447,30 @@ class TestDataGenerator(unittest.TestCase):
       BOT_2_CURRENT_PROFILE.create_updated_copy_for_for_merge(),
     ]
     self.assertEqual(leaderboard_data.get_bot_profiles_sorted(), expected_bot_profiles)
+
+  def test_refresh_offline_bots(self) -> None:
+    file_system = InMemoryFileSystem()
+
+    bullet_leaderboard_json = [BOT_1_ROW_BULLET.as_dict(), BOT_2_ROW_BULLET.as_dict()]
+    file_system.write_file(file_paths.data_path(PerfType.BULLET), json.dumps(bullet_leaderboard_json))
+
+    bot_profiles_json = [BOT_1_PROFILE.as_dict(), BOT_2_PROFILE.as_dict()]
+    file_system.write_file(file_paths.bot_profiles_path(), json.dumps(bot_profiles_json))
+
+    # Only Bot-1 is online but Bot-2 can still be looked up
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(remove_whitespace(BOT_1_CURRENT_JSON))
+    lichess_client.add_user(remove_whitespace(BOT_2_CURRENT_JSON))
+
+    time_provider = FixedTimeProvider(DATE_2025_04_01)
+    options = DataGeneratorOptions(refresh_offline_bots=True, offline_bot_request_interval=0)
+
+    data_generator = DataGenerator(file_system, lichess_client, time_provider, options)
+    leaderboard_data = data_generator.generate_leaderboard_data()
+
+    self.assertListEqual(lichess_client.get_users_calls, [["bot-2"]])
+    ranked_rows = leaderboard_data.get_ranked_rows_sorted()[PerfType.BULLET]
+    self.assertListEqual([row.perf for row in ranked_rows], [BOT_1_CURRENT_PERF_BULLET.perf, BOT_2_CURRENT_PERF_BULLET.perf])
+    bot_2_profile = next(profile for profile in leaderboard_data.get_bot_profiles_sorted() if profile.name == "Bot-2")
+    self.assertFalse(bot_2_profile.online)
+    self.assertFalse(bot_2_profile.new)
@@ -0,0 +1,90 @@
+"""Tests for json_serializer.py."""
+
+import json
+import random
+import unittest
+
+from src.leaderboard.data import json_serializer
+from src.leaderboard.data.json_serializer import COMPACT_LAYOUT
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2025_04_01
+
+
+# Names which need escaping
+NAMES = ["Bot-1", "Bøt-2", 'Bot "3"', "Bot\\4", "Bot\t5", "🤖", ""]
+FLAIRS = ["", "symbols.robot", "activity.lichess-berserk"]
+FLAGS = ["", "_earth", "GB"]
+TIMES = [0, DATE_2021_04_01, DATE_2025_04_01]
+VALUES = [0, 1, -1, 1500, -250]
+TRUE_PROBABILITY = 0.5
+PROFILE_COUNT = 200
+ROW_COUNT = 200
+
+
+def create_random_bot_profiles(rng: random.Random) -> list[BotProfile]:
+  """Create profiles where each field has its default value some of the time."""
+  return [
+    BotProfile(
+      rng.choice(NAMES),
+      rng.choice(FLAIRS),
+      rng.choice(FLAGS),
+      rng.choice(TIMES),
+      rng.choice(TIMES),
+      rng.random() < TRUE_PROBABILITY,
+      rng.random() < TRUE_PROBABILITY,
+      rng.random() < TRUE_PROBABILITY,
+      rng.random() < TRUE_PROBABILITY,
+    )
+    for _ in range(PROFILE_COUNT)
+  ]
+
+
+def choose_value(rng: random.Random) -> int:
+  """Return one of the values, which is the default value of zero more often than the others."""
+  return rng.choice([0, 0, *VALUES])
+
+
+def create_random_rows(rng: random.Random) -> list[LeaderboardRow]:
+  """Create rows where each field, and every field of the perf or rank info, has its default value some of the time."""
+  rows: list[LeaderboardRow] = []
+  for _ in range(ROW_COUNT):
+    perf = LeaderboardPerf(
+      choose_value(rng), choose_value(rng), choose_value(rng), choose_value(rng), rng.random() < TRUE_PROBABILITY
+    )
+    rank_info = RankInfo(
+      choose_value(rng),
+      choose_value(rng),
+      choose_value(rng),
+      choose_value(rng),
+      choose_value(rng),
+      choose_value(rng),
+      rng.choice(TIMES),
+    )
+    rows.append(LeaderboardRow(rng.choice(NAMES), perf, rank_info))
+  return rows
+
+
+class TestJsonSerializer(unittest.TestCase):
+  """Tests for json_serializer functions."""
+
+  def test_encode_bot_profiles(self) -> None:
+    bot_profiles = create_random_bot_profiles(random.Random(0))  # noqa: S311 (not used for cryptography)
+    bot_profile_dicts = [bot_profile.as_dict() for bot_profile in bot_profiles]
+    self.assertEqual(json_serializer.encode_bot_profiles(bot_profiles), json.dumps(bot_profile_dicts, indent=2))
+    self.assertEqual(
+      json_serializer.encode_bot_profiles(bot_profiles, COMPACT_LAYOUT), json.dumps(bot_profile_dicts, separators=(",", ":"))
+    )
+
+  def test_encode_leaderboard_rows(self) -> None:
+    rows = create_random_rows(random.Random(0))  # noqa: S311 (not used for cryptography)
+    row_dicts = [row.as_dict() for row in rows]
+    self.assertEqual(json_serializer.encode_leaderboard_rows(rows), json.dumps(row_dicts, indent=2))
+    self.assertEqual(
+      json_serializer.encode_leaderboard_rows(rows, COMPACT_LAYOUT), json.dumps(row_dicts, separators=(",", ":"))
+    )
+
+  def test_encode_defaults(self) -> None:
+    default_row = LeaderboardRow("", LeaderboardPerf(0, 0, 0, 0, False), RankInfo(0, 0, 0, 0, 0, 0, 0))
+    self.assertEqual(json_serializer.encode_leaderboard_rows([]), "[]")
+    self.assertEqual(json_serializer.encode_leaderboard_rows([default_row]), "[\n  {}\n]")
+    self.assertEqual(json_serializer.encode_leaderboard_rows([default_row], COMPACT_LAYOUT), "[{}]")
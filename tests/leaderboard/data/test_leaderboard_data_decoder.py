@@ -0,0 +1,86 @@
+"""Tests for leaderboard_data_decoder.py and its implementations."""
+
+import importlib.util
+import json
+import random
+import unittest
+
+from src.leaderboard.data import json_serializer
+from src.leaderboard.data.json_leaderboard_data_decoder import JsonLeaderboardDataDecoder
+from src.leaderboard.data.json_serializer import COMPACT_LAYOUT
+from src.leaderboard.data.leaderboard_data_decoder import LeaderboardDataDecoder, create_leaderboard_data_decoder
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardRow
+from tests.leaderboard.data.test_json_serializer import create_random_bot_profiles, create_random_rows
+
+
+MSGSPEC_INSTALLED = importlib.util.find_spec("msgspec") is not None
+
+# Lists where fields, including whole objects, are missing or where fields are not used
+BOT_PROFILES_JSON = """[
+  {},
+  { "name": "Bot-1" },
+  { "name": "Bot-2", "flair": "symbols.robot", "patron": true, "new": true, "online": true },
+  { "name": "Bot-3", "flag": "GB", "created": 1617235200, "last_seen": 1743465600, "tos_violation": true, "bio": "hello" }
+]"""
+LEADERBOARD_ROWS_JSON = """[
+  {},
+  { "name": "Bot-1" },
+  { "name": "Bot-2", "perf": { "rating": 1500, "prov": true } },
+  { "name": "Bot-3", "rank_info": { "rank": 1, "peak_rating": 2000, "last_played": 1743465600 }, "unused": [] },
+  { "name": "Bot-4", "perf": {}, "rank_info": {} }
+]"""
+
+
+class DecoderTestCase(unittest.TestCase):
+  """Checks that a decoder produces the same objects as BotProfile.from_dict and LeaderboardRow.from_dict."""
+
+  def assert_matches_from_dict(self, decoder: LeaderboardDataDecoder) -> None:
+    rng = random.Random(0)  # noqa: S311 (not used for cryptography)
+    bot_profiles = create_random_bot_profiles(rng)
+    rows = create_random_rows(rng)
+    bot_profiles_json_strs = [
+      BOT_PROFILES_JSON,
+      json_serializer.encode_bot_profiles(bot_profiles),
+      json_serializer.encode_bot_profiles(bot_profiles, COMPACT_LAYOUT),
+      "[]",
+    ]
+    for json_str in bot_profiles_json_strs:
+      with self.subTest(json_str=json_str[:100]):
+        expected_bot_profiles = [BotProfile.from_dict(json_dict) for json_dict in json.loads(json_str)]
+        self.assertListEqual(decoder.decode_bot_profiles(json_str), expected_bot_profiles)
+    leaderboard_rows_json_strs = [
+      LEADERBOARD_ROWS_JSON,
+      json_serializer.encode_leaderboard_rows(rows),
+      json_serializer.encode_leaderboard_rows(rows, COMPACT_LAYOUT),
+      "[]",
+    ]
+    for json_str in leaderboard_rows_json_strs:
+      with self.subTest(json_str=json_str[:100]):
+        expected_rows = [LeaderboardRow.from_dict(json_dict) for json_dict in json.loads(json_str)]
+        self.assertListEqual(decoder.decode_leaderboard_rows(json_str), expected_rows)
+
+
+class TestJsonLeaderboardDataDecoder(DecoderTestCase):
+  """Tests for JsonLeaderboardDataDecoder."""
+
+  def test_decode(self) -> None:
+    self.assert_matches_from_dict(JsonLeaderboardDataDecoder())
+
+
+@unittest.skipUnless(MSGSPEC_INSTALLED, "msgspec is not installed")
+class TestMsgspecLeaderboardDataDecoder(DecoderTestCase):
+  """Tests for MsgspecLeaderboardDataDecoder."""
+
+  def test_decode(self) -> None:
+    from src.leaderboard.data.msgspec_leaderboard_data_decoder import MsgspecLeaderboardDataDecoder
+
+    self.assert_matches_from_dict(MsgspecLeaderboardDataDecoder())
+
+
+class TestLeaderboardDataDecoderFunctions(unittest.TestCase):
+  """Tests for leaderboard_data_decoder functions."""
+
+  def test_create_leaderboard_data_decoder(self) -> None:
+    decoder = create_leaderboard_data_decoder()
+    expected_decoder_name = "MsgspecLeaderboardDataDecoder" if MSGSPEC_INSTALLED else "JsonLeaderboardDataDecoder"
+    self.assertEqual(type(decoder).__name__, expected_decoder_name)
@@ -93,3 +93,12 @@ class TestLeaderboardRow(unittest.TestCase):
       "Bot1", LeaderboardPerf(1500, 12, 34, 100, True), RankInfo(4, 1, 50, 10, 3, 1600, DATE_2025_04_01)
     )
     self.assertEqual(LeaderboardRow.from_dict(leaderboard_row.as_dict()), leaderboard_row)
+
+  def test_slots(self) -> None:
+    leaderboard_row = LeaderboardRow(
+      "Bot1", LeaderboardPerf(1500, 12, 34, 100, True), RankInfo(4, 1, 50, 10, 3, 1600, DATE_2025_04_01)
+    )
+    # The rows are slotted so that they do not each carry a __dict__
+    self.assertFalse(hasattr(leaderboard_row, "__dict__"))
+    self.assertFalse(hasattr(leaderboard_row.perf, "__dict__"))
+    self.assertFalse(hasattr(leaderboard_row.rank_info, "__dict__"))
@@ -45,6 +45,15 @@ class TestLeaderboardUpdate(unittest.TestCase):
     expected_row = LeaderboardRow("Bot 1", previous_bot_perf.perf, RankInfo(2, 3, 0, 0, 2, 1500, DATE_2025_04_01))
     self.assertEqual(update.to_leaderboard_row(2, DATE_2025_04_01), expected_row)
 
+  def test_row_only_update_unchanged(self) -> None:
+    previous_bot_perf = create_bot_perf("Bot 1", 1500, 100, 45)
+    previous_row = LeaderboardRow("Bot 1", previous_bot_perf.perf, RankInfo(2, 0, 0, 0, 2, 1500, DATE_2025_04_01))
+    update = PreviousRowOnlyUpdate(previous_row)
+    self.assertIs(update.to_leaderboard_row(2, DATE_2025_04_01), previous_row)
+    self.assertEqual(update.to_leaderboard_row(3, DATE_2025_04_01).rank_info, RankInfo(3, -1, 0, 0, 2, 1500, DATE_2025_04_01))
+    ineligible_row = LeaderboardRow("Bot 1", previous_bot_perf.perf, RankInfo(0, 0, 0, 0, 0, 1500, DATE_2024_04_01))
+    self.assertIs(PreviousRowOnlyUpdate(ineligible_row).to_leaderboard_row(0, DATE_2025_04_01), ineligible_row)
+
   def test_bot_perf_only_update(self) -> None:
     previous_bot_perf = create_bot_perf("Bot 1", 1500, 100, 45)
     update = CurrentBotPerfOnlyUpdate(previous_bot_perf)
@@ -64,6 +73,8 @@ class TestLeaderboardUpdate(unittest.TestCase):
     self.assertEqual(update.get_rating(), 1600)
     self.assertEqual(update.get_rd(), 60)
     self.assertTrue(update.is_eligible(DATE_2025_04_01))
+    self.assertEqual(update.delta_games, 20)
+    self.assertTupleEqual(update.get_delta_games_and_last_played(DATE_2025_04_01), (20, DATE_2025_04_01))
     expected_row = LeaderboardRow("Bot 1", current_bot_perf.perf, RankInfo(1, 4, 100, 20, 1, 1600, DATE_2025_04_01))
     self.assertEqual(update.to_leaderboard_row(1, DATE_2025_04_01), expected_row)
 
@@ -74,3 +85,9 @@ class TestLeaderboardUpdate(unittest.TestCase):
     update = FullUpdate(previous_row, previous_bot_perf)
     expected_row = LeaderboardRow("Bot 1", previous_bot_perf.perf, RankInfo(6, -1, 0, 0, 5, 1500, DATE_2024_04_01))
     self.assertEqual(update.to_leaderboard_row(6, DATE_2025_04_01), expected_row)
+
+  def test_slots(self) -> None:
+    bot_perf = create_bot_perf("Bot 1", 1800, 400, 45)
+    bot_row = LeaderboardRow("Bot 1", bot_perf.perf, RankInfo(1, 0, 0, 0, 1, 1800, DATE_2025_04_01))
+    for update in [FullUpdate(bot_row, bot_perf), PreviousRowOnlyUpdate(bot_row), CurrentBotPerfOnlyUpdate(bot_perf)]:
+      self.assertFalse(hasattr(update, "__dict__"))
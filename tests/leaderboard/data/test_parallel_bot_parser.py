@@ -0,0 +1,64 @@
+"""Tests for parallel_bot_parser.py."""
+
+import json
+import unittest
+
+from src.leaderboard.data import data_generator, parallel_bot_parser
+from src.leaderboard.li.json_bot_user_decoder import JsonBotUserDecoder
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+
+
+def create_bot_lines(count: int) -> list[str]:
+  """Create lines of ndjson where some bots have not played any games."""
+  lines: list[str] = []
+  for index in range(count):
+    perfs = {"bullet": {"games": index % 3, "rating": 2000 + index}, "atomic": {"games": index, "rating": 1500, "prov": True}}
+    bot = {"username": f"Bot-{index}", "createdAt": 1712000000000, "seenAt": 1743500000000 + index, "perfs": perfs}
+    lines.append(json.dumps(bot))
+  return lines
+
+
+class TestParallelBotParser(unittest.TestCase):
+  """Tests for parallel_bot_parser functions."""
+
+  def test_iter_chunks(self) -> None:
+    lines = ["aaaa", "bbbb", "cccc", "dddd", "eeee"]
+    self.assertListEqual(list(parallel_bot_parser.iter_chunks(lines, 10)), ["aaaa\nbbbb", "cccc\ndddd", "eeee"])
+    self.assertListEqual(list(parallel_bot_parser.iter_chunks(lines, 1000)), ["aaaa\nbbbb\ncccc\ndddd\neeee"])
+    self.assertListEqual(list(parallel_bot_parser.iter_chunks([], 10)), [])
+
+  def test_parse_chunk(self) -> None:
+    profile_fields, perf_fields_by_perf_type_value = parallel_bot_parser.parse_chunk(
+      JsonBotUserDecoder, "\n".join(create_bot_lines(2))
+    )
+    # Bot-0 has not played any games
+    self.assertListEqual(profile_fields, [("Bot-1", "", "", 1712000000, 1743500000, False, False)])
+    self.assertDictEqual(
+      perf_fields_by_perf_type_value,
+      {PerfType.BULLET.value: [("Bot-1", 2001, 0, 0, 1, False)], PerfType.ATOMIC.value: [("Bot-1", 1500, 0, 0, 1, True)]},
+    )
+
+  def test_parse_online_bots_matches_serial(self) -> None:
+    lichess_client = FakeLichessClient()
+    lines = create_bot_lines(200)
+    lichess_client.set_online_bots("\n".join(lines))
+    serial_bot_info = data_generator.get_online_bot_info(lichess_client, JsonBotUserDecoder())
+    # A small chunk size makes sure the lines are split between the workers
+    for chunk_size in [1000, 1_000_000]:
+      bot_profiles_by_name, bot_perfs_by_perf_type = parallel_bot_parser.parse_online_bots(
+        lines, JsonBotUserDecoder, 2, chunk_size
+      )
+      self.assertListEqual(list(bot_profiles_by_name.items()), list(serial_bot_info.bot_profiles_by_name.items()))
+      self.assertListEqual(list(bot_perfs_by_perf_type.items()), list(serial_bot_info.bot_perfs_by_perf_type.items()))
+
+  def test_parse_online_bots_empty(self) -> None:
+    bot_profiles_by_name, bot_perfs_by_perf_type = parallel_bot_parser.parse_online_bots([], JsonBotUserDecoder, 2)
+    self.assertDictEqual(bot_profiles_by_name, {})
+    self.assertDictEqual(bot_perfs_by_perf_type, {})
+
+  def test_get_online_bot_info_with_parse_workers(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots("\n".join(create_bot_lines(10)))
+    serial_bot_info = data_generator.get_online_bot_info(lichess_client, JsonBotUserDecoder())
+    self.assertEqual(data_generator.get_online_bot_info(lichess_client, JsonBotUserDecoder(), 2), serial_bot_info)
@@ -0,0 +1,155 @@
+"""Tests for rating_history.py."""
+
+import dataclasses
+import lzma
+import unittest
+from unittest import mock
+
+from src.leaderboard.data import rating_history as rating_history_functions
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.rating_history import CHUNK_GENERATIONS, HistoryRecord, RatingHistory
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2024_04_01, DATE_2025_04_01
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BOT_1_PROFILE = BotProfile("Bot-1", "", "", DATE_2021_04_01, DATE_2025_04_01, False, False, False, True)
+BOT_2_PROFILE = BotProfile("Bot-2", "", "", DATE_2024_04_01, DATE_2024_04_01, False, False, False, False)
+BOT_PROFILES_BY_NAME = {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE}
+
+BOT_1_ROW_BULLET = LeaderboardRow("Bot-1", LeaderboardPerf(3000, 45, 0, 1000, False), RankInfo(1, 0, 0, 0, 1, 3000, 0))
+BOT_2_ROW_BULLET = LeaderboardRow("Bot-2", LeaderboardPerf(2900, 60, 0, 800, False), RankInfo(0, 0, 0, 0, 0, 2900, 0))
+BOT_2_ROW_BLITZ = LeaderboardRow("Bot-2", LeaderboardPerf(1500, 350, 0, 3, True), RankInfo(0, 0, 0, 0, 0, 1500, 0))
+
+BOT_1_MOVED_ROW_BULLET = dataclasses.replace(BOT_1_ROW_BULLET, perf=LeaderboardPerf(3010, 44, 10, 1001, False))
+ROWS_BY_PERF_TYPE = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET], PerfType.BLITZ: [BOT_2_ROW_BLITZ]}
+MOVED_ROWS_BY_PERF_TYPE = {PerfType.BULLET: [BOT_1_MOVED_ROW_BULLET, BOT_2_ROW_BULLET], PerfType.BLITZ: [BOT_2_ROW_BLITZ]}
+
+
+class TestRatingHistoryFunctions(unittest.TestCase):
+  """Tests for rating_history functions."""
+
+  def test_encode_and_decode_sealed_chunk(self) -> None:
+    records = [(0, DATE_2024_04_01, 0, 3000, 45, 1000, 1, True), (1, DATE_2025_04_01, 1, 2900, 60, 800, 0, False)]
+    sealed_chunk = rating_history_functions.encode_sealed_chunk(records)
+    self.assertListEqual(rating_history_functions.decode_sealed_chunk(sealed_chunk), records)
+
+  def test_decode_sealed_chunk_bot(self) -> None:
+    records = [
+      (0, DATE_2024_04_01, 1, 2900, 60, 800, 0, False),
+      (0, DATE_2024_04_01, 0, 3000, 45, 1000, 1, True),
+      (1, DATE_2025_04_01, 1, 2910, 59, 801, 0, False),
+      (1, DATE_2025_04_01, 2, 1500, 350, 3, 0, False),
+    ]
+    sealed_chunk = rating_history_functions.encode_sealed_chunk(records)
+    # The records are sealed in bot ID order
+    self.assertListEqual(rating_history_functions.decode_sealed_chunk(sealed_chunk), [records[1], records[0], *records[2:]])
+    self.assertListEqual(rating_history_functions.decode_sealed_chunk_bot(sealed_chunk, 1), [records[0], records[2]])
+    self.assertListEqual(rating_history_functions.decode_sealed_chunk_bot(sealed_chunk, 3), [])
+
+  def test_decode_open_chunk_bot(self) -> None:
+    records = [(0, DATE_2024_04_01, 1, 2900, 60, 800, 0, False), (0, DATE_2024_04_01, 0, 3000, 45, 1000, 1, True)]
+    open_chunk = b"".join(rating_history_functions.RECORD_STRUCT.pack(*record) for record in records)
+    self.assertListEqual(rating_history_functions.decode_open_chunk(open_chunk), records)
+    self.assertListEqual(rating_history_functions.decode_open_chunk(open_chunk, 0), [records[1]])
+
+  def test_decode_sealed_chunk_invalid(self) -> None:
+    open_chunk = rating_history_functions.RECORD_STRUCT.pack(0, DATE_2024_04_01, 0, 3000, 45, 1000, 1, True)
+    with self.assertRaises(ValueError):
+      rating_history_functions.decode_sealed_chunk(lzma.compress(open_chunk))
+
+
+class TestRatingHistory(unittest.TestCase):
+  """Tests for RatingHistory."""
+
+  def test_append_only_changed_rows(self) -> None:
+    rating_history = RatingHistory(InMemoryFileSystem())
+    self.assertEqual(rating_history.append(0, DATE_2024_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME), 3)
+    self.assertEqual(rating_history.append(1, DATE_2025_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME), 0)
+    self.assertEqual(rating_history.append(2, DATE_2025_04_01, MOVED_ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME), 1)
+    # Going offline is a change too
+    offline_profiles_by_name = BOT_PROFILES_BY_NAME | {"Bot-1": dataclasses.replace(BOT_1_PROFILE, online=False)}
+    self.assertEqual(rating_history.append(3, DATE_2025_04_01, MOVED_ROWS_BY_PERF_TYPE, offline_profiles_by_name), 1)
+    self.assertListEqual(
+      rating_history.scan_bot(0),
+      [
+        HistoryRecord(0, DATE_2024_04_01, 0, PerfType.BULLET, 3000, 45, 1000, 1, True),
+        HistoryRecord(2, DATE_2025_04_01, 0, PerfType.BULLET, 3010, 44, 1001, 1, True),
+        HistoryRecord(3, DATE_2025_04_01, 0, PerfType.BULLET, 3010, 44, 1001, 1, False),
+      ],
+    )
+
+  def test_register_bots(self) -> None:
+    file_system = InMemoryFileSystem()
+    rating_history = RatingHistory(file_system)
+    rating_history.register_bots({PerfType.BULLET: [BOT_2_ROW_BULLET]})
+    rating_history.register_bots(ROWS_BY_PERF_TYPE)
+    # The IDs are saved with the history
+    self.assertListEqual(RatingHistory(file_system).bot_id_registry.names, ["Bot-2", "Bot-1"])
+
+  def test_scan_bot(self) -> None:
+    rating_history = RatingHistory(InMemoryFileSystem())
+    rating_history.append(0, DATE_2024_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    self.assertListEqual(rating_history.bot_id_registry.names, ["Bot-1", "Bot-2"])
+    self.assertListEqual(
+      rating_history.scan_bot(1),
+      [
+        HistoryRecord(0, DATE_2024_04_01, 1, PerfType.BULLET, 2900, 60, 800, 0, False),
+        HistoryRecord(0, DATE_2024_04_01, 1, PerfType.BLITZ, 1500, 350, 3, 0, False),
+      ],
+    )
+    self.assertListEqual(rating_history.scan_bot(2), [])
+
+  def test_seal_chunk(self) -> None:
+    file_system = InMemoryFileSystem()
+    rating_history = RatingHistory(file_system)
+    rating_history.append(0, DATE_2024_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    rating_history.append(1, DATE_2024_04_01, MOVED_ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    self.assertEqual(file_system.read_binary_file(file_paths.sealed_history_chunk_path(PerfType.BULLET, 0)), b"")
+    # The next chunk starts with a record of every row, whether or not it has changed
+    self.assertEqual(
+      rating_history.append(CHUNK_GENERATIONS, DATE_2025_04_01, MOVED_ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME),
+      3,
+    )
+    self.assertNotEqual(file_system.read_binary_file(file_paths.sealed_history_chunk_path(PerfType.BULLET, 0)), b"")
+    generations = [record.generation for record in rating_history.scan_perf_type(PerfType.BULLET)]
+    self.assertListEqual(generations, [0, 0, 1, CHUNK_GENERATIONS, CHUNK_GENERATIONS])
+    generations = [record.generation for record in rating_history.scan_perf_type(PerfType.BULLET, 1, CHUNK_GENERATIONS)]
+    self.assertListEqual(generations, [1])
+    generations = [record.generation for record in rating_history.scan_perf_type(PerfType.BULLET, CHUNK_GENERATIONS)]
+    self.assertListEqual(generations, [CHUNK_GENERATIONS, CHUNK_GENERATIONS])
+    # The bot's records are found in the sealed chunk and in the open chunk
+    generations = [record.generation for record in rating_history.scan_bot(0)]
+    self.assertListEqual(generations, [0, 1, CHUNK_GENERATIONS])
+    generations = [record.generation for record in rating_history.scan_bot(0, 1, CHUNK_GENERATIONS)]
+    self.assertListEqual(generations, [1])
+
+  def test_append_to_open_chunk(self) -> None:
+    file_system = InMemoryFileSystem()
+    rating_history = RatingHistory(file_system)
+    rating_history.append(0, DATE_2024_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    open_chunk_path = file_paths.open_history_chunk_path(PerfType.BULLET)
+    with mock.patch.object(file_system, "write_binary_file") as write_binary_file_mock:
+      rating_history.append(1, DATE_2024_04_01, MOVED_ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    # Only the new record is written
+    write_binary_file_mock.assert_not_called()
+    self.assertEqual(
+      len(file_system.read_binary_file(open_chunk_path) or b""), 3 * rating_history_functions.RECORD_STRUCT.size
+    )
+
+  def test_append_after_interrupted_append(self) -> None:
+    file_system = InMemoryFileSystem()
+    rating_history = RatingHistory(file_system)
+    rating_history.append(0, DATE_2024_04_01, ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    # Part of a record was written before the process died
+    file_system.append_binary_file(file_paths.open_history_chunk_path(PerfType.BULLET), b"\x01\x00")
+    self.assertEqual(len(rating_history.scan_perf_type(PerfType.BULLET)), 2)
+    rating_history.append(1, DATE_2024_04_01, MOVED_ROWS_BY_PERF_TYPE, BOT_PROFILES_BY_NAME)
+    generations = [record.generation for record in rating_history.scan_perf_type(PerfType.BULLET)]
+    self.assertListEqual(generations, [0, 0, 1])
+
+  def test_scan_empty(self) -> None:
+    rating_history = RatingHistory(InMemoryFileSystem())
+    self.assertListEqual(rating_history.scan_perf_type(PerfType.BULLET), [])
+    self.assertListEqual(rating_history.scan_bot(0), [])
@@ -0,0 +1,82 @@
+"""Tests for sqlite_store.py."""
+
+import dataclasses
+import sqlite3
+import unittest
+
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.data.sqlite_store import SqliteStore
+from src.leaderboard.li.pert_type import PerfType
+from tests.leaderboard.chrono.epoch_seconds import DATE_2021_04_01, DATE_2024_04_01, DATE_2025_04_01
+
+
+BOT_1_PROFILE = BotProfile("Bot-1", "symbols.robot", "_earth", DATE_2021_04_01, DATE_2025_04_01, True, False, False, False)
+BOT_2_PROFILE = BotProfile("Bot-2", "", "", DATE_2024_04_01, DATE_2024_04_01, False, True, False, False)
+
+BOT_1_ROW_BULLET = LeaderboardRow(
+  "Bot-1", LeaderboardPerf(3000, 45, -12, 1000, False), RankInfo(1, 2, -30, 5, 1, 3050, DATE_2025_04_01)
+)
+BOT_2_ROW_BULLET = LeaderboardRow(
+  "Bot-2", LeaderboardPerf(2900, 60, 0, 800, False), RankInfo(2, -1, 0, 0, 1, 2950, DATE_2025_04_01)
+)
+BOT_2_ROW_BLITZ = LeaderboardRow(
+  "Bot-2", LeaderboardPerf(1500, 350, 0, 3, True), RankInfo(0, 0, 0, 0, 0, 1500, DATE_2024_04_01)
+)
+
+
+def create_store() -> SqliteStore:
+  """Create a store of two bots in an in-memory database."""
+  sqlite_store = SqliteStore(sqlite3.connect(":memory:"))
+  rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET], PerfType.BLITZ: [BOT_2_ROW_BLITZ]}
+  sqlite_store.save([BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type, DATE_2024_04_01)
+  return sqlite_store
+
+
+class TestSqliteStore(unittest.TestCase):
+  """Tests for SqliteStore."""
+
+  def test_save_and_load(self) -> None:
+    sqlite_store = create_store()
+    self.assertEqual(sqlite_store.get_generation_count(), 1)
+    self.assertDictEqual(sqlite_store.load_bot_profiles(), {"Bot-1": BOT_1_PROFILE, "Bot-2": BOT_2_PROFILE})
+    rows_by_perf_type = sqlite_store.load_leaderboard_rows()
+    self.assertEqual(len(rows_by_perf_type), 13)
+    self.assertListEqual(rows_by_perf_type[PerfType.BULLET], [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET])
+    self.assertListEqual(rows_by_perf_type[PerfType.BLITZ], [BOT_2_ROW_BLITZ])
+    self.assertListEqual(rows_by_perf_type[PerfType.RAPID], [])
+
+  def test_save_only_changed_rows(self) -> None:
+    sqlite_store = create_store()
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET]}
+    self.assertEqual(sqlite_store.save([BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type, DATE_2025_04_01), 0)
+    moved_row = dataclasses.replace(BOT_2_ROW_BULLET, perf=LeaderboardPerf(3100, 50, 200, 810, False))
+    rows_by_perf_type = {PerfType.BULLET: [BOT_1_ROW_BULLET, moved_row]}
+    self.assertEqual(sqlite_store.save([BOT_1_PROFILE, BOT_2_PROFILE], rows_by_perf_type, DATE_2025_04_01), 1)
+    self.assertEqual(sqlite_store.get_generation_count(), 3)
+    # Rows which are not saved are left as they were
+    self.assertListEqual(sqlite_store.load_leaderboard_rows()[PerfType.BLITZ], [BOT_2_ROW_BLITZ])
+    self.assertEqual(sqlite_store.get_bot_rows("Bot-2")[PerfType.BULLET], moved_row)
+
+  def test_get_top_rows(self) -> None:
+    sqlite_store = create_store()
+    self.assertListEqual(sqlite_store.get_top_rows(PerfType.BULLET, 1), [BOT_1_ROW_BULLET])
+    self.assertListEqual(sqlite_store.get_top_rows(PerfType.BULLET, 10), [BOT_1_ROW_BULLET, BOT_2_ROW_BULLET])
+    # Unranked rows are not included
+    self.assertListEqual(sqlite_store.get_top_rows(PerfType.BLITZ, 10), [])
+
+  def test_get_bot_rows(self) -> None:
+    sqlite_store = create_store()
+    self.assertDictEqual(
+      sqlite_store.get_bot_rows("Bot-2"), {PerfType.BULLET: BOT_2_ROW_BULLET, PerfType.BLITZ: BOT_2_ROW_BLITZ}
+    )
+    self.assertDictEqual(sqlite_store.get_bot_rows("Bot-3"), {})
+
+  def test_get_row_history(self) -> None:
+    sqlite_store = create_store()
+    sqlite_store.save([], {PerfType.BULLET: [BOT_1_ROW_BULLET]}, DATE_2025_04_01)
+    moved_row = dataclasses.replace(BOT_1_ROW_BULLET, perf=LeaderboardPerf(3010, 40, 10, 1001, False))
+    sqlite_store.save([], {PerfType.BULLET: [moved_row]}, DATE_2025_04_01)
+    self.assertListEqual(
+      sqlite_store.get_row_history(PerfType.BULLET, "Bot-1"),
+      [(1, DATE_2024_04_01, 3000, 45, 1000, 1), (3, DATE_2025_04_01, 3010, 40, 1001, 1)],
+    )
@@ -1,6 +1,28 @@
 """Test implementation of FileSystem which saves and loads "files" in memory."""
 
-from src.leaderboard.fs.file_system import FileSystem
+import contextlib
+import io
+import sqlite3
+from collections.abc import Iterator
+from typing import BinaryIO, TextIO, TypeVar
+
+from src.leaderboard.fs.file_system import FileSystem, WriteCounts
+
+
+FileContentsT = TypeVar("FileContentsT", str, bytes)
+
+
+def copy_files(files: dict[str, FileContentsT], source_dir: str, destination_dir: str) -> None:
+  """Replace the files under destination_dir with copies of the files under source_dir."""
+  for file_name in [file_name for file_name in files if file_name.startswith(f"{destination_dir}/")]:
+    del files[file_name]
+  source_prefix = f"{source_dir}/"
+  copied_files = {
+    f"{destination_dir}/{file_name.removeprefix(source_prefix)}": file_contents
+    for file_name, file_contents in files.items()
+    if file_name.startswith(source_prefix)
+  }
+  files.update(copied_files)
 
 
 class InMemoryFileSystem(FileSystem):
@@ -9,6 +31,10 @@ class InMemoryFileSystem(FileSystem):
   def __init__(self) -> None:
     """Initialize a dict to represent the file system."""
     self.file_system: dict[str, str] = {}
+    self.binary_file_system: dict[str, bytes] = {}
+    self.write_counts = WriteCounts()
+    # An in-memory database lasts while any connection to it is open, so one connection to each is kept
+    self.database_connections: dict[str, sqlite3.Connection] = {}
 
   def read_file(self, file_name: str) -> str | None:
     """Load and return all of the contents of a file."""
@@ -16,4 +42,74 @@ class InMemoryFileSystem(FileSystem):
 
   def write_file(self, file_name: str, file_contents: str) -> None:
     """Save the contents to a file."""
+    self.count_write(self.file_system.get(file_name) != file_contents, len(file_contents.encode("utf-8")))
     self.file_system[file_name] = file_contents
+
+  def read_files(self, file_names: list[str]) -> dict[str, str | None]:
+    """Load and return all of the contents of several files, keyed by file name."""
+    return {file_name: self.read_file(file_name) for file_name in file_names}
+
+  def write_files(self, file_contents_by_name: dict[str, str]) -> None:
+    """Save the contents of several files, keyed by file name."""
+    for file_name, file_contents in file_contents_by_name.items():
+      self.write_file(file_name, file_contents)
+
+  @contextlib.contextmanager
+  def open_file_writer(self, file_name: str) -> Iterator[TextIO]:
+    """Open a writer for a file, and save what was written when the context exits without an exception."""
+    with io.StringIO() as file:
+      yield file
+      self.write_file(file_name, file.getvalue())
+
+  def iter_file_lines(self, file_name: str) -> Iterator[str]:
+    """Yield the lines of a file without their line endings."""
+    yield from self.file_system.get(file_name, "").splitlines()
+
+  def read_binary_file(self, file_name: str) -> bytes | None:
+    """Load and return all of the contents of a binary file."""
+    return self.binary_file_system.get(file_name, b"")
+
+  def write_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Save the contents to a binary file."""
+    self.count_write(self.binary_file_system.get(file_name) != file_contents, len(file_contents))
+    self.binary_file_system[file_name] = file_contents
+
+  @contextlib.contextmanager
+  def open_binary_file_writer(self, file_name: str) -> Iterator[BinaryIO]:
+    """Open a writer for a binary file, and save what was written when the context exits without an exception."""
+    with io.BytesIO() as file:
+      yield file
+      self.write_binary_file(file_name, file.getvalue())
+
+  def append_binary_file(self, file_name: str, file_contents: bytes) -> None:
+    """Add the contents to the end of a binary file, which is created if it does not exist."""
+    self.count_write(bool(file_contents), len(file_contents))
+    self.binary_file_system[file_name] = self.binary_file_system.get(file_name, b"") + file_contents
+
+  def map_binary_file(self, file_name: str) -> memoryview | None:
+    """Return a read-only view of the contents of a binary file."""
+    return memoryview(self.binary_file_system.get(file_name, b""))
+
+  def connect_database(self, file_name: str) -> sqlite3.Connection:
+    """Return a new connection to an in-memory SQLite database, which is shared by every connection with the same file name."""
+    # Databases are named by the file system too, so that each file system has its own
+    uri = f"file:{id(self)}/{file_name}?mode=memory&cache=shared"
+    if file_name not in self.database_connections:
+      self.database_connections[file_name] = sqlite3.connect(uri, uri=True)
+    return sqlite3.connect(uri, uri=True)
+
+  def copy_directory(self, source_dir: str, destination_dir: str) -> None:
+    """Replace the files under destination_dir with copies of the files under source_dir."""
+    copy_files(self.file_system, source_dir, destination_dir)
+    copy_files(self.binary_file_system, source_dir, destination_dir)
+
+  def count_write(self, was_written: bool, byte_count: int) -> None:
+    """Count a write, or a skipped write if the file already had the same contents, like RealFileSystem."""
+    if was_written:
+      self.write_counts.count_write(byte_count)
+    else:
+      self.write_counts.count_skip(byte_count)
+
+  def get_write_counts(self) -> WriteCounts:
+    """Return the files and bytes which have been written or skipped by write_file, open_file_writer, and write_binary_file."""
+    return self.write_counts
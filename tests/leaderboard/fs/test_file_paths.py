@@ -9,8 +9,39 @@ from src.leaderboard.li.pert_type import PerfType
 class TestFileFilePaths(unittest.TestCase):
   """Tests for file_paths."""
 
+  def test_binary_snapshot_path(self) -> None:
+    self.assertEqual(file_paths.binary_snapshot_path(), "leaderboard_data/snapshot.bin")
+
+  def test_bot_ids_path(self) -> None:
+    self.assertEqual(file_paths.bot_ids_path(), "leaderboard_data/history/bot_ids.json")
+
   def test_data_path(self) -> None:
     self.assertEqual(file_paths.data_path(PerfType.BULLET), "leaderboard_data/bullet.json")
 
+  def test_html_fingerprints_path(self) -> None:
+    self.assertEqual(file_paths.html_fingerprints_path(), "leaderboard_data/html_fingerprints.json")
+
   def test_html_path(self) -> None:
     self.assertEqual(file_paths.html_path("index"), "leaderboard_html/index.html")
+
+  def test_lichess_snapshot_path(self) -> None:
+    snapshot_path = file_paths.lichess_snapshot_path(1743500000, "online_bots.ndjson.gz")
+    self.assertEqual(snapshot_path, "lichess_snapshots/1743500000/online_bots.ndjson.gz")
+
+  def test_open_history_chunk_path(self) -> None:
+    self.assertEqual(file_paths.open_history_chunk_path(PerfType.BULLET), "leaderboard_data/history/bullet/open.bin")
+
+  def test_replay_dir(self) -> None:
+    self.assertEqual(file_paths.replay_dir(1743500000), "lichess_snapshots/1743500000/replay")
+
+  def test_sealed_history_chunk_path(self) -> None:
+    self.assertEqual(file_paths.sealed_history_chunk_path(PerfType.BULLET, 3), "leaderboard_data/history/bullet/00003.bin.xz")
+
+  def test_sqlite_store_path(self) -> None:
+    self.assertEqual(file_paths.sqlite_store_path(), "leaderboard_data/leaderboard.sqlite3")
+
+  def test_stylesheet_path(self) -> None:
+    self.assertEqual(file_paths.stylesheet_path(), "leaderboard_html/css/style.css")
+
+  def test_template_cache_path(self) -> None:
+    self.assertEqual(file_paths.template_cache_path("0123abcd"), ".cache/templates/0123abcd.cache")
@@ -1,12 +1,16 @@
 """Tests for file_system.py."""
 
+import contextlib
+import sqlite3
 import unittest
 
+from src.leaderboard.fs.file_system import WriteCounts
 from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
 
 
 FILE_NAME = "test"
 FILE_LINES = "1\n2\n3"
+FILE_BYTES = b"\x1f\x8b\x00"
 
 
 class TestFileSystem(unittest.TestCase):
@@ -16,3 +20,66 @@ class TestFileSystem(unittest.TestCase):
     file_system = InMemoryFileSystem()
     file_system.write_file(FILE_NAME, FILE_LINES)
     self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+
+  def test_save_and_load_binary(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_binary_file(FILE_NAME, FILE_BYTES)
+    self.assertEqual(file_system.read_binary_file(FILE_NAME), FILE_BYTES)
+
+  def test_append_binary(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.append_binary_file(FILE_NAME, FILE_BYTES)
+    file_system.append_binary_file(FILE_NAME, FILE_BYTES)
+    self.assertEqual(file_system.read_binary_file(FILE_NAME), FILE_BYTES + FILE_BYTES)
+
+  def test_save_and_map_binary(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_binary_file(FILE_NAME, FILE_BYTES)
+    self.assertEqual(file_system.map_binary_file(FILE_NAME), FILE_BYTES)
+
+  def test_open_file_writer(self) -> None:
+    file_system = InMemoryFileSystem()
+    with file_system.open_file_writer(FILE_NAME) as file:
+      file.writelines(FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    # Nothing is saved if the context exits with an exception
+    with self.assertRaises(ValueError), file_system.open_file_writer("other") as file:
+      file.write(FILE_LINES)
+      raise ValueError
+    self.assertNotIn("other", file_system.file_system)
+
+  def test_connect_database(self) -> None:
+    file_system = InMemoryFileSystem()
+    with contextlib.closing(file_system.connect_database(FILE_NAME)) as connection, connection:
+      connection.execute("CREATE TABLE test (value INTEGER)")
+      connection.execute("INSERT INTO test VALUES (1)")
+    # Each connection to the same file name shares one database, but each file system has its own
+    with contextlib.closing(file_system.connect_database(FILE_NAME)) as connection:
+      self.assertListEqual(connection.execute("SELECT value FROM test").fetchall(), [(1,)])
+    with contextlib.closing(InMemoryFileSystem().connect_database(FILE_NAME)) as connection:
+      self.assertRaises(sqlite3.OperationalError, lambda: connection.execute("SELECT value FROM test"))
+
+  def test_write_counts(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    file_system.write_binary_file(FILE_NAME, FILE_BYTES)
+    file_system.write_binary_file(FILE_NAME, FILE_BYTES[:1])
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(3, len(FILE_LINES) + len(FILE_BYTES) + 1, 1, len(FILE_LINES)))
+
+  def test_save_and_load_files(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_files({FILE_NAME: FILE_LINES, "other": ""})
+    self.assertDictEqual(file_system.read_files([FILE_NAME, "other"]), {FILE_NAME: FILE_LINES, "other": ""})
+
+  def test_copy_directory(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file("source/test", FILE_LINES)
+    file_system.write_binary_file("source/nested/test", FILE_BYTES)
+    file_system.write_file("destination/old", FILE_LINES)
+    file_system.copy_directory("source", "destination")
+    self.assertEqual(file_system.read_file("destination/test"), FILE_LINES)
+    self.assertEqual(file_system.read_binary_file("destination/nested/test"), FILE_BYTES)
+    self.assertNotIn("destination/old", file_system.file_system)
+    # The source is left as it was
+    self.assertEqual(file_system.read_file("source/test"), FILE_LINES)
@@ -0,0 +1,142 @@
+"""Tests for real_file_system.py."""
+
+import contextlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.leaderboard.fs import real_file_system
+from src.leaderboard.fs.file_system import WriteCounts
+from src.leaderboard.fs.real_file_system import RealFileSystem
+
+
+FILE_NAME = "leaderboard_data/test.json"
+FILE_LINES = '[\n  "Bøt-1"\n]'
+CHANGED_FILE_LINES = '[\n  "Bøt-2"\n]'
+
+
+class TestRealFileSystem(unittest.TestCase):
+  """Tests for RealFileSystem."""
+
+  def setUp(self) -> None:
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    # The file names are relative to the working directory
+    self.enterContext(contextlib.chdir(temp_dir.name))
+
+  def test_save_and_load(self) -> None:
+    file_system = RealFileSystem()
+    self.assertIsNone(file_system.read_file(FILE_NAME))
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    file_system.write_file(FILE_NAME, CHANGED_FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), CHANGED_FILE_LINES)
+    # No temporary files are left behind
+    self.assertListEqual([path.name for path in Path("leaderboard_data").iterdir()], ["test.json"])
+
+  def test_skip_unchanged_write(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    modified_time = Path(FILE_NAME).stat().st_mtime_ns
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    self.assertEqual(Path(FILE_NAME).stat().st_mtime_ns, modified_time)
+    file_system.write_file(FILE_NAME, CHANGED_FILE_LINES)
+    byte_count = len(FILE_LINES.encode("utf-8"))
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(2, 2 * byte_count, 1, byte_count))
+
+  def test_failed_write_keeps_old_contents(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    with mock.patch("os.fsync", side_effect=OSError), self.assertRaises(OSError):
+      file_system.write_file(FILE_NAME, CHANGED_FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    self.assertListEqual([path.name for path in Path("leaderboard_data").iterdir()], ["test.json"])
+
+  def test_file_mode(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    self.assertEqual(Path(FILE_NAME).stat().st_mode & 0o777, real_file_system.get_new_file_mode())
+    # A replaced file keeps its permissions
+    Path(FILE_NAME).chmod(0o640)
+    file_system.write_file(FILE_NAME, CHANGED_FILE_LINES)
+    self.assertEqual(Path(FILE_NAME).stat().st_mode & 0o777, 0o640)
+
+  def test_append_binary_file(self) -> None:
+    file_system = RealFileSystem()
+    file_system.append_binary_file(FILE_NAME, b"\x00\x01")
+    file_system.append_binary_file(FILE_NAME, b"\x02")
+    self.assertEqual(file_system.read_binary_file(FILE_NAME), b"\x00\x01\x02")
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(2, 3, 0, 0))
+
+  def test_open_file_writer(self) -> None:
+    file_system = RealFileSystem()
+    with file_system.open_file_writer(FILE_NAME) as file:
+      file.writelines(FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    modified_time = Path(FILE_NAME).stat().st_mtime_ns
+    with file_system.open_file_writer(FILE_NAME) as file:
+      file.write(FILE_LINES)
+    self.assertEqual(Path(FILE_NAME).stat().st_mtime_ns, modified_time)
+    with file_system.open_file_writer(FILE_NAME) as file:
+      file.write(CHANGED_FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), CHANGED_FILE_LINES)
+    byte_count = len(FILE_LINES.encode("utf-8"))
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(2, 2 * byte_count, 1, byte_count))
+    self.assertListEqual([path.name for path in Path("leaderboard_data").iterdir()], ["test.json"])
+
+  def test_failed_file_writer_keeps_old_contents(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    with self.assertRaises(ValueError), file_system.open_file_writer(FILE_NAME) as file:
+      file.write(CHANGED_FILE_LINES)
+      raise ValueError
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    self.assertListEqual([path.name for path in Path("leaderboard_data").iterdir()], ["test.json"])
+
+  def test_open_binary_file_writer(self) -> None:
+    file_system = RealFileSystem()
+    with file_system.open_binary_file_writer(FILE_NAME) as file:
+      file.write(b"\x00\x01")
+      file.write(b"\x02")
+    self.assertEqual(file_system.read_binary_file(FILE_NAME), b"\x00\x01\x02")
+    with self.assertRaises(ValueError), file_system.open_binary_file_writer(FILE_NAME) as file:
+      file.write(b"\x03")
+      raise ValueError
+    self.assertEqual(file_system.read_binary_file(FILE_NAME), b"\x00\x01\x02")
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(1, 3, 0, 0))
+    self.assertListEqual([path.name for path in Path("leaderboard_data").iterdir()], ["test.json"])
+
+  def test_iter_file_lines(self) -> None:
+    file_system = RealFileSystem()
+    self.assertListEqual(list(file_system.iter_file_lines(FILE_NAME)), [])
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    self.assertListEqual(list(file_system.iter_file_lines(FILE_NAME)), FILE_LINES.splitlines())
+
+  def test_save_and_load_files(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    file_contents_by_name = {FILE_NAME: FILE_LINES, "leaderboard_html/index.html": CHANGED_FILE_LINES}
+    file_system.write_files(file_contents_by_name)
+    self.assertDictEqual(file_system.read_files(list(file_contents_by_name)), file_contents_by_name)
+    self.assertIsNone(file_system.read_files(["missing.json"])["missing.json"])
+    byte_count = len(FILE_LINES.encode("utf-8"))
+    self.assertEqual(file_system.get_write_counts(), WriteCounts(2, 2 * byte_count, 1, byte_count))
+
+  def test_root_dir(self) -> None:
+    file_system = RealFileSystem("root")
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    self.assertEqual(Path("root", FILE_NAME).read_text(encoding="utf-8"), FILE_LINES)
+    self.assertEqual(file_system.read_file(FILE_NAME), FILE_LINES)
+    self.assertIsNone(RealFileSystem().read_file(FILE_NAME))
+
+  def test_copy_directory(self) -> None:
+    file_system = RealFileSystem()
+    file_system.write_file(FILE_NAME, FILE_LINES)
+    file_system.write_file("copy/old.json", CHANGED_FILE_LINES)
+    file_system.copy_directory("leaderboard_data", "copy")
+    self.assertListEqual([path.name for path in Path("copy").iterdir()], ["test.json"])
+    self.assertEqual(file_system.read_file("copy/test.json"), FILE_LINES)
+    # Copying a missing directory leaves the destination empty
+    file_system.copy_directory("missing", "copy")
+    self.assertListEqual(list(Path("copy").iterdir()), [])
@@ -1,5 +1,8 @@
 """Test implementation of LichessClient which allows setting the response."""
 
+import json
+from collections.abc import Iterator
+
 from src.leaderboard.li.lichess_client import LichessClient
 
 
@@ -9,11 +12,26 @@ class FakeLichessClient(LichessClient):
   def __init__(self) -> None:
     """Create a fake lichess client and set the fake response to empty string by default."""
     self.fake_response = ""
+    self.fake_users_by_id: dict[str, str] = {}
+    self.get_users_calls: list[list[str]] = []
 
   def set_online_bots(self, fake_response: str) -> None:
     """Set the value to be returned by get_online_bots."""
     self.fake_response = fake_response
 
+  def add_user(self, user_json: str) -> None:
+    """Add a user which can be returned by get_users."""
+    self.fake_users_by_id[json.loads(user_json).get("username", "").lower()] = user_json
+
   def get_online_bots(self) -> str:
     """Return a list of online bots represented as ndjson."""
     return self.fake_response
+
+  def iter_online_bots(self) -> Iterator[str]:
+    """Yield the online bots one line of ndjson at a time."""
+    yield from self.fake_response.splitlines()
+
+  def get_users(self, user_ids: list[str]) -> str:
+    """Return a json list of the users with the given ids which have been added."""
+    self.get_users_calls.append(user_ids)
+    return f"[{','.join(self.fake_users_by_id[user_id] for user_id in user_ids if user_id in self.fake_users_by_id)}]"
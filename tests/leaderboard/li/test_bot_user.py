@@ -63,3 +63,7 @@ class TestBotUser(unittest.TestCase):
     self.assertTrue(bot_user.patron)
     self.assertFalse(bot_user.tos_violation)
     self.assertListEqual(bot_user.perfs, expected_perfs)
+
+  def test_get_played_perfs(self) -> None:
+    bot_user = BotUser.from_json_dict({"perfs": {"bullet": {"games": 1, "rating": 1450}, "blitz": {"rating": 1500}}})
+    self.assertListEqual(bot_user.get_played_perfs(), [Perf(PerfType.BULLET, 1, 1450, 0, 0, False)])
@@ -0,0 +1,63 @@
+"""Tests for bot_user_decoder.py and its implementations."""
+
+import importlib.util
+import unittest
+
+from src.leaderboard.li.bot_user import BotUser
+from src.leaderboard.li.bot_user_decoder import BotUserDecoder, create_bot_user_decoder
+from src.leaderboard.li.json_bot_user_decoder import JsonBotUserDecoder
+from tests.leaderboard.li.test_bot_user import BOT_USER_JSON
+
+
+MSGSPEC_INSTALLED = importlib.util.find_spec("msgspec") is not None
+
+# A variety of lines including missing fields, unknown perf types and fields which are not used
+BOT_USER_JSON_LINES = [
+  BOT_USER_JSON,
+  "{}",
+  """{ "username": "Bot-1" }""",
+  """{ "username": "Bot-2", "perfs": { "bullet": { "games": 1000 }, "blitz": { "rating": 1500, "prov": true } } }""",
+  """{ "username": "Bot-3", "tosViolation": true, "profile": { "bio": "hello", "links": "" }, "seenAt": 1743500000999 }""",
+  """{ "id": "bot-4", "username": "Bot-4", "perfs": { "storm": { "runs": 5, "score": 20 }, "puzzle": { "games": 2 } } }""",
+  """{ "username": "Bot-5", "count": { "all": 10, "win": 5 }, "playTime": { "total": 100 }, "title": "BOT" }""",
+  """{ "username": "Bot-6", "flair": "nature.seedling", "perfs": { "chess960": { "games": 1, "rating": 2000, "rd": 45,
+    "prog": -12 }, "racingKings": { "games": 7, "rating": 1600, "rd": 300, "prog": 0, "prov": true } } }""",
+]
+
+
+class DecoderTestCase(unittest.TestCase):
+  """Checks that a decoder produces the same BotUsers as BotUser.from_json."""
+
+  def assert_matches_from_json(self, decoder: BotUserDecoder) -> None:
+    for json_str in BOT_USER_JSON_LINES:
+      with self.subTest(json_str=json_str):
+        self.assertEqual(decoder.decode(json_str), BotUser.from_json(json_str))
+    json_list_str = f"[{','.join(BOT_USER_JSON_LINES)}]"
+    self.assertListEqual(decoder.decode_list(json_list_str), [BotUser.from_json(line) for line in BOT_USER_JSON_LINES])
+    self.assertListEqual(decoder.decode_list("[]"), [])
+
+
+class TestJsonBotUserDecoder(DecoderTestCase):
+  """Tests for JsonBotUserDecoder."""
+
+  def test_decode(self) -> None:
+    self.assert_matches_from_json(JsonBotUserDecoder())
+
+
+@unittest.skipUnless(MSGSPEC_INSTALLED, "msgspec is not installed")
+class TestMsgspecBotUserDecoder(DecoderTestCase):
+  """Tests for MsgspecBotUserDecoder."""
+
+  def test_decode(self) -> None:
+    from src.leaderboard.li.msgspec_bot_user_decoder import MsgspecBotUserDecoder
+
+    self.assert_matches_from_json(MsgspecBotUserDecoder())
+
+
+class TestBotUserDecoderFunctions(unittest.TestCase):
+  """Tests for bot_user_decoder functions."""
+
+  def test_create_bot_user_decoder(self) -> None:
+    decoder = create_bot_user_decoder()
+    expected_decoder_name = "MsgspecBotUserDecoder" if MSGSPEC_INSTALLED else "JsonBotUserDecoder"
+    self.assertEqual(type(decoder).__name__, expected_decoder_name)
@@ -0,0 +1,35 @@
+"""Tests for bulk_users.py."""
+
+import json
+import unittest
+
+from src.leaderboard.li import bulk_users
+from src.leaderboard.li.rate_limiter import RateLimiter
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+
+
+class TestBulkUsersFunctions(unittest.TestCase):
+  """Tests for bulk_users functions."""
+
+  def test_create_batches(self) -> None:
+    user_ids = [f"bot-{index}" for index in range(700)]
+    batches = bulk_users.create_batches(user_ids)
+    self.assertListEqual([len(batch) for batch in batches], [300, 300, 100])
+    self.assertListEqual([user_id for batch in batches for user_id in batch], user_ids)
+    self.assertListEqual(bulk_users.create_batches([]), [])
+
+  def test_iter_user_batches(self) -> None:
+    lichess_client = FakeLichessClient()
+    for index in range(650):
+      lichess_client.add_user(json.dumps({"username": f"Bot-{index}"}))
+    user_ids = [f"bot-{index}" for index in range(700)]
+    responses = list(bulk_users.iter_user_batches(lichess_client, user_ids, 4, RateLimiter(0)))
+    usernames = [user["username"] for response in responses for user in json.loads(response)]
+    # The responses are in the same order as the batches and unknown users are left out
+    self.assertListEqual(usernames, [f"Bot-{index}" for index in range(650)])
+    self.assertEqual(len(lichess_client.get_users_calls), 3)
+
+  def test_iter_user_batches_empty(self) -> None:
+    lichess_client = FakeLichessClient()
+    self.assertListEqual(list(bulk_users.iter_user_batches(lichess_client, [], 4, RateLimiter(0))), [])
+    self.assertListEqual(lichess_client.get_users_calls, [])
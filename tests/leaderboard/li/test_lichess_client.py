@@ -6,6 +6,7 @@ from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
 
 
 ONLINE_BOT_NDJSON = "{some json}"
+MULTIPLE_ONLINE_BOTS_NDJSON = "{bot 1}\n{bot 2}\n{bot 3}"
 
 
 class TestLichessClient(unittest.TestCase):
@@ -15,3 +16,15 @@ class TestLichessClient(unittest.TestCase):
     lichess_client = FakeLichessClient()
     lichess_client.set_online_bots(ONLINE_BOT_NDJSON)
     self.assertEqual(lichess_client.get_online_bots(), ONLINE_BOT_NDJSON)
+
+  def test_iter_online_bots(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.set_online_bots(MULTIPLE_ONLINE_BOTS_NDJSON)
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ["{bot 1}", "{bot 2}", "{bot 3}"])
+
+  def test_get_users(self) -> None:
+    lichess_client = FakeLichessClient()
+    lichess_client.add_user('{"username": "Bot-1"}')
+    lichess_client.add_user('{"username": "Bot-2"}')
+    self.assertEqual(lichess_client.get_users(["bot-2", "bot-3"]), '[{"username": "Bot-2"}]')
+    self.assertListEqual(lichess_client.get_users_calls, [["bot-2", "bot-3"]])
@@ -0,0 +1,53 @@
+"""Tests for lichess_snapshots.py."""
+
+import unittest
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li import lichess_snapshots
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+CAPTURE_TIME = 1743500000
+
+
+class TestLichessSnapshots(unittest.TestCase):
+  """Tests for lichess_snapshots functions."""
+
+  def test_users_snapshot_name(self) -> None:
+    snapshot_name = lichess_snapshots.users_snapshot_name(["bot-1", "bot-2"])
+    self.assertRegex(snapshot_name, r"^users_[0-9a-f]{16}\.json\.gz$")
+    self.assertEqual(lichess_snapshots.users_snapshot_name(["bot-1", "bot-2"]), snapshot_name)
+    self.assertNotEqual(lichess_snapshots.users_snapshot_name(["bot-2", "bot-1"]), snapshot_name)
+
+  def test_save_and_load_snapshot(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_snapshots.save_snapshot(file_system, CAPTURE_TIME, "test.ndjson.gz", "{bot 1}\n{bot 2}")
+    compressed_body = file_system.read_binary_file(file_paths.lichess_snapshot_path(CAPTURE_TIME, "test.ndjson.gz"))
+    self.assertEqual(compressed_body[:2] if compressed_body else b"", b"\x1f\x8b")
+    self.assertEqual(lichess_snapshots.load_snapshot(file_system, CAPTURE_TIME, "test.ndjson.gz"), "{bot 1}\n{bot 2}")
+
+  def test_save_snapshot_is_deterministic(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_snapshots.save_snapshot(file_system, CAPTURE_TIME, "first.gz", "{bot 1}")
+    lichess_snapshots.save_snapshot(file_system, CAPTURE_TIME, "second.gz", "{bot 1}")
+    self.assertEqual(
+      file_system.read_binary_file(file_paths.lichess_snapshot_path(CAPTURE_TIME, "first.gz")),
+      file_system.read_binary_file(file_paths.lichess_snapshot_path(CAPTURE_TIME, "second.gz")),
+    )
+
+  def test_load_missing_snapshot(self) -> None:
+    with self.assertRaises(FileNotFoundError):
+      lichess_snapshots.load_snapshot(InMemoryFileSystem(), CAPTURE_TIME, "missing.gz")
+
+  def test_save_and_restore_input_data(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_system.write_file(file_paths.bot_profiles_path(), "[profiles]")
+    lichess_snapshots.save_input_data(file_system, CAPTURE_TIME)
+    # The recorded run changes the live data, but the replay starts from the data as it was
+    file_system.write_file(file_paths.bot_profiles_path(), "[changed profiles]")
+    file_system.write_file(f"{file_paths.replay_dir(CAPTURE_TIME)}/{file_paths.bot_profiles_path()}", "[replayed profiles]")
+    lichess_snapshots.restore_input_data(file_system, CAPTURE_TIME)
+    self.assertEqual(
+      file_system.read_file(f"{file_paths.replay_dir(CAPTURE_TIME)}/{file_paths.bot_profiles_path()}"), "[profiles]"
+    )
+    self.assertEqual(file_system.read_file(file_paths.bot_profiles_path()), "[changed profiles]")
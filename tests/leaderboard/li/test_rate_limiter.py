@@ -0,0 +1,46 @@
+"""Tests for rate_limiter.py."""
+
+import unittest
+
+from src.leaderboard.li.rate_limiter import RateLimiter
+
+
+class FakeClock:
+  """A clock which only moves forward when sleeping."""
+
+  def __init__(self) -> None:
+    """Start the clock at an arbitrary time."""
+    self.now = 100.0
+    self.sleeps: list[float] = []
+
+  def time(self) -> float:
+    """Return the current fake time."""
+    return self.now
+
+  def sleep(self, seconds: float) -> None:
+    """Advance the fake time."""
+    self.sleeps.append(seconds)
+    self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+  """Tests for RateLimiter."""
+
+  def test_acquire(self) -> None:
+    clock = FakeClock()
+    rate_limiter = RateLimiter(0.5, clock.time, clock.sleep)
+    # The first call does not wait
+    rate_limiter.acquire()
+    self.assertListEqual(clock.sleeps, [])
+    # Subsequent calls wait until the interval has passed
+    rate_limiter.acquire()
+    rate_limiter.acquire()
+    self.assertListEqual(clock.sleeps, [0.5, 0.5])
+
+  def test_acquire_after_interval(self) -> None:
+    clock = FakeClock()
+    rate_limiter = RateLimiter(0.5, clock.time, clock.sleep)
+    rate_limiter.acquire()
+    clock.now += 2
+    rate_limiter.acquire()
+    self.assertListEqual(clock.sleeps, [])
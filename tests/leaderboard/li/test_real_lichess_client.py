@@ -0,0 +1,204 @@
+"""Tests for real_lichess_client.py.
+
+The client is tested against a local stand-in for the lichess API which plays back scripted responses.
+"""
+
+import http.server
+import threading
+import typing
+import unittest
+
+import requests
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li import real_lichess_client
+from src.leaderboard.li.real_lichess_client import ONLINE_BOTS_PATH, USERS_PATH, RealLichessClient, RetryPolicy
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.log.fake_log_writer import FakeLogWriter
+
+
+ONLINE_BOTS_NDJSON = '{"username": "Bot-1"}\n{"username": "Bot-2"}\n'
+ONLINE_BOTS_LINES = ['{"username": "Bot-1"}', '{"username": "Bot-2"}']
+
+
+def jitter_to_high(low: float, high: float) -> float:
+  """Return the highest backoff rather than a random one, so that the backoffs are predictable."""
+  del low
+  return high
+
+
+class ScriptedResponse:
+  """A response for the stand-in server to send."""
+
+  def __init__(self, status_code: int, body: str = "", headers: dict[str, str] | None = None) -> None:
+    """Set the status, body, and headers to send."""
+    self.status_code = status_code
+    self.body = body
+    self.headers = headers or {}
+
+
+class StandInLichessHandler(http.server.BaseHTTPRequestHandler):
+  """Sends the next scripted response and records the request headers."""
+
+  def get_server(self) -> "StandInLichessServer":
+    """Return the server handling the request, which is always a StandInLichessServer."""
+    return typing.cast("StandInLichessServer", self.server)
+
+  def do_GET(self) -> None:  # noqa: N802 (name required by BaseHTTPRequestHandler)
+    """Respond to a GET request."""
+    self.get_server().request_headers.append(dict(self.headers))
+    self.send_scripted_response()
+
+  def do_POST(self) -> None:  # noqa: N802 (name required by BaseHTTPRequestHandler)
+    """Respond to a POST request."""
+    server = self.get_server()
+    server.request_headers.append(dict(self.headers))
+    server.request_bodies.append(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+    self.send_scripted_response()
+
+  def send_scripted_response(self) -> None:
+    """Send the next scripted response."""
+    response = self.get_server().scripted_responses.pop(0)
+    body = response.body.encode("utf-8")
+    self.send_response(response.status_code)
+    for name, value in response.headers.items():
+      self.send_header(name, value)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, format: str, *args: object) -> None:  # noqa: A002 (name required by BaseHTTPRequestHandler)
+    """Do not log requests."""
+
+
+class StandInLichessServer(http.server.ThreadingHTTPServer):
+  """A local http server which plays back scripted responses."""
+
+  def __init__(self) -> None:
+    """Listen on an unused local port."""
+    super().__init__(("127.0.0.1", 0), StandInLichessHandler)
+    self.scripted_responses: list[ScriptedResponse] = []
+    self.request_headers: list[dict[str, str]] = []
+    self.request_bodies: list[str] = []
+
+  def get_base_url(self) -> str:
+    """Return the url of the server."""
+    return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class TestRealLichessClientFunctions(unittest.TestCase):
+  """Tests for real_lichess_client functions."""
+
+  def test_parse_retry_after(self) -> None:
+    self.assertIsNone(real_lichess_client.parse_retry_after(None))
+    self.assertIsNone(real_lichess_client.parse_retry_after("soon"))
+    self.assertEqual(real_lichess_client.parse_retry_after("7"), 7.0)
+    self.assertEqual(real_lichess_client.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+  def test_get_backoff(self) -> None:
+    retry_policy = RetryPolicy(base_backoff=1.0, max_backoff=5.0, jitter=jitter_to_high)
+    self.assertEqual(retry_policy.get_backoff(0), 1.0)
+    self.assertEqual(retry_policy.get_backoff(2), 4.0)
+    self.assertEqual(retry_policy.get_backoff(3), 5.0)
+
+
+class TestRealLichessClient(unittest.TestCase):
+  """Tests for RealLichessClient."""
+
+  def setUp(self) -> None:
+    self.server = StandInLichessServer()
+    self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+    self.server_thread.start()
+    self.sleeps: list[float] = []
+
+  def tearDown(self) -> None:
+    self.server.shutdown()
+    self.server.server_close()
+    self.server_thread.join()
+
+  def create_client(self, cache_file_system: InMemoryFileSystem | None = None) -> RealLichessClient:
+    """Create a client which calls the stand-in server and records sleeps rather than sleeping."""
+    retry_policy = RetryPolicy(max_retries=2, jitter=jitter_to_high)
+    return RealLichessClient(FakeLogWriter(), cache_file_system, self.server.get_base_url(), retry_policy, self.sleeps.append)
+
+  def test_iter_online_bots(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(200, ONLINE_BOTS_NDJSON)]
+    lichess_client = self.create_client()
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ONLINE_BOTS_LINES)
+    self.assertEqual(self.server.request_headers[0]["Accept"], "application/x-ndjson")
+    self.assertEqual(len(lichess_client.attempt_stats), 1)
+    self.assertEqual(lichess_client.attempt_stats[0].status_code, 200)
+    self.assertEqual(lichess_client.attempt_stats[0].bytes_received, len(ONLINE_BOTS_NDJSON))
+    self.assertTrue(lichess_client.attempt_stats[0].url.endswith(ONLINE_BOTS_PATH))
+
+  def test_get_online_bots(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(200, ONLINE_BOTS_NDJSON)]
+    self.assertEqual(self.create_client().get_online_bots(), "\n".join(ONLINE_BOTS_LINES))
+
+  def test_retry_with_backoff(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(503), ScriptedResponse(502), ScriptedResponse(200, ONLINE_BOTS_NDJSON)]
+    lichess_client = self.create_client()
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ONLINE_BOTS_LINES)
+    self.assertListEqual(self.sleeps, [1.0, 2.0])
+    self.assertListEqual([stats.status_code for stats in lichess_client.attempt_stats], [503, 502, 200])
+
+  def test_retry_after(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(429, headers={"Retry-After": "7"}), ScriptedResponse(200)]
+    list(self.create_client().iter_online_bots())
+    self.assertListEqual(self.sleeps, [7.0])
+
+  def test_retries_exhausted(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(500), ScriptedResponse(500), ScriptedResponse(500)]
+    with self.assertRaises(requests.HTTPError):
+      list(self.create_client().iter_online_bots())
+    self.assertEqual(len(self.sleeps), 2)
+
+  def test_no_retry_for_client_error(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(404)]
+    with self.assertRaises(requests.HTTPError):
+      list(self.create_client().iter_online_bots())
+    self.assertListEqual(self.sleeps, [])
+
+  def test_conditional_request(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(200, ONLINE_BOTS_NDJSON, {"ETag": '"v1"'}), ScriptedResponse(304)]
+    lichess_client = self.create_client()
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ONLINE_BOTS_LINES)
+    self.assertNotIn("If-None-Match", self.server.request_headers[0])
+    self.assertListEqual(list(lichess_client.iter_online_bots()), ONLINE_BOTS_LINES)
+    self.assertEqual(self.server.request_headers[1]["If-None-Match"], '"v1"')
+    self.assertEqual(lichess_client.attempt_stats[1].status_code, 304)
+    self.assertEqual(lichess_client.attempt_stats[1].bytes_received, 0)
+
+  def test_conditional_request_persisted(self) -> None:
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+    self.server.scripted_responses = [
+      ScriptedResponse(200, ONLINE_BOTS_NDJSON, {"Last-Modified": last_modified}),
+      ScriptedResponse(304),
+    ]
+    cache_file_system = InMemoryFileSystem()
+    list(self.create_client(cache_file_system).iter_online_bots())
+    # A new client (i.e. the next run) reuses the cached response
+    self.assertListEqual(list(self.create_client(cache_file_system).iter_online_bots()), ONLINE_BOTS_LINES)
+    self.assertEqual(self.server.request_headers[1]["If-Modified-Since"], last_modified)
+    self.assertEqual(cache_file_system.file_system[file_paths.lichess_cache_path("online_bots.ndjson")], ONLINE_BOTS_NDJSON)
+
+  def test_interrupted_response_not_cached(self) -> None:
+    self.server.scripted_responses = [ScriptedResponse(200, ONLINE_BOTS_NDJSON, {"ETag": '"v1"'}), ScriptedResponse(200)]
+    cache_file_system = InMemoryFileSystem()
+    lichess_client = self.create_client(cache_file_system)
+    # The consumer stops after the first line, which closes the generator
+    for line in lichess_client.iter_online_bots():
+      self.assertEqual(line, ONLINE_BOTS_LINES[0])
+      break
+    self.assertDictEqual(cache_file_system.file_system, {})
+    list(lichess_client.iter_online_bots())
+    self.assertNotIn("If-None-Match", self.server.request_headers[1])
+
+  def test_get_users(self) -> None:
+    users_json = '[{"username": "Bot-1"}, {"username": "Bot-2"}]'
+    self.server.scripted_responses = [ScriptedResponse(503), ScriptedResponse(200, users_json)]
+    lichess_client = self.create_client()
+    self.assertEqual(lichess_client.get_users(["bot-1", "bot-2"]), users_json)
+    self.assertListEqual(self.server.request_bodies, ["bot-1,bot-2", "bot-1,bot-2"])
+    self.assertEqual(self.server.request_headers[1]["Content-Type"], "text/plain")
+    self.assertTrue(lichess_client.attempt_stats[1].url.endswith(USERS_PATH))
@@ -0,0 +1,120 @@
+"""Tests for recording_lichess_client.py and replay_lichess_client.py."""
+
+import contextlib
+import tempfile
+import unittest
+
+from src.leaderboard.chrono.durations import ONE_HOUR
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data import data_generator
+from src.leaderboard.data.data_generator import DataFormat, DataGenerator, DataGeneratorOptions, LeaderboardDataResult
+from src.leaderboard.fs import file_paths
+from src.leaderboard.fs.file_system import FileSystem
+from src.leaderboard.fs.real_file_system import RealFileSystem
+from src.leaderboard.li import lichess_snapshots
+from src.leaderboard.li.lichess_client import LichessClient
+from src.leaderboard.li.recording_lichess_client import RecordingLichessClient
+from src.leaderboard.li.replay_lichess_client import ReplayLichessClient
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
+
+
+CAPTURE_TIME = 1743500000
+MULTIPLE_ONLINE_BOTS_NDJSON = '{"username": "Bot-1"}\n{"username": "Bot-2"}'
+# Bot-3 was seen after Bot-2 in the first run, but the refreshed Bot-2 was seen after Bot-3, which changes the order they are
+# requested in the next run
+BOT_1_JSON = '{"username": "Bot-1", "seenAt": 1743400000000, "perfs": {"bullet": {"games": 10, "rating": 2000}}}'
+BOT_2_JSON = '{"username": "Bot-2", "seenAt": 1743300000000, "perfs": {"bullet": {"games": 10, "rating": 1900}}}'
+BOT_3_JSON = '{"username": "Bot-3", "seenAt": 1743400000000, "perfs": {"bullet": {"games": 10, "rating": 1800}}}'
+REFRESHED_BOT_2_JSON = '{"username": "Bot-2", "seenAt": 1743490000000, "perfs": {"bullet": {"games": 11, "rating": 1950}}}'
+OPTIONS = DataGeneratorOptions(refresh_offline_bots=True, offline_bot_request_interval=0)
+
+
+def generate_and_save(file_system: FileSystem, lichess_client: LichessClient, current_time: int) -> LeaderboardDataResult:
+  """Generate the leaderboard data with the offline bots refreshed, and save it to be loaded by the next run."""
+  leaderboard_data = DataGenerator(
+    file_system, lichess_client, FixedTimeProvider(current_time), OPTIONS
+  ).generate_leaderboard_data()
+  data_generator.save_leaderboard_data(
+    file_system,
+    DataFormat.JSON,
+    leaderboard_data.get_bot_profiles_sorted(),
+    leaderboard_data.get_ranked_rows_sorted(),
+    current_time,
+  )
+  return leaderboard_data
+
+
+class TestRecordingLichessClient(unittest.TestCase):
+  """Tests for RecordingLichessClient and ReplayLichessClient."""
+
+  def setUp(self) -> None:
+    self.file_system = InMemoryFileSystem()
+    self.lichess_client = FakeLichessClient()
+    self.lichess_client.set_online_bots(MULTIPLE_ONLINE_BOTS_NDJSON)
+    self.lichess_client.add_user('{"username": "Bot-3"}')
+    self.recording_lichess_client = RecordingLichessClient(self.lichess_client, self.file_system, CAPTURE_TIME)
+
+  def test_record_passes_through(self) -> None:
+    self.assertEqual(self.recording_lichess_client.get_online_bots(), MULTIPLE_ONLINE_BOTS_NDJSON)
+    self.assertEqual(self.recording_lichess_client.get_users(["bot-3"]), '[{"username": "Bot-3"}]')
+    self.assertEqual(len(self.file_system.binary_file_system), 2)
+
+  def test_replay_online_bots(self) -> None:
+    recorded_lines = list(self.recording_lichess_client.iter_online_bots())
+    # The recording is served even after the live response changes
+    self.lichess_client.set_online_bots("")
+    replay_lichess_client = ReplayLichessClient(self.file_system, CAPTURE_TIME)
+    self.assertListEqual(list(replay_lichess_client.iter_online_bots()), recorded_lines)
+    self.assertEqual(replay_lichess_client.get_online_bots(), MULTIPLE_ONLINE_BOTS_NDJSON)
+
+  def test_online_bots_snapshot(self) -> None:
+    list(self.recording_lichess_client.iter_online_bots())
+    # The snapshot is compressed as the lines are received, to the same bytes as a snapshot saved all at once
+    file_system = InMemoryFileSystem()
+    snapshot_name = lichess_snapshots.ONLINE_BOTS_SNAPSHOT_NAME
+    lichess_snapshots.save_snapshot(file_system, CAPTURE_TIME, snapshot_name, MULTIPLE_ONLINE_BOTS_NDJSON)
+    snapshot_path = file_paths.lichess_snapshot_path(CAPTURE_TIME, snapshot_name)
+    self.assertEqual(self.file_system.binary_file_system[snapshot_path], file_system.binary_file_system[snapshot_path])
+
+  def test_replay_users(self) -> None:
+    self.recording_lichess_client.get_users(["bot-3", "bot-4"])
+    replay_lichess_client = ReplayLichessClient(self.file_system, CAPTURE_TIME)
+    self.assertEqual(replay_lichess_client.get_users(["bot-3", "bot-4"]), '[{"username": "Bot-3"}]')
+    with self.assertRaises(FileNotFoundError):
+      replay_lichess_client.get_users(["bot-4"])
+
+  def test_replay_time_provider(self) -> None:
+    replay_lichess_client = ReplayLichessClient(self.file_system, CAPTURE_TIME)
+    self.assertEqual(replay_lichess_client.create_time_provider().get_current_time(), CAPTURE_TIME)
+
+  def test_replay_missing_snapshot(self) -> None:
+    with self.assertRaises(FileNotFoundError):
+      ReplayLichessClient(self.file_system, CAPTURE_TIME).get_online_bots()
+
+  def test_replay_refreshed_offline_bots(self) -> None:
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    # The file names are relative to the working directory
+    self.enterContext(contextlib.chdir(temp_dir.name))
+    file_system = RealFileSystem()
+    self.lichess_client.set_online_bots("\n".join([BOT_1_JSON, BOT_2_JSON, BOT_3_JSON]))
+    generate_and_save(file_system, self.lichess_client, CAPTURE_TIME - ONE_HOUR)
+
+    # Only Bot-1 is online when the run is recorded, and the recorded run changes the live data
+    self.lichess_client.set_online_bots(BOT_1_JSON)
+    self.lichess_client.add_user(REFRESHED_BOT_2_JSON)
+    lichess_snapshots.save_input_data(file_system, CAPTURE_TIME)
+    recording_lichess_client = RecordingLichessClient(self.lichess_client, file_system, CAPTURE_TIME)
+    recorded_data = generate_and_save(file_system, recording_lichess_client, CAPTURE_TIME)
+    live_bot_profiles = file_system.read_file(file_paths.bot_profiles_path())
+
+    for _ in range(2):
+      lichess_snapshots.restore_input_data(file_system, CAPTURE_TIME)
+      replay_lichess_client = ReplayLichessClient(file_system, CAPTURE_TIME)
+      replayed_data = generate_and_save(
+        RealFileSystem(file_paths.replay_dir(CAPTURE_TIME)), replay_lichess_client, CAPTURE_TIME
+      )
+      self.assertEqual(replayed_data.get_bot_profiles_sorted(), recorded_data.get_bot_profiles_sorted())
+      self.assertEqual(replayed_data.get_ranked_rows_sorted(), recorded_data.get_ranked_rows_sorted())
+    self.assertEqual(file_system.read_file(file_paths.bot_profiles_path()), live_bot_profiles)
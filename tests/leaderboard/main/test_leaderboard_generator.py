@@ -1,12 +1,18 @@
 """Tests for leaderboard_generator.py."""
 
+import contextlib
+import gzip
 import unittest
 
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import DataFormat, DataGeneratorOptions
+from src.leaderboard.data.rating_history import RatingHistory
+from src.leaderboard.data.sqlite_store import SqliteStore
 from src.leaderboard.fs import file_paths
 from src.leaderboard.li.pert_type import PerfType
 from src.leaderboard.main import leaderboard_generator as leaderboard_generation_functions
-from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator
+from src.leaderboard.main.leaderboard_generator import LeaderboardGenerator, LeaderboardGeneratorOptions
+from src.leaderboard.page.html_generator import HtmlGeneratorOptions
 from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
 from tests.leaderboard.li.fake_lichess_client import FakeLichessClient
 from tests.leaderboard.log.fake_log_writer import FakeLogWriter
@@ -15,6 +21,12 @@ from tests.leaderboard.log.fake_log_writer import FakeLogWriter
 class TestLeaderboardGeneratorFunctions(unittest.TestCase):
   """Tests for leaderboard generator functions."""
 
+  def test_get_generation_number(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertEqual(leaderboard_generation_functions.get_generation_number(file_system), 0)
+    file_system.write_file(file_paths.generation_number_path(), "12")
+    self.assertEqual(leaderboard_generation_functions.get_generation_number(file_system), 12)
+
   def test_increment_generation_number(self) -> None:
     file_system = InMemoryFileSystem()
     leaderboard_generation_functions.increment_generation_number(file_system)
@@ -41,8 +53,92 @@ class TestLeaderboardGenerator(unittest.TestCase):
     if not bullet_data:
       self.fail(f"Missing bullet_data: {bullet_data}")
     self.assertIn("Bot-1", bullet_data)
+    self.assertEqual(file_system.read_file(file_paths.bot_ids_path()), '[\n  "Bot-1"\n]')
+    self.assertEqual(len(RatingHistory(file_system).scan_bot(0)), 1)
 
     bullet_html = file_system.read_file(file_paths.html_path(PerfType.BULLET.to_string()))
     if not bullet_html:
       self.fail(f"Missing bullet_html: {bullet_html}")
     self.assertIn("Bot-1", bullet_html)
+    # The page fingerprints are only saved when unchanged pages are skipped
+    self.assertEqual(file_system.read_file(file_paths.html_fingerprints_path()), "")
+
+  def test_generate_leaderboard_sqlite(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    time_provider = FixedTimeProvider(0)
+    options = LeaderboardGeneratorOptions(DataGeneratorOptions(data_format=DataFormat.SQLITE))
+
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+
+    for _ in range(2):
+      leaderboard_generator = LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options)
+      leaderboard_generator.generate_leaderboards()
+
+    self.assertEqual(file_system.read_file(file_paths.data_path(PerfType.BULLET)), "")
+    with contextlib.closing(file_system.connect_database(file_paths.sqlite_store_path())) as connection:
+      sqlite_store = SqliteStore(connection)
+      self.assertEqual(sqlite_store.get_generation_count(), 2)
+      self.assertListEqual([row.name for row in sqlite_store.get_top_rows(PerfType.BULLET, 10)], ["Bot-1"])
+      # The row did not change the second time, so it was only recorded once
+      self.assertEqual(len(sqlite_store.get_row_history(PerfType.BULLET, "Bot-1")), 1)
+
+  def test_generate_leaderboard_precompress(self) -> None:
+    file_system = InMemoryFileSystem()
+    lichess_client = FakeLichessClient()
+    time_provider = FixedTimeProvider(0)
+    options = LeaderboardGeneratorOptions(html_generator_options=HtmlGeneratorOptions(precompress=True))
+
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+
+    leaderboard_generator = LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options)
+    leaderboard_generator.generate_leaderboards()
+
+    bullet_html_path = file_paths.html_path(PerfType.BULLET.to_string())
+    bullet_html_gz = file_system.read_binary_file(f"{bullet_html_path}.gz")
+    if not bullet_html_gz:
+      self.fail(f"Missing bullet_html_gz: {bullet_html_gz}")
+    self.assertEqual(gzip.decompress(bullet_html_gz).decode("utf-8"), file_system.read_file(bullet_html_path))
+
+  def test_generate_leaderboard_stream_html(self) -> None:
+    lichess_client = FakeLichessClient()
+    time_provider = FixedTimeProvider(0)
+    options = LeaderboardGeneratorOptions(html_generator_options=HtmlGeneratorOptions(precompress=True, stream_html=True))
+
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+
+    file_system = InMemoryFileSystem()
+    LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+    rendered_file_system = InMemoryFileSystem()
+    LeaderboardGenerator(rendered_file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+
+    # The streamed pages are the same as the pages which were rendered before being written
+    names = ["index", *(perf_type.to_string() for perf_type in PerfType.all_except_unknown())]
+    for html_path in map(file_paths.html_path, names):
+      with self.subTest(html_path=html_path):
+        self.assertEqual(file_system.read_file(html_path), rendered_file_system.read_file(html_path))
+    bullet_html_path = file_paths.html_path(PerfType.BULLET.to_string())
+    bullet_html_gz = file_system.read_binary_file(f"{bullet_html_path}.gz")
+    if not bullet_html_gz:
+      self.fail(f"Missing bullet_html_gz: {bullet_html_gz}")
+    self.assertEqual(gzip.decompress(bullet_html_gz).decode("utf-8"), file_system.read_file(bullet_html_path))
+
+  def test_generate_leaderboard_skip_unchanged_pages(self) -> None:
+    lichess_client = FakeLichessClient()
+    time_provider = FixedTimeProvider(0)
+    options = LeaderboardGeneratorOptions(html_generator_options=HtmlGeneratorOptions(skip_unchanged_pages=True))
+
+    lichess_client.set_online_bots("""{ "username": "Bot-1", "perfs": { "bullet": { "rating": 2345, "games": 678 } } }""")
+
+    file_system = InMemoryFileSystem()
+    rendered_file_system = InMemoryFileSystem()
+    for _ in range(2):
+      LeaderboardGenerator(file_system, lichess_client, time_provider, FakeLogWriter(), options).generate_leaderboards()
+      LeaderboardGenerator(rendered_file_system, lichess_client, time_provider, FakeLogWriter()).generate_leaderboards()
+
+    # The pages of the second run are the same as the pages which were all rendered
+    self.assertNotEqual(file_system.read_file(file_paths.html_fingerprints_path()), "")
+    names = ["index", *(perf_type.to_string() for perf_type in PerfType.all_except_unknown())]
+    for html_path in map(file_paths.html_path, names):
+      with self.subTest(html_path=html_path):
+        self.assertEqual(file_system.read_file(html_path), rendered_file_system.read_file(html_path))
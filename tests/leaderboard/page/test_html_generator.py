@@ -1,14 +1,18 @@
 """Tests for html_generator.py."""
 
 import unittest
+from unittest import mock
 
 from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
 from src.leaderboard.data.data_generator import LeaderboardDataResult
 from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
 from src.leaderboard.li.pert_type import PerfType
 from src.leaderboard.page.html_generator import (
+  MAX_RANK_FOR_PREVIEW,
   Flag,
   HtmlGenerator,
+  HtmlLeaderboardCache,
   HtmlLeaderboardRow,
   LeaderboardDelta,
   LeaderboardTitle,
@@ -16,6 +20,7 @@ from src.leaderboard.page.html_generator import (
   OnlineStatus,
 )
 from tests.leaderboard.chrono import epoch_seconds
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
 
 
 DEFAULT_BOT_PROFILES_BY_NAME = {
@@ -122,6 +127,51 @@ class TestHtmlLeaderboardRow(unittest.TestCase):
     self.assertEqual(HtmlLeaderboardRow.from_leaderboard_row(leaderboard_row, bot_profile, DATE_2025_04_01), expected_html_row)
 
 
+class TestHtmlLeaderboardCache(unittest.TestCase):
+  """Tests for HtmlLeaderboardCache."""
+
+  def test_get_rows(self) -> None:
+    ranked_rows_by_perf_type = {PerfType.BULLET: [create_leaderboard_row("Bot-1"), create_leaderboard_row("Bot-2", rank=0)]}
+    html_leaderboard_cache = HtmlLeaderboardCache(
+      LeaderboardDataResult.create_result(DEFAULT_BOT_PROFILES_BY_NAME, ranked_rows_by_perf_type), 0
+    )
+    html_rows = html_leaderboard_cache.get_rows(PerfType.BULLET)
+    self.assertListEqual([html_row.name for html_row in html_rows], ["Bot-1"])
+    self.assertIs(html_leaderboard_cache.get_rows(PerfType.BULLET), html_rows)
+    self.assertListEqual(html_leaderboard_cache.get_rows(PerfType.BLITZ), [])
+
+  def test_get_leaderboard_preview(self) -> None:
+    names = [f"Bot-{rank}" for rank in range(1, MAX_RANK_FOR_PREVIEW + 3)]
+    ranked_rows = [create_leaderboard_row(name, rank) for rank, name in enumerate(names, 1)]
+    bot_profiles_by_name = {name: BotProfile.from_dict({"name": name}) for name in names}
+    html_leaderboard_cache = HtmlLeaderboardCache(
+      LeaderboardDataResult.create_result(bot_profiles_by_name, {PerfType.BULLET: ranked_rows}), 0
+    )
+    preview_rows = list(html_leaderboard_cache.get_leaderboard(PerfType.BULLET, preview=True).leaderboard_rows)
+    html_rows = list(html_leaderboard_cache.get_leaderboard(PerfType.BULLET).leaderboard_rows)
+    self.assertEqual(len(preview_rows), MAX_RANK_FOR_PREVIEW)
+    self.assertEqual(len(html_rows), len(names))
+    # The preview shares the rows of the full leaderboard
+    for preview_row, row in zip(preview_rows, html_rows, strict=False):
+      self.assertIs(preview_row, row)
+
+  def test_stream_rows(self) -> None:
+    names = [f"Bot-{rank}" for rank in range(1, MAX_RANK_FOR_PREVIEW + 3)]
+    ranked_rows = [create_leaderboard_row(name, rank) for rank, name in enumerate(names, 1)]
+    bot_profiles_by_name = {name: BotProfile.from_dict({"name": name}) for name in names}
+    html_leaderboard_cache = HtmlLeaderboardCache(
+      LeaderboardDataResult.create_result(bot_profiles_by_name, {PerfType.BULLET: ranked_rows}), 0
+    )
+    html_rows = list(html_leaderboard_cache.stream_rows(PerfType.BULLET))
+    self.assertListEqual([html_row.name for html_row in html_rows], names)
+    # Only the rows of the preview are kept, and they are not converted again
+    self.assertNotIn(PerfType.BULLET, html_leaderboard_cache.html_rows_by_perf_type)
+    with mock.patch.object(HtmlLeaderboardRow, "from_leaderboard_row") as from_leaderboard_row_mock:
+      preview_rows = list(html_leaderboard_cache.get_leaderboard(PerfType.BULLET, preview=True).leaderboard_rows)
+    from_leaderboard_row_mock.assert_not_called()
+    self.assertListEqual(preview_rows, html_rows[:MAX_RANK_FOR_PREVIEW])
+
+
 class TestHtmlGenerator(unittest.TestCase):
   """Tests for HtmlGenerator."""
 
@@ -215,3 +265,95 @@ class TestHtmlGenerator(unittest.TestCase):
     )["bullet"]
     self.assertIn("-3", bullet_html)
     self.assertIn(f'class="col-delta-rating {LeaderboardDelta.DELTA_NEG_CLASS}"', bullet_html)
+
+  def test_generate_converts_each_row_once(self) -> None:
+    ranked_rows_by_perf_type = {PerfType.BULLET: [create_leaderboard_row("Bot-1"), create_leaderboard_row("Bot-2")]}
+    html_generator = HtmlGenerator(FixedTimeProvider(0))
+    with mock.patch.object(
+      HtmlLeaderboardRow, "from_leaderboard_row", side_effect=HtmlLeaderboardRow.from_leaderboard_row
+    ) as from_leaderboard_row_mock:
+      html_by_name = html_generator.generate_leaderboard_html(
+        LeaderboardDataResult.create_result(DEFAULT_BOT_PROFILES_BY_NAME, ranked_rows_by_perf_type)
+      )
+    # The rows are shown on both the index and the bullet page
+    self.assertIn("Bot-2", html_by_name["index"])
+    self.assertIn("Bot-2", html_by_name["bullet"])
+    self.assertEqual(from_leaderboard_row_mock.call_count, 2)
+
+  def test_write_leaderboard_html(self) -> None:
+    names = [f"Bot-{rank}" for rank in range(1, MAX_RANK_FOR_PREVIEW + 3)]
+    ranked_rows_by_perf_type = {
+      PerfType.BULLET: [create_leaderboard_row(name, rank) for rank, name in enumerate(names, 1)],
+      PerfType.BLITZ: [create_leaderboard_row("Bot-1", rank=0)],
+    }
+    leaderboard_data = LeaderboardDataResult.create_result(
+      {name: BotProfile.from_dict({"name": name}) for name in names}, ranked_rows_by_perf_type
+    )
+    html_generator = HtmlGenerator(FixedTimeProvider(DATE_2025_04_01))
+    file_system = InMemoryFileSystem()
+    html_paths = html_generator.write_leaderboard_html(leaderboard_data, file_system)
+    html_by_path = {
+      file_paths.html_path(name): html for name, html in html_generator.generate_leaderboard_html(leaderboard_data).items()
+    }
+    self.assertCountEqual(html_paths, html_by_path)
+    self.assertDictEqual({path: file_system.file_system[path] for path in html_paths}, html_by_path)
+
+  def test_does_not_save_fingerprints_by_default(self) -> None:
+    ranked_rows_by_perf_type = {PerfType.BULLET: [create_leaderboard_row("Bot-1")]}
+    leaderboard_data = LeaderboardDataResult.create_result(DEFAULT_BOT_PROFILES_BY_NAME, ranked_rows_by_perf_type)
+    file_system = InMemoryFileSystem()
+    HtmlGenerator(FixedTimeProvider(DATE_2025_04_01), file_system).write_leaderboard_html(leaderboard_data, file_system)
+    HtmlGenerator(FixedTimeProvider(DATE_2025_04_01), file_system).generate_leaderboard_html(leaderboard_data)
+    self.assertNotIn(file_paths.html_fingerprints_path(), file_system.file_system)
+
+  def test_write_reuses_unchanged_pages(self) -> None:
+    ranked_rows_by_perf_type = {PerfType.BULLET: [create_leaderboard_row("Bot-1"), create_leaderboard_row("Bot-2", rank=2)]}
+    leaderboard_data = LeaderboardDataResult.create_result(DEFAULT_BOT_PROFILES_BY_NAME, ranked_rows_by_perf_type)
+    file_system = InMemoryFileSystem()
+    html_generator = HtmlGenerator(FixedTimeProvider(DATE_2025_04_01), file_system, skip_unchanged_pages=True)
+    html_generator.write_leaderboard_html(leaderboard_data, file_system)
+    time_provider = FixedTimeProvider(DATE_2025_04_01 + 600)
+    html_generator = HtmlGenerator(time_provider, file_system, skip_unchanged_pages=True)
+    with mock.patch.object(file_system, "open_file_writer") as open_file_writer_mock:
+      html_paths = html_generator.write_leaderboard_html(leaderboard_data, file_system)
+    open_file_writer_mock.assert_not_called()
+    html_by_path = {
+      file_paths.html_path(name): html
+      for name, html in HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data).items()
+    }
+    self.assertDictEqual({path: file_system.file_system[path] for path in html_paths}, html_by_path)
+
+  def test_generate_reuses_unchanged_pages(self) -> None:
+    ranked_rows_by_perf_type = {PerfType.BULLET: [create_leaderboard_row("Bot-1"), create_leaderboard_row("Bot-2", rank=2)]}
+    leaderboard_data = LeaderboardDataResult.create_result(DEFAULT_BOT_PROFILES_BY_NAME, ranked_rows_by_perf_type)
+    file_system = InMemoryFileSystem()
+    html_generator = HtmlGenerator(FixedTimeProvider(DATE_2025_04_01), file_system, skip_unchanged_pages=True)
+    html_by_name = html_generator.generate_leaderboard_html(leaderboard_data)
+    file_system.write_files({file_paths.html_path(name): html for name, html in html_by_name.items()})
+
+    # Ten minutes later, only the last updated time of each page changes
+    time_provider = FixedTimeProvider(DATE_2025_04_01 + 600)
+    with (
+      mock.patch.object(HtmlGenerator, "render_index_html") as render_index_html_mock,
+      mock.patch.object(HtmlGenerator, "render_leaderboard_html") as render_leaderboard_html_mock,
+    ):
+      reused_html_by_name = HtmlGenerator(time_provider, file_system, skip_unchanged_pages=True).generate_leaderboard_html(
+        leaderboard_data
+      )
+    render_index_html_mock.assert_not_called()
+    render_leaderboard_html_mock.assert_not_called()
+    self.assertDictEqual(reused_html_by_name, HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data))
+    self.assertIn("2025-04-01 00:10:00 UTC", reused_html_by_name["bullet"])
+    file_system.write_files({file_paths.html_path(name): html for name, html in reused_html_by_name.items()})
+
+    # Only the pages which show a changed row are rendered
+    ranked_rows_by_perf_type[PerfType.BULLET][1] = create_leaderboard_row("Bot-2", rank=2, delta_rating=5)
+    time_provider = FixedTimeProvider(DATE_2025_04_01 + 1200)
+    with mock.patch.object(
+      HtmlGenerator, "render_leaderboard_html", autospec=True, side_effect=HtmlGenerator.render_leaderboard_html
+    ) as render_leaderboard_html_mock:
+      changed_html_by_name = HtmlGenerator(time_provider, file_system, skip_unchanged_pages=True).generate_leaderboard_html(
+        leaderboard_data
+      )
+    self.assertListEqual([call.args[2] for call in render_leaderboard_html_mock.call_args_list], [PerfType.BULLET])
+    self.assertDictEqual(changed_html_by_name, HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data))
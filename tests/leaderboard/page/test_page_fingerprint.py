@@ -0,0 +1,101 @@
+"""Tests for page_fingerprint.py."""
+
+import dataclasses
+import unittest
+from collections.abc import Iterable
+
+from jinja2 import DictLoader, Environment
+
+from src.leaderboard.chrono.durations import ONE_HOUR
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.fs import file_paths
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.page import page_fingerprint
+from src.leaderboard.page.page_fingerprint import PageFingerprints, SavedFingerprints
+from tests.leaderboard.chrono import epoch_seconds
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+DATE_2025_03_01 = epoch_seconds.from_date(2025, 3, 1)
+DATE_2025_04_01 = epoch_seconds.from_date(2025, 4, 1)
+BOT_PROFILES_BY_NAME = {"Bot-1": BotProfile("Bot-1", "", "GB", DATE_2025_03_01, DATE_2025_04_01, False, False, False, True)}
+ROW = LeaderboardRow("Bot-1", LeaderboardPerf(2500, 50, 0, 100, False), RankInfo(1, 0, 0, 0, 1, 2500, DATE_2025_04_01))
+TEMPLATES_DIGEST = b"templates"
+PAGE_HTML = "<footer>🕒Last Updated: 2025-04-01 00:00:00 UTC🕘</footer>"
+
+
+def create_fingerprint(
+  row: LeaderboardRow = ROW, current_time: int = DATE_2025_04_01, templates_digest: bytes = TEMPLATES_DIGEST
+) -> str:
+  """Create the fingerprint of a bullet page with a single row."""
+  return page_fingerprint.create_fingerprint(
+    templates_digest,
+    {PerfType.BULLET: [row]},
+    lambda name: page_fingerprint.get_profile_fields(BOT_PROFILES_BY_NAME[name], current_time),
+  )
+
+
+class TestPageFingerprint(unittest.TestCase):
+  """Tests for page_fingerprint functions."""
+
+  def test_save_and_load(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertEqual(page_fingerprint.load_saved_fingerprints(file_system), SavedFingerprints())
+    saved_fingerprints = SavedFingerprints("2025-04-01 00:00:00", {"index": "0123", "bullet": "4567"})
+    page_fingerprint.save_fingerprints(file_system, saved_fingerprints)
+    self.assertEqual(page_fingerprint.load_saved_fingerprints(file_system), saved_fingerprints)
+
+  def test_get_templates_digest(self) -> None:
+    digest = page_fingerprint.get_templates_digest(Environment(loader=DictLoader({"page": "{{ name }}"}), autoescape=True))
+    self.assertEqual(
+      page_fingerprint.get_templates_digest(Environment(loader=DictLoader({"page": "{{ name }}"}), autoescape=True)), digest
+    )
+    self.assertNotEqual(
+      page_fingerprint.get_templates_digest(Environment(loader=DictLoader({"page": "{{ name }}!"}), autoescape=True)), digest
+    )
+
+  def test_create_fingerprint(self) -> None:
+    fingerprint = create_fingerprint()
+    # Fields which are not shown and times which are formatted the same do not change the fingerprint
+    self.assertEqual(
+      create_fingerprint(dataclasses.replace(ROW, rank_info=dataclasses.replace(ROW.rank_info, peak_rank=2))), fingerprint
+    )
+    self.assertEqual(create_fingerprint(current_time=DATE_2025_04_01 + ONE_HOUR // 2), fingerprint)
+    # Shown fields and times which are formatted differently do
+    self.assertNotEqual(
+      create_fingerprint(dataclasses.replace(ROW, perf=dataclasses.replace(ROW.perf, rating=2501))), fingerprint
+    )
+    self.assertNotEqual(create_fingerprint(current_time=DATE_2025_04_01 + ONE_HOUR), fingerprint)
+    self.assertNotEqual(create_fingerprint(templates_digest=b"changed"), fingerprint)
+
+  def test_replace_last_updated_date(self) -> None:
+    self.assertEqual(
+      page_fingerprint.replace_last_updated_date(PAGE_HTML, "2025-04-01 00:00:00", "2025-04-01 00:10:00"),
+      "<footer>🕒Last Updated: 2025-04-01 00:10:00 UTC🕘</footer>",
+    )
+    # The page was last updated at a different time than the fingerprints were saved
+    self.assertIsNone(page_fingerprint.replace_last_updated_date(PAGE_HTML, "2025-03-31 23:50:00", "2025-04-01 00:10:00"))
+    self.assertIsNone(page_fingerprint.replace_last_updated_date("<footer></footer>", "", "2025-04-01 00:10:00"))
+
+
+class TestPageFingerprints(unittest.TestCase):
+  """Tests for PageFingerprints."""
+
+  def test_get_unchanged_html(self) -> None:
+    file_system = InMemoryFileSystem()
+    rows_by_perf_type: dict[PerfType, Iterable[LeaderboardRow]] = {PerfType.BULLET: [ROW]}
+    page_fingerprints = PageFingerprints(file_system, TEMPLATES_DIGEST, BOT_PROFILES_BY_NAME, DATE_2025_04_01)
+    self.assertIsNone(page_fingerprints.get_unchanged_html("bullet", rows_by_perf_type))
+    page_fingerprints.save()
+    file_system.write_file(file_paths.html_path("bullet"), PAGE_HTML)
+
+    later_time = DATE_2025_04_01 + 600
+    page_fingerprints = PageFingerprints(file_system, TEMPLATES_DIGEST, BOT_PROFILES_BY_NAME, later_time)
+    self.assertEqual(
+      page_fingerprints.get_unchanged_html("bullet", rows_by_perf_type),
+      "<footer>🕒Last Updated: 2025-04-01 00:10:00 UTC🕘</footer>",
+    )
+    changed_row = dataclasses.replace(ROW, rank_info=dataclasses.replace(ROW.rank_info, delta_rank=1))
+    self.assertIsNone(page_fingerprints.get_unchanged_html("bullet", {PerfType.BULLET: [changed_row]}))
+    # A page without saved fingerprints is rendered
+    self.assertIsNone(page_fingerprints.get_unchanged_html("blitz", {PerfType.BLITZ: []}))
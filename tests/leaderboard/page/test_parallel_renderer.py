@@ -0,0 +1,88 @@
+"""Tests for parallel_renderer.py."""
+
+import unittest
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.data.leaderboard_objects import BotProfile, LeaderboardPerf, LeaderboardRow, RankInfo
+from src.leaderboard.li.pert_type import PerfType
+from src.leaderboard.page import parallel_renderer
+from src.leaderboard.page.html_generator import MAX_RANK_FOR_PREVIEW, HtmlGenerator
+from tests.leaderboard.chrono import epoch_seconds
+
+
+DATE_2025_04_01 = epoch_seconds.from_date(2025, 4, 1)
+BOT_COUNT = MAX_RANK_FOR_PREVIEW + 5
+# Every fourth bot is not eligible
+INELIGIBLE_INTERVAL = 4
+
+
+def create_leaderboard_data() -> LeaderboardDataResult:
+  """Create leaderboards which are longer than the index previews and which have bots that are not eligible."""
+  bot_profiles_by_name = {
+    f"Bot-{index}": BotProfile(
+      f"Bot-{index}",
+      "",
+      ["", "_earth", "GB"][index % 3],
+      DATE_2025_04_01 - index * 86400,
+      DATE_2025_04_01,
+      index % 2 == 0,
+      False,
+      index % 5 == 0,
+      index % 3 == 0,
+    )
+    for index in range(BOT_COUNT)
+  }
+  rows_by_perf_type = {
+    perf_type: [
+      LeaderboardRow(
+        f"Bot-{index}",
+        LeaderboardPerf(2500 - index * 10, 50, 0, 100 + index, False),
+        RankInfo(
+          0 if index % INELIGIBLE_INTERVAL == INELIGIBLE_INTERVAL - 1 else index + 1,
+          index % 3 - 1,
+          index % 7 - 3,
+          index % 2,
+          1,
+          2500,
+          DATE_2025_04_01,
+        ),
+      )
+      for index in range(BOT_COUNT)
+    ]
+    for perf_type in [PerfType.BULLET, PerfType.ATOMIC]
+  }
+  return LeaderboardDataResult.create_result(bot_profiles_by_name, rows_by_perf_type)
+
+
+class TestParallelRenderer(unittest.TestCase):
+  """Tests for parallel_renderer functions."""
+
+  def test_create_page_data(self) -> None:
+    leaderboard_data = create_leaderboard_data()
+    bullet_rows = leaderboard_data.ranked_rows_by_perf_type[PerfType.BULLET]
+    page_data = parallel_renderer.create_page_data(leaderboard_data, {PerfType.BULLET: bullet_rows})
+    page_leaderboard_data = parallel_renderer.create_leaderboard_data(page_data)
+    eligible_rows = [row for row in bullet_rows if row.rank_info.rank]
+    self.assertListEqual(page_leaderboard_data.ranked_rows_by_perf_type[PerfType.BULLET], eligible_rows)
+    self.assertDictEqual(
+      page_leaderboard_data.bot_profiles_by_name,
+      {row.name: leaderboard_data.bot_profiles_by_name[row.name] for row in eligible_rows},
+    )
+
+  def test_render_leaderboard_html_matches_serial(self) -> None:
+    leaderboard_data = create_leaderboard_data()
+    serial_html_by_name = HtmlGenerator(FixedTimeProvider(DATE_2025_04_01)).generate_leaderboard_html(leaderboard_data)
+    html_by_name = parallel_renderer.render_leaderboard_html(leaderboard_data, DATE_2025_04_01, 2)
+    self.assertListEqual(list(html_by_name), list(serial_html_by_name))
+    for name, html in html_by_name.items():
+      with self.subTest(name=name):
+        self.assertEqual(html, serial_html_by_name[name])
+
+  def test_html_generator_with_render_workers(self) -> None:
+    leaderboard_data = create_leaderboard_data()
+    time_provider = FixedTimeProvider(DATE_2025_04_01)
+    self.assertDictEqual(
+      HtmlGenerator(time_provider, render_workers=2).generate_leaderboard_html(leaderboard_data),
+      HtmlGenerator(time_provider).generate_leaderboard_html(leaderboard_data),
+    )
@@ -0,0 +1,74 @@
+"""Tests for precompressor.py."""
+
+import gzip
+import importlib.util
+import unittest
+
+from src.leaderboard.fs import file_paths
+from src.leaderboard.page import precompressor
+from src.leaderboard.page.precompressor import GZIP_ENCODING, PrecompressionCounts
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+BROTLI_INSTALLED = importlib.util.find_spec("brotli") is not None
+
+INDEX_PATH = file_paths.html_path("index")
+BULLET_PATH = file_paths.html_path("bullet")
+# Repeated so that it compresses well
+INDEX_HTML = "<tr><td>Bot-1</td></tr>" * 100
+BULLET_HTML = "<tr><td>Bøt-2</td></tr>" * 100
+
+
+class TestPrecompressor(unittest.TestCase):
+  """Tests for precompressor functions."""
+
+  def test_compress_gzip(self) -> None:
+    contents = INDEX_HTML.encode("utf-8")
+    compressed_contents = precompressor.compress_gzip(contents)
+    self.assertEqual(gzip.decompress(compressed_contents), contents)
+    # There is no timestamp, so the same contents are compressed to the same bytes
+    self.assertEqual(precompressor.compress_gzip(contents), compressed_contents)
+
+  def test_get_available_encodings(self) -> None:
+    encoding_names = [encoding.name for encoding in precompressor.get_available_encodings()]
+    self.assertListEqual(encoding_names, ["gzip", "brotli"] if BROTLI_INSTALLED else ["gzip"])
+    for encoding in precompressor.get_available_encodings():
+      contents = BULLET_HTML.encode("utf-8")
+      self.assertEqual(encoding.decompress(encoding.compress(contents)), contents)
+
+  def test_precompress_files(self) -> None:
+    file_system = InMemoryFileSystem()
+    file_contents_by_name = {INDEX_PATH: INDEX_HTML.encode("utf-8"), BULLET_PATH: BULLET_HTML.encode("utf-8")}
+    counts = precompressor.precompress_files(file_system, file_contents_by_name, [GZIP_ENCODING])
+    self.assertEqual(counts.files_compressed, 2)
+    self.assertEqual(counts.files_unchanged, 0)
+    self.assertEqual(counts.original_bytes, sum(len(file_contents) for file_contents in file_contents_by_name.values()))
+    self.assertLess(counts.get_ratio("gzip"), 0.1)
+    for file_name, file_contents in file_contents_by_name.items():
+      self.assertEqual(gzip.decompress(file_system.read_binary_file(f"{file_name}.gz") or b""), file_contents)
+
+    # Only the file which changed is compressed again
+    files_written = file_system.get_write_counts().files_written
+    file_contents_by_name[BULLET_PATH] = INDEX_HTML.encode("utf-8")
+    counts = precompressor.precompress_files(file_system, file_contents_by_name, [GZIP_ENCODING])
+    self.assertEqual(counts.files_compressed, 1)
+    self.assertEqual(counts.files_unchanged, 1)
+    self.assertEqual(file_system.get_write_counts().files_written, files_written + 1)
+    self.assertEqual(gzip.decompress(file_system.read_binary_file(f"{BULLET_PATH}.gz") or b""), INDEX_HTML.encode("utf-8"))
+
+  def test_precompress_leaderboard_html(self) -> None:
+    file_system = InMemoryFileSystem()
+    stylesheet = b"body { margin: 0; }"
+    file_system.write_binary_file(file_paths.stylesheet_path(), stylesheet)
+    counts = precompressor.precompress_leaderboard_html(file_system, {INDEX_PATH: INDEX_HTML})
+    self.assertEqual(counts.files_compressed, 2)
+    self.assertEqual(gzip.decompress(file_system.read_binary_file(f"{INDEX_PATH}.gz") or b""), INDEX_HTML.encode("utf-8"))
+    self.assertEqual(gzip.decompress(file_system.read_binary_file(f"{file_paths.stylesheet_path()}.gz") or b""), stylesheet)
+    if BROTLI_INSTALLED:
+      self.assertTrue(file_system.read_binary_file(f"{INDEX_PATH}.br"))
+
+  def test_get_ratio(self) -> None:
+    self.assertEqual(PrecompressionCounts().get_ratio("gzip"), 0.0)
+    counts = PrecompressionCounts(original_bytes=200, compressed_bytes_by_encoding={"gzip": 50})
+    self.assertEqual(counts.get_ratio("gzip"), 0.25)
+    self.assertEqual(counts.get_ratio("brotli"), 0.0)
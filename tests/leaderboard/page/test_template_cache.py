@@ -0,0 +1,55 @@
+"""Tests for template_cache.py."""
+
+import unittest
+from unittest import mock
+
+from jinja2 import DictLoader, Environment
+
+from src.leaderboard.chrono.fixed_time_provider import FixedTimeProvider
+from src.leaderboard.data.data_generator import LeaderboardDataResult
+from src.leaderboard.fs import file_paths
+from src.leaderboard.page.html_generator import HtmlGenerator
+from src.leaderboard.page.template_cache import TemplateBytecodeCache
+from tests.leaderboard.fs.in_memory_file_system import InMemoryFileSystem
+
+
+def create_environment(file_system: InMemoryFileSystem, template_source: str) -> Environment:
+  """Create an environment with a single template, named "page", whose bytecode is cached in the file system."""
+  return Environment(
+    loader=DictLoader({"page": template_source}), autoescape=True, bytecode_cache=TemplateBytecodeCache(file_system)
+  )
+
+
+class TestTemplateBytecodeCache(unittest.TestCase):
+  """Tests for TemplateBytecodeCache."""
+
+  def test_load_saved_bytecode(self) -> None:
+    file_system = InMemoryFileSystem()
+    self.assertEqual(
+      create_environment(file_system, "Hello {{ name }}").get_template("page").render(name="Bot-1"), "Hello Bot-1"
+    )
+    cache_paths = [path for path in file_system.binary_file_system if path.startswith(file_paths.TEMPLATE_CACHE_DIR)]
+    self.assertEqual(len(cache_paths), 1)
+
+    # A new environment loads the template without compiling it
+    with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compile_mock:
+      template = create_environment(file_system, "Hello {{ name }}").get_template("page")
+    compile_mock.assert_not_called()
+    self.assertEqual(template.render(name="Bot-2"), "Hello Bot-2")
+
+  def test_compile_changed_template(self) -> None:
+    file_system = InMemoryFileSystem()
+    create_environment(file_system, "Hello {{ name }}").get_template("page")
+    with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compile_mock:
+      template = create_environment(file_system, "Goodbye {{ name }}").get_template("page")
+    compile_mock.assert_called_once()
+    self.assertEqual(template.render(name="Bot-1"), "Goodbye Bot-1")
+
+  def test_html_generator(self) -> None:
+    file_system = InMemoryFileSystem()
+    leaderboard_data = LeaderboardDataResult.create_result({}, {})
+    html_by_name = HtmlGenerator(FixedTimeProvider(0), file_system).generate_leaderboard_html(leaderboard_data)
+    with mock.patch.object(Environment, "compile", autospec=True, side_effect=Environment.compile) as compile_mock:
+      cached_html_by_name = HtmlGenerator(FixedTimeProvider(0), file_system).generate_leaderboard_html(leaderboard_data)
+    compile_mock.assert_not_called()
+    self.assertDictEqual(cached_html_by_name, html_by_name)